@@ -1,63 +1,92 @@
+from collections.abc import Callable
+
 from .BaseController import BaseController
 
 
 class ASFController(BaseController):
     """Controller for ASF-related API endpoints"""
 
-    async def get_info(self):
+    def __init__(self, connection_handler):
+        """
+        Initialize with shared connection handler from ASFConnector
+
+        Args:
+            connection_handler: IPCProtocolHandler instance managed by ASFConnector
+        """
+        super().__init__(connection_handler)
+        # Called with every get_info response, e.g. GlobalConfigManager.observe
+        self.info_observers: list[Callable[[dict], object]] = []
+
+    async def get_info(self, timeout: float | None = None):
         """
         GET /Api/ASF
         Fetches common info related to ASF as a whole.
 
+        Args:
+            timeout: Optional deadline in seconds, see timeouts.deadline
+
         Returns:
             dict: ASF information
         """
-        return await self._get("/ASF")
+        response = await self._get("/ASF", timeout=timeout)
+        for observer in self.info_observers:
+            observer(response)
+        return response
 
-    async def update_config(self, config: dict):
+    async def update_config(self, config: dict, timeout: float | None = None):
         """
         POST /Api/ASF
         Updates ASF's global configuration.
 
         Args:
             config: Global configuration dict to update
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
-        return await self._post("/ASF", payload=config)
+        return await self._post("/ASF", payload=config, timeout=timeout)
 
-    async def exit(self):
+    async def exit(self, timeout: float | None = None):
         """
         POST /Api/ASF/Exit
         Shuts down ASF.
 
+        Args:
+            timeout: Optional deadline in seconds, see timeouts.deadline
+
         Returns:
             dict: API response
         """
-        return await self._post("/ASF/Exit")
+        return await self._post("/ASF/Exit", timeout=timeout)
 
-    async def restart(self):
+    async def restart(self, timeout: float | None = None):
         """
         POST /Api/ASF/Restart
         Restarts ASF.
 
+        Args:
+            timeout: Optional deadline in seconds, see timeouts.deadline
+
         Returns:
             dict: API response
         """
-        return await self._post("/ASF/Restart")
+        return await self._post("/ASF/Restart", timeout=timeout)
 
-    async def update(self):
+    async def update(self, timeout: float | None = None):
         """
         POST /Api/ASF/Update
         Updates ASF to the latest stable version.
 
+        Args:
+            timeout: Optional deadline in seconds; downloading an update can take minutes
+
         Returns:
             dict: API response with update status
         """
-        return await self._post("/ASF/Update")
+        return await self._post("/ASF/Update", timeout=timeout)
 
-    async def encrypt(self, data: dict):
+    async def encrypt(self, data: dict, timeout: float | None = None):
         """
         POST /Api/ASF/Encrypt
         Encrypts data with ASF encryption mechanisms.
@@ -68,13 +97,14 @@ class ASFController(BaseController):
                       "CryptoMethod": int (encryption method),
                       "StringToEncrypt": str (string to be encrypted)
                   }
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response with encrypted data
         """
-        return await self._post("/ASF/Encrypt", payload=data)
+        return await self._post("/ASF/Encrypt", payload=data, timeout=timeout)
 
-    async def hash(self, data: dict):
+    async def hash(self, data: dict, timeout: float | None = None):
         """
         POST /Api/ASF/Hash
         Hashes data with ASF hashing mechanisms.
@@ -85,8 +115,9 @@ class ASFController(BaseController):
                       "HashMethod": int (hashing method),
                       "StringToHash": str (string to be hashed)
                   }
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response with hashed data
         """
-        return await self._post("/ASF/Hash", payload=data)
+        return await self._post("/ASF/Hash", payload=data, timeout=timeout)
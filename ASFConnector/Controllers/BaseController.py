@@ -1,5 +1,7 @@
 from loguru import logger
 
+from ..timeouts import deadline
+
 
 class BaseController:
     """Base controller class with shared connection handler and common utilities"""
@@ -15,44 +17,65 @@ class BaseController:
         self.connection_handler = connection_handler
         self.logger.debug(f"{self.__class__.__name__} initialized")
 
-    async def _get(self, resource, parameters=None):
+    async def _get(self, resource, parameters=None, timeout=None):
         """
         Wrapper for GET requests with logging
 
         Args:
             resource: API resource path
             parameters: Optional query parameters
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             API response dict
         """
         self.logger.debug(f"GET {resource} with params: {parameters}")
-        return await self.connection_handler.get(resource, parameters)
+        with deadline(timeout):
+            return await self.connection_handler.get(resource, parameters)
 
-    async def _post(self, resource, payload=None):
+    async def _post(self, resource, payload=None, timeout=None):
         """
         Wrapper for POST requests with logging and health check
 
         Args:
             resource: API resource path
             payload: Optional request body
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             API response dict
         """
         self.logger.debug(f"POST {resource} with payload: {payload}")
-        return await self.connection_handler.post(resource, payload)
+        with deadline(timeout):
+            return await self.connection_handler.post(resource, payload)
 
-    async def _delete(self, resource, parameters=None):
+    async def _delete(self, resource, parameters=None, timeout=None):
         """
         Wrapper for DELETE requests with logging
 
         Args:
             resource: API resource path
             parameters: Optional query parameters
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             API response dict
         """
         self.logger.debug(f"DELETE {resource} with params: {parameters}")
-        return await self.connection_handler.delete(resource, parameters)
+        with deadline(timeout):
+            return await self.connection_handler.delete(resource, parameters)
+
+    def _stream(self, resource, parameters=None, timeout=None):
+        """
+        Wrapper for streamed GET requests with logging
+
+        Args:
+            resource: API resource path
+            parameters: Optional query parameters
+            timeout: Optional deadline in seconds for the whole body, see timeouts.deadline
+
+        Returns:
+            Async iterator of raw response body chunks
+        """
+        self.logger.debug(f"GET (stream) {resource} with params: {parameters}")
+        return self.connection_handler.stream(resource, parameters, timeout=timeout)
@@ -1,24 +1,36 @@
+from ..config_sync import rollout_bot_config
+from ..error import ASFIPCError
+from ..streaming import iter_json_paths
+from ..timeouts import deadline
 from .BaseController import BaseController
 
+_INVENTORY_PATTERNS = (
+    ("Success",),
+    ("Message",),
+    ("Result", "*", "Assets", "*"),
+    ("Result", "*", "Descriptions", "*"),
+)
+
 
 class BotController(BaseController):
     """Controller for Bot-related API endpoints"""
 
-    async def get_info(self, bot_names: str):
+    async def get_info(self, bot_names: str, timeout: float | None = None):
         """
         GET /Api/Bot/{botNames}
         Fetches information about specified bots.
 
         Args:
             bot_names: Bot name(s), can use ASF for all bots
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: Bot information
         """
         resource = f"/Bot/{bot_names}"
-        return await self._get(resource)
+        return await self._get(resource, timeout=timeout)
 
-    async def update_config(self, bot_names: str, config: dict):
+    async def update_config(self, bot_names: str, config: dict, timeout: float | None = None):
         """
         POST /Api/Bot/{botNames}
         Updates configuration of specified bots.
@@ -26,84 +38,119 @@ class BotController(BaseController):
         Args:
             bot_names: Bot name(s), can use ASF for all bots
             config: Bot configuration dict to update
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
         resource = f"/Bot/{bot_names}"
-        return await self._post(resource, payload=config)
+        return await self._post(resource, payload=config, timeout=timeout)
 
-    async def delete(self, bot_names: str):
+    async def rollout_config(
+        self,
+        template: dict,
+        bot_names: str = "ASF",
+        concurrency: int = 8,
+        dry_run: bool = False,
+        timeout: float | None = None,
+    ):
+        """
+        GET /Api/Bot/{botNames} then POST /Api/Bot/{botName} for each changed bot
+        Applies a partial BotConfig to several bots, writing only to bots whose config changes.
+
+        Args:
+            template: BotConfig keys to set
+            bot_names: Bot name(s), can use ASF for all bots
+            concurrency: Maximum number of simultaneous config writes
+            dry_run: Only report the planned changes
+            timeout: Optional deadline in seconds for the whole rollout, see timeouts.deadline
+
+        Returns:
+            BotConfigRolloutReport: Planned or applied changes per bot
+
+        Example:
+            report = await connector.bot.rollout_config({"Paused": True}, dry_run=True)
+            print(report.summary(), report.changes)
+        """
+        with deadline(timeout):
+            return await rollout_bot_config(self, template, bot_names, concurrency, dry_run)
+
+    async def delete(self, bot_names: str, timeout: float | None = None):
         """
         DELETE /Api/Bot/{botNames}
         Deletes all files related to specified bots.
 
         Args:
             bot_names: Bot name(s), can use ASF for all bots
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
         resource = f"/Bot/{bot_names}"
-        return await self._delete(resource)
+        return await self._delete(resource, timeout=timeout)
 
-    async def start(self, bot_names: str):
+    async def start(self, bot_names: str, timeout: float | None = None):
         """
         POST /Api/Bot/{botNames}/Start
         Starts specified bots.
 
         Args:
             bot_names: Bot name(s), can use ASF for all bots
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
         resource = f"/Bot/{bot_names}/Start"
-        return await self._post(resource)
+        return await self._post(resource, timeout=timeout)
 
-    async def stop(self, bot_names: str):
+    async def stop(self, bot_names: str, timeout: float | None = None):
         """
         POST /Api/Bot/{botNames}/Stop
         Stops specified bots.
 
         Args:
             bot_names: Bot name(s), can use ASF for all bots
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
         resource = f"/Bot/{bot_names}/Stop"
-        return await self._post(resource)
+        return await self._post(resource, timeout=timeout)
 
-    async def pause(self, bot_names: str):
+    async def pause(self, bot_names: str, timeout: float | None = None):
         """
         POST /Api/Bot/{botNames}/Pause
         Pauses specified bots.
 
         Args:
             bot_names: Bot name(s), can use ASF for all bots
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
         resource = f"/Bot/{bot_names}/Pause"
-        return await self._post(resource)
+        return await self._post(resource, timeout=timeout)
 
-    async def resume(self, bot_names: str):
+    async def resume(self, bot_names: str, timeout: float | None = None):
         """
         POST /Api/Bot/{botNames}/Resume
         Resumes specified bots.
 
         Args:
             bot_names: Bot name(s), can use ASF for all bots
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
         resource = f"/Bot/{bot_names}/Resume"
-        return await self._post(resource)
+        return await self._post(resource, timeout=timeout)
 
-    async def redeem(self, bot_names: str | list | set, keys):
+    async def redeem(self, bot_names: str | list | set, keys, timeout: float | None = None):
         """
         POST /Api/Bot/{botNames}/Redeem
         Redeems cd-keys on specified bots.
@@ -111,6 +158,7 @@ class BotController(BaseController):
         Args:
             bot_names: Bot name(s), can use ASF for all bots
             keys: Single key string or set/list of keys
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response with redemption results
@@ -125,9 +173,9 @@ class BotController(BaseController):
 
         resource = f"/Bot/{bot_names}/Redeem"
         data = {"KeysToRedeem": payload_keys}
-        return await self._post(resource, payload=data)
+        return await self._post(resource, payload=data, timeout=timeout)
 
-    async def add_license(self, bot_names: str, licenses):
+    async def add_license(self, bot_names: str, licenses, timeout: float | None = None):
         """
         POST /Api/Bot/{botNames}/AddLicense
         Adds free licenses on specified bots.
@@ -135,6 +183,7 @@ class BotController(BaseController):
         Args:
             bot_names: Bot name(s), can use ASF for all bots
             licenses: License IDs to add
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
@@ -144,13 +193,14 @@ class BotController(BaseController):
             payload = {"Licenses": list(licenses)}
         else:
             payload = {"Licenses": [licenses]}
-        return await self._post(resource, payload=payload)
+        return await self._post(resource, payload=payload, timeout=timeout)
 
     async def get_inventory(
         self,
         bot_names: str,
         app_id: int | None = None,
         context_id: int | None = None,
+        timeout: float | None = None,
     ):
         """
         GET /Api/Bot/{botNames}/Inventory or /Api/Bot/{botNames}/Inventory/{appID}/{contextID}
@@ -160,6 +210,7 @@ class BotController(BaseController):
             bot_names: Bot name(s), can use ASF for all bots
             app_id: Optional app ID for specific inventory
             context_id: Optional context ID for specific inventory
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: Inventory information
@@ -168,9 +219,56 @@ class BotController(BaseController):
             resource = f"/Bot/{bot_names}/Inventory/{app_id}/{context_id}"
         else:
             resource = f"/Bot/{bot_names}/Inventory"
-        return await self._get(resource)
+        return await self._get(resource, timeout=timeout)
+
+    async def iter_inventory(
+        self,
+        bot_names: str,
+        app_id: int | None = None,
+        context_id: int | None = None,
+        timeout: float | None = None,
+    ):
+        """
+        GET /Api/Bot/{botNames}/Inventory or /Api/Bot/{botNames}/Inventory/{appID}/{contextID}
+        Streams inventory items of specified bots as the response body arrives.
+
+        Unlike get_inventory(), the response is never decoded as a whole, so memory
+        stays bounded by the size of a single item regardless of fleet size.
+
+        Args:
+            bot_names: Bot name(s), can use ASF for all bots
+            app_id: Optional app ID for specific inventory
+            context_id: Optional context ID for specific inventory
+            timeout: Optional deadline in seconds for the whole body, see timeouts.deadline
 
-    async def input(self, bot_names: str, input_type: str, input_value: str):
+        Yields:
+            tuple: (bot_name, section, item) where section is "Assets" or "Descriptions"
+
+        Raises:
+            ASFIPCError: If ASF reports an unsuccessful response
+
+        Example:
+            async for bot_name, section, item in connector.bot.iter_inventory("ASF"):
+                if section == "Assets":
+                    print(bot_name, item["appid"], item["amount"])
+        """
+        if app_id and context_id:
+            resource = f"/Bot/{bot_names}/Inventory/{app_id}/{context_id}"
+        else:
+            resource = f"/Bot/{bot_names}/Inventory"
+        success = True
+        message = None
+        async for path, value in iter_json_paths(self._stream(resource, timeout=timeout), _INVENTORY_PATTERNS):
+            if len(path) == 4:
+                yield path[1], path[2], value
+            elif path[0] == "Success":
+                success = value
+            else:
+                message = value
+        if success is False:
+            raise ASFIPCError(message or "Fetching inventory failed")
+
+    async def input(self, bot_names: str, input_type: str, input_value: str, timeout: float | None = None):
         """
         POST /Api/Bot/{botNames}/Input
         Provides input value to bot for next usage.
@@ -179,15 +277,16 @@ class BotController(BaseController):
             bot_names: Bot name(s)
             input_type: Type of input (e.g., "DeviceID", "SteamGuard")
             input_value: Input value to provide
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
         resource = f"/Bot/{bot_names}/Input"
         payload = {"Type": input_type, "Value": input_value}
-        return await self._post(resource, payload=payload)
+        return await self._post(resource, payload=payload, timeout=timeout)
 
-    async def rename(self, bot_name: str, new_name: str):
+    async def rename(self, bot_name: str, new_name: str, timeout: float | None = None):
         """
         POST /Api/Bot/{botName}/Rename
         Renames bot along with all related files.
@@ -195,29 +294,33 @@ class BotController(BaseController):
         Args:
             bot_name: Current bot name (single bot only)
             new_name: New bot name
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
         resource = f"/Bot/{bot_name}/Rename"
         payload = {"NewName": new_name}
-        return await self._post(resource, payload=payload)
+        return await self._post(resource, payload=payload, timeout=timeout)
 
-    async def get_games_to_redeem_in_background(self, bot_names: str):
+    async def get_games_to_redeem_in_background(self, bot_names: str, timeout: float | None = None):
         """
         GET /Api/Bot/{botNames}/GamesToRedeemInBackground
         Fetches background game redeemer output.
 
         Args:
             bot_names: Bot name(s), can use ASF for all bots
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: Background game redeemer information
         """
         resource = f"/Bot/{bot_names}/GamesToRedeemInBackground"
-        return await self._get(resource)
+        return await self._get(resource, timeout=timeout)
 
-    async def add_games_to_redeem_in_background(self, bot_names: str, games_to_redeem: dict):
+    async def add_games_to_redeem_in_background(
+        self, bot_names: str, games_to_redeem: dict, timeout: float | None = None
+    ):
         """
         POST /Api/Bot/{botNames}/GamesToRedeemInBackground
         Adds keys to background game redeemer.
@@ -225,28 +328,30 @@ class BotController(BaseController):
         Args:
             bot_names: Bot name(s), can use ASF for all bots
             games_to_redeem: Dict of games to redeem
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
         resource = f"/Bot/{bot_names}/GamesToRedeemInBackground"
-        return await self._post(resource, payload=games_to_redeem)
+        return await self._post(resource, payload=games_to_redeem, timeout=timeout)
 
-    async def delete_games_to_redeem_in_background(self, bot_names: str):
+    async def delete_games_to_redeem_in_background(self, bot_names: str, timeout: float | None = None):
         """
         DELETE /Api/Bot/{botNames}/GamesToRedeemInBackground
         Removes background game redeemer output files.
 
         Args:
             bot_names: Bot name(s), can use ASF for all bots
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
         resource = f"/Bot/{bot_names}/GamesToRedeemInBackground"
-        return await self._delete(resource)
+        return await self._delete(resource, timeout=timeout)
 
-    async def redeem_points(self, bot_names: str, definition_id: int):
+    async def redeem_points(self, bot_names: str, definition_id: int, timeout: float | None = None):
         """
         POST /Api/Bot/{botNames}/RedeemPoints/{definitionID}
         Redeems points on specified bots.
@@ -254,9 +359,10 @@ class BotController(BaseController):
         Args:
             bot_names: Bot name(s), can use ASF for all bots
             definition_id: Definition ID of item to redeem
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response
         """
         resource = f"/Bot/{bot_names}/RedeemPoints/{definition_id}"
-        return await self._post(resource)
+        return await self._post(resource, timeout=timeout)
@@ -1,3 +1,8 @@
+import asyncio
+from collections.abc import Iterable
+
+from ..commands import pack_commands, parse_command_response
+from ..timeouts import deadline
 from .BaseController import BaseController
 
 
@@ -13,7 +18,7 @@ class CommandController(BaseController):
     Use specific controller methods (ASFController, BotController) instead when possible.
     """
 
-    async def execute(self, command: str):
+    async def execute(self, command: str, timeout: float | None = None):
         """
         POST /Api/Command
         Executes a command.
@@ -26,6 +31,7 @@ class CommandController(BaseController):
 
         Args:
             command: Command string to execute
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: Command execution result
@@ -36,4 +42,70 @@ class CommandController(BaseController):
         )
         resource = "/Command"
         payload = {"Command": command}
-        return await self._post(resource, payload=payload)
+        return await self._post(resource, payload=payload, timeout=timeout)
+
+    async def execute_batch(
+        self,
+        commands: str | Iterable[str],
+        bots: Iterable[str],
+        chunk_size: int = 100,
+        concurrency: int = 4,
+        timeout: float | None = None,
+    ) -> dict[str, dict[str, str | None]]:
+        """
+        POST /Api/Command for many bots, packing them into multi-bot commands.
+
+        Each command is sent as "!<name> bot1,bot2,... <arguments>" with at most
+        chunk_size bots per request, and up to concurrency requests run at once.
+        Errors raised by a request cancel the remaining ones and propagate.
+
+        Args:
+            commands: Command(s) without bots, e.g. "level" or ["owns 730", "balance"]
+            bots: Target bot names
+            chunk_size: Maximum number of bots per request
+            concurrency: Maximum number of requests in flight for this batch
+            timeout: Optional deadline in seconds for the whole batch, see timeouts.deadline
+
+        Returns:
+            dict: Command -> bot name -> response text. Bots missing from a response
+            get ASF's message for the request (e.g. a failure), or None. Bots that ASF
+            expands a target to, such as every bot for "ASF", are included as well.
+
+        Example:
+            results = await connector.command.execute_batch(["level", "owns 730"], bot_names)
+            print(results["level"]["bot1"])  # "Your Steam account level is 42."
+        """
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+        commands = [commands] if isinstance(commands, str) else list(commands)
+        bots = list(bots)
+        jobs = [
+            (command, chunk, text) for command in commands for chunk, text in pack_commands(command, bots, chunk_size)
+        ]
+        self.logger.debug(f"Execute {len(commands)} command(s) for {len(bots)} bot(s) in {len(jobs)} request(s)")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(text: str) -> dict:
+            async with semaphore:
+                return await self._post("/Command", payload={"Command": text})
+
+        # Tasks copy the current context, so the deadline bounds every request of the batch
+        with deadline(timeout):
+            tasks = [asyncio.ensure_future(run(text)) for _, _, text in jobs]
+        try:
+            responses = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        results: dict[str, dict[str, str | None]] = {command: {} for command in commands}
+        for (command, chunk, _), response in zip(jobs, responses):
+            if response.get("Success"):
+                parsed = parse_command_response(response.get("Result"))
+                fallback = parsed.pop("", None)
+            else:
+                parsed, fallback = {}, response.get("Message")
+            for bot in chunk:
+                results[command][bot] = parsed.pop(bot, fallback)
+            # Bots expanded by ASF, e.g. from "ASF"
+            results[command].update(parsed)
+        return results
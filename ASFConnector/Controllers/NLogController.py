@@ -4,15 +4,18 @@ from .BaseController import BaseController
 class NLogController(BaseController):
     """Controller for NLog-related API endpoints"""
 
-    async def get_log_file(self):
+    async def get_log_file(self, timeout: float | None = None):
         """
         GET /Api/NLog/File
         Fetches ASF log file.
 
+        Args:
+            timeout: Optional deadline in seconds, see timeouts.deadline
+
         Returns:
             dict: API response with log file content
         """
-        return await self._get("/NLog/File")
+        return await self._get("/NLog/File", timeout=timeout)
 
     async def get_log_stream(self):
         """
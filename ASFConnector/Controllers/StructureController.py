@@ -4,16 +4,17 @@ from .BaseController import BaseController
 class StructureController(BaseController):
     """Controller for Structure-related API endpoints"""
 
-    async def get_structure(self, structure_name: str):
+    async def get_structure(self, structure_name: str, timeout: float | None = None):
         """
         GET /Api/Structure/{structure}
         Fetches default structure of a given type.
 
         Args:
             structure_name: The structure name to query
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response with structure information
         """
         resource = f"/Structure/{structure_name}"
-        return await self._get(resource)
+        return await self._get(resource, timeout=timeout)
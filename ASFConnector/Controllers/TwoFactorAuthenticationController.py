@@ -1,18 +1,26 @@
+from ..steam_guard import SteamGuardGenerator, TokenCache
+from ..timeouts import deadline
 from .BaseController import BaseController
 
 
 class TwoFactorAuthenticationController(BaseController):
     """Controller for TwoFactorAuthentication-related API endpoints"""
 
-    async def get_token(self, bot_names: str):
+    token_cache: TokenCache | None = None
+    generator: SteamGuardGenerator | None = None
+
+    async def get_token(self, bot_names: str, timeout: float | None = None):
         """
         GET /Api/Bot/{botNames}/TwoFactorAuthentication/Token
         Fetches 2FA tokens of given bots.
 
         Requires ASF 2FA module to be active on the specified bots.
+        Computed locally for bots registered with enable_local_generator(), and served
+        from memory within the current 30-second window when enable_cache() was called.
 
         Args:
             bot_names: Bot name(s), can use ASF for all bots
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response with 2FA tokens
@@ -23,5 +31,65 @@ class TwoFactorAuthenticationController(BaseController):
                 for bot_name, token_data in tokens['Result'].items():
                     print(f"{bot_name}: {token_data['Result']}")
         """
+        with deadline(timeout):
+            if self.generator is not None:
+                return await self.generator.get_token(bot_names)
+            return await self._remote_token(bot_names)
+
+    async def _remote_token(self, bot_names: str):
+        if self.token_cache is not None:
+            return await self.token_cache.get(bot_names)
+        return await self._fetch_token(bot_names)
+
+    async def _fetch_token(self, bot_names: str):
         resource = f"/Bot/{bot_names}/TwoFactorAuthentication/Token"
         return await self._get(resource)
+
+    def enable_cache(self, prefetch: bool = False, **kwargs) -> TokenCache:
+        """
+        Cache tokens until the end of their Steam Guard window.
+
+        Args:
+            prefetch: Fetch all bots' tokens in one request at the start of every window
+                (requires a running event loop)
+            **kwargs: Extra TokenCache options, e.g. prefetch_delay
+
+        Returns:
+            TokenCache: The active cache (see hits, misses)
+        """
+        if self.token_cache is None:
+            self.token_cache = TokenCache(self._fetch_token, prefetch=prefetch, **kwargs)
+        if prefetch:
+            self.token_cache.prefetch = True
+            self.token_cache.start()
+        return self.token_cache
+
+    async def disable_cache(self):
+        """Stop prefetching and serve get_token() from ASF again"""
+        if self.token_cache is not None:
+            await self.token_cache.stop()
+            self.token_cache = None
+
+    def enable_local_generator(self, secrets: dict[str, str], **kwargs) -> SteamGuardGenerator:
+        """
+        Compute tokens locally for bots whose shared secrets are known.
+
+        Other bots are still fetched from ASF (through the token cache if enabled),
+        and get_token() keeps its response format.
+
+        Args:
+            secrets: Bot name -> base64 encoded shared secret
+            **kwargs: Extra SteamGuardGenerator options, e.g. clock
+
+        Returns:
+            SteamGuardGenerator: The active generator; add_secrets() registers more bots
+        """
+        if self.generator is None:
+            self.generator = SteamGuardGenerator(secrets, fallback=self._remote_token, **kwargs)
+        else:
+            self.generator.add_secrets(secrets)
+        return self.generator
+
+    def disable_local_generator(self):
+        """Fetch all tokens from ASF again"""
+        self.generator = None
@@ -4,16 +4,17 @@ from .BaseController import BaseController
 class TypeController(BaseController):
     """Controller for Type-related API endpoints"""
 
-    async def get_type(self, type_name: str):
+    async def get_type(self, type_name: str, timeout: float | None = None):
         """
         GET /Api/Type/{type}
         Fetches type information for a given type.
 
         Args:
             type_name: The type name to query
+            timeout: Optional deadline in seconds, see timeouts.deadline
 
         Returns:
             dict: API response with type information
         """
         resource = f"/Type/{type_name}"
-        return await self._get(resource)
+        return await self._get(resource, timeout=timeout)
@@ -1,12 +1,31 @@
 # 25.10.28 Modified by angjustinl from dmcallejo/ASFBot/IPCProtocol
 # source code at https://github.com/dmcallejo/ASFBot/IPCProtocol
 
+import asyncio
+from collections import Counter
 import re
+import time
 
 import httpx
 from loguru import logger
 
 from . import error
+from .compression import CompressionPolicy
+from .scheduler import RequestScheduler, classify
+from .timeouts import LatencyTracker, deadline, endpoint_key, remaining
+
+
+class _BorrowedTransport(httpx.AsyncBaseTransport):
+    """Delegates to an injected transport without closing it when a client closes"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass
 
 
 class IPCProtocolHandler:
@@ -16,17 +35,133 @@ class IPCProtocolHandler:
         "Accept": "application/json",
     }
 
-    def __init__(self, host, port, path="/", password=None):
-        self.base_url = "http://" + host + ":" + port + path
+    def __init__(
+        self,
+        host,
+        port,
+        path="/",
+        password=None,
+        scheduler=None,
+        adaptive_timeouts=False,
+        uds=None,
+        transport=None,
+        compression=None,
+        traceback_every=0,
+        limits=None,
+    ):
+        if uds is not None and transport is not None:
+            raise ValueError("Pass either a Unix domain socket path or a custom transport, not both")
+        # Over a Unix domain socket the URL only supplies the Host header and the path
+        self.root_url = "http://localhost" if uds is not None else "http://" + host + ":" + port
+        self.base_url = self.root_url + path
+        # Unix domain socket of ASF (or of a reverse proxy in front of it)
+        self.uds = uds
+        # Custom httpx transport; it is shared by all clients and never closed by the handler
+        self.transport = transport
+        # Connection pool limits (httpx.Limits) of the clients; None for the httpx defaults
+        self.limits = limits
+        # Accept-Encoding per endpoint; True/None use the default policy, False asks for identity everywhere.
+        # Resources the policy has no opinion on keep httpx's default Accept-Encoding
+        if compression is None or compression is True:
+            compression = CompressionPolicy()
+        elif compression is False:
+            compression = CompressionPolicy.disabled()
+        self.compression = compression
+        # Failed requests by ASFConnector exception class; every traceback_every-th failure is logged
+        # with its full traceback at ERROR, the others without one (0: never, 1: every failure)
+        self.error_counts = Counter()
+        self.traceback_every = traceback_every
         self.headers = self._DEFAULT_HEADERS.copy()
         if password:
             self.headers[self.AUTH_HEADER] = password
         self._client = None
-        logger.debug(f"Initialized. Host: {self.base_url}")
+        # Requests running per pooled client; clients replaced by reconfigure() are closed when idle
+        self._client_users = Counter()
+        self._retired_clients = set()
+        # Caps requests in flight and orders waiting ones by priority class
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        # Per-endpoint latencies; with adaptive_timeouts they bound requests without an explicit deadline
+        self.latency = LatencyTracker()
+        self.adaptive_timeouts = adaptive_timeouts
+        logger.debug(f"Initialized. Host: {self.base_url}" + (f" via {uds}" if uds is not None else ""))
+
+    def _new_client(self):
+        """Create an AsyncClient over the configured transport"""
+        if self.transport is not None:
+            return httpx.AsyncClient(headers=self.headers, transport=_BorrowedTransport(self.transport))
+        limits = {"limits": self.limits} if self.limits is not None else {}
+        if self.uds is not None:
+            transport = httpx.AsyncHTTPTransport(uds=self.uds, **limits)
+            return httpx.AsyncClient(headers=self.headers, transport=transport)
+        return httpx.AsyncClient(headers=self.headers, **limits)
+
+    def _acquire_client(self):
+        """Get the pooled client, or a temporary one outside the context manager; returns (client, temporary)"""
+        if self._client is None:
+            return self._new_client(), True
+        self._client_users[self._client] += 1
+        return self._client, False
+
+    async def _release_client(self, client, temporary):
+        """Release a client from _acquire_client(), closing it if it is temporary or retired and idle"""
+        if temporary:
+            await client.aclose()
+            return
+        self._client_users[client] -= 1
+        if self._client_users[client] <= 0:
+            del self._client_users[client]
+            if client in self._retired_clients:
+                self._retired_clients.discard(client)
+                await client.aclose()
+
+    async def reconfigure(self, host, port, path="/", password=None, uds=None, limits=None):
+        """
+        Apply new connection settings without dropping requests in flight.
+
+        Host, port, path and password take effect for the next request on the warm pool;
+        httpx keys pooled connections by origin, so connections to a previous host simply
+        expire. Only a change of the Unix domain socket or of the pool limits needs a new
+        pool: the new client serves new requests while the old one is closed once its
+        last request finishes.
+
+        Args:
+            host: ASF IPC host
+            port: ASF IPC port
+            path: ASF IPC API path
+            password: IPC password (None for none)
+            uds: Unix domain socket path (None for TCP)
+            limits: httpx.Limits of the pool (None for the httpx defaults)
+
+        Returns:
+            bool: Whether the pool was replaced
+        """
+        if uds is not None and self.transport is not None:
+            raise ValueError("Pass either a Unix domain socket path or a custom transport, not both")
+        self.root_url = "http://localhost" if uds is not None else "http://" + host + ":" + port
+        self.base_url = self.root_url + path
+        if password:
+            self.headers[self.AUTH_HEADER] = password
+        else:
+            self.headers.pop(self.AUTH_HEADER, None)
+        rebuild = self.transport is None and (uds != self.uds or limits != self.limits)
+        self.uds = uds
+        self.limits = limits
+        if self._client is not None:
+            if rebuild:
+                old, self._client = self._client, self._new_client()
+                if self._client_users[old]:
+                    self._retired_clients.add(old)
+                else:
+                    del self._client_users[old]
+                    await old.aclose()
+            else:
+                self._client.headers = self.headers
+        logger.info(f"Reconfigured. Host: {self.base_url}" + (" with a new connection pool" if rebuild else ""))
+        return rebuild and self._client is not None
 
     async def __aenter__(self):
         """Support async context manager for connection pool reuse"""
-        self._client = httpx.AsyncClient(headers=self.headers)
+        self._client = self._new_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -34,13 +169,89 @@ class IPCProtocolHandler:
         if self._client:
             await self._client.aclose()
             self._client = None
-
-    def _get_client(self):
-        """Get or create AsyncClient instance"""
-        if self._client is None:
-            # For backward compatibility, create a temporary client
-            return httpx.AsyncClient(headers=self.headers)
-        return self._client
+        for client in self._retired_clients:
+            await client.aclose()
+        self._retired_clients.clear()
+        self._client_users.clear()
+
+    def _encoding_headers(self, resource):
+        """Per-request Accept-Encoding header chosen by the compression policy, if any"""
+        encoding = self.compression.accept_encoding(resource)
+        return {"Accept-Encoding": encoding} if encoding is not None else {}
+
+    def _adaptive_timeout(self, resource):
+        """Adaptive timeout of a send; None under an explicit deadline, which it never shortens"""
+        if not self.adaptive_timeouts or remaining() is not None:
+            return None
+        return self.latency.timeout_for(endpoint_key(resource))
+
+    async def _bounded(self, resource, awaitable, timeout):
+        """Await under a timeout, raising ASFTimeoutError when it expires"""
+        try:
+            # Cancelling the request on timeout closes its connection instead of returning it to the pool half-read
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Request to {resource} timed out after {timeout:.2f}s")
+            raise error.ASFTimeoutError(f"Request to {resource} timed out after {timeout:.2f}s") from None
+
+    async def _send(self, resource, send):
+        """
+        Send a request under a scheduler slot and the effective timeout.
+
+        The caller's deadline bounds queueing and sending. The adaptive timeout is
+        learned from send times only, so it bounds the send once a slot is held.
+
+        Args:
+            resource: API resource path
+            send: Callable issuing the httpx request, accepting optional httpx keyword arguments
+
+        Returns:
+            httpx.Response: Response of the request
+
+        Raises:
+            ASFTimeoutError: If the deadline (including queueing) or the adaptive timeout is exceeded
+        """
+        timeout = remaining()
+        if timeout is not None and timeout <= 0:
+            raise error.ASFTimeoutError(f"Deadline for {resource} expired before the request was sent")
+        headers = self._encoding_headers(resource)
+
+        async def run():
+            async with self.scheduler.slot(classify(resource)):
+                adaptive = self._adaptive_timeout(resource)
+                bound = remaining() if timeout is not None else adaptive
+                options = {"headers": headers}
+                if bound is not None:
+                    options["timeout"] = httpx.Timeout(max(bound, 0.001))
+                started = time.monotonic()
+                if adaptive is not None:
+                    response = await self._bounded(resource, send(**options), adaptive)
+                else:
+                    response = await send(**options)
+                self.latency.record(endpoint_key(resource), time.monotonic() - started)
+                return response
+
+        if timeout is None:
+            return await run()
+        return await self._bounded(resource, run(), timeout)
+
+    def _raise_error(self, ex, context):
+        """
+        Log a failed request and raise the matching ASFConnector exception.
+
+        Full tracebacks are costly to format and flood logs during an outage, so the
+        ERROR line carries only the reason. A traceback is formatted only for the
+        sampled failures when traceback_every is set, since the package's DEBUG file
+        sink would otherwise accept and write every one of them.
+        """
+        asf_exception = to_asf_exception(ex)
+        name = asf_exception.__class__.__name__
+        self.error_counts[name] += 1
+        logger.error(f"{context}: {name}: {asf_exception}")
+        total = self.error_counts.total()
+        if self.traceback_every and total % self.traceback_every == 1 % self.traceback_every:
+            logger.opt(exception=ex).error(f"Traceback of failed request {total}")
+        raise asf_exception from ex
 
     async def get(self, resource, parameters=None):
         if parameters is None:
@@ -53,26 +264,18 @@ class IPCProtocolHandler:
         logger.debug(f"Requesting {url} with parameters {parameters}")
 
         # Use reusable client if available, otherwise create temporary one
-        if self._client:
-            client = self._client
-            should_close = False
-        else:
-            client = httpx.AsyncClient(headers=self.headers)
-            should_close = True
+        client, should_close = self._acquire_client()
 
         try:
-            response = await client.get(url, params=parameters)
+            response = await self._send(resource, lambda **kwargs: client.get(url, params=parameters, **kwargs))
             response.raise_for_status()
             logger.debug(f"{response.url}")
             logger.debug(f"{response.json()}")
             return response.json()
         except httpx.HTTPError as ex:
-            logger.error(f"Error Requesting {url} with parameters {parameters}")
-            logger.exception(ex)
-            raise_asf_exception(ex)
+            self._raise_error(ex, f"Error Requesting {url} with parameters {parameters}")
         finally:
-            if should_close:
-                await client.aclose()
+            await self._release_client(client, should_close)
 
     async def post(self, resource, payload=None):
         if payload:
@@ -84,26 +287,18 @@ class IPCProtocolHandler:
         logger.debug(f"Requesting {url} with payload {payload}")
 
         # Use reusable client if available, otherwise create temporary one
-        if self._client:
-            client = self._client
-            should_close = False
-        else:
-            client = httpx.AsyncClient(headers=self.headers)
-            should_close = True
+        client, should_close = self._acquire_client()
 
         try:
-            response = await client.post(url, json=payload)
+            response = await self._send(resource, lambda **kwargs: client.post(url, json=payload, **kwargs))
             response.raise_for_status()
             logger.debug(f"{response.url}")
             logger.debug(f"{response.json()}")
             return response.json()
         except httpx.HTTPError as ex:
-            logger.error(f"Error Requesting {url} with payload {payload}")
-            logger.exception(ex)
-            raise_asf_exception(ex)
+            self._raise_error(ex, f"Error Requesting {url} with payload {payload}")
         finally:
-            if should_close:
-                await client.aclose()
+            await self._release_client(client, should_close)
 
     async def delete(self, resource, parameters=None):
         if parameters is None:
@@ -115,35 +310,134 @@ class IPCProtocolHandler:
         url = self.base_url + resource
         logger.debug(f"Requesting DELETE {url} with parameters {parameters}")
 
-        if self._client:
-            client = self._client
-            should_close = False
-        else:
-            client = httpx.AsyncClient(headers=self.headers)
-            should_close = True
+        client, should_close = self._acquire_client()
 
         try:
-            response = await client.delete(url, params=parameters)
+            response = await self._send(resource, lambda **kwargs: client.delete(url, params=parameters, **kwargs))
             response.raise_for_status()
             logger.debug(f"{response.url}")
             logger.debug(f"{response.json()}")
             return response.json()
         except httpx.HTTPError as ex:
-            logger.error(f"Error DELETE {url} with parameters {parameters}")
-            logger.exception(ex)
-            raise_asf_exception(ex)
+            self._raise_error(ex, f"Error DELETE {url} with parameters {parameters}")
         finally:
-            if should_close:
-                await client.aclose()
+            await self._release_client(client, should_close)
+
+    async def stream(self, resource, parameters=None, chunk_size=65536, timeout=None):
+        """
+        Stream the body of a GET request as raw chunks instead of decoding it at once.
+
+        Like other requests, the caller's deadline covers queueing and the whole
+        body, and the time spent waiting on ASF is recorded as the endpoint's latency.
+
+        Args:
+            resource: API resource path
+            parameters: Optional query parameters
+            chunk_size: Maximum size of yielded chunks in bytes
+            timeout: Optional deadline in seconds from the first chunk requested; it only shortens the caller's
+                deadline. Taken here since a deadline context cannot span the yields of a generator
+
+        Yields:
+            bytes: Decompressed body chunks
+
+        Raises:
+            ASFTimeoutError: If the deadline or the adaptive timeout is exceeded before the body ends
+        """
+        if parameters is None:
+            parameters = {}
+        if not isinstance(parameters, dict):
+            message = '"parameters" variable must be a dictionary'
+            logger.error(message)
+            raise TypeError(message)
+        url = self.base_url + resource
+        logger.debug(f"Streaming {url} with parameters {parameters}")
+
+        with deadline(timeout):
+            timeout = remaining()
+        if timeout is not None and timeout <= 0:
+            raise error.ASFTimeoutError(f"Deadline for {resource} expired before the request was sent")
+        expires = None if timeout is None else time.monotonic() + timeout
+        adaptive = None
+        waited = 0.0
+
+        async def within(awaitable):
+            # The deadline bounds the whole stream, consumer time included; without one the
+            # adaptive timeout bounds the total time spent waiting on ASF once a slot is held
+            nonlocal waited
+            if expires is not None:
+                budget = expires - time.monotonic()
+            elif adaptive is not None:
+                budget = adaptive - waited
+            else:
+                budget = None
+            started = time.monotonic()
+            try:
+                return await (awaitable if budget is None else self._bounded(resource, awaitable, max(budget, 0)))
+            finally:
+                waited += time.monotonic() - started
 
+        client, should_close = self._acquire_client()
 
-def _safe_response_payload(response: httpx.Response):
-    """Extract response payload safely, trying JSON first, then text."""
+        try:
+            await within(self.scheduler.acquire(classify(resource)))
+            try:
+                waited = 0.0
+                adaptive = self._adaptive_timeout(resource)
+                request = client.build_request("GET", url, params=parameters, headers=self._encoding_headers(resource))
+                response = await within(client.send(request, stream=True))
+                try:
+                    if response.is_error:
+                        await within(response.aread())
+                    response.raise_for_status()
+                    chunks = response.aiter_bytes(chunk_size)
+                    while True:
+                        try:
+                            chunk = await within(chunks.__anext__())
+                        except StopAsyncIteration:
+                            break
+                        yield chunk
+                    self.latency.record(endpoint_key(resource), waited)
+                finally:
+                    await response.aclose()
+            finally:
+                self.scheduler.release()
+        except httpx.HTTPError as ex:
+            self._raise_error(ex, f"Error Streaming {url} with parameters {parameters}")
+        finally:
+            await self._release_client(client, should_close)
+
+
+_REASON_KEYS = ("Message", "message", "Error", "error", "detail")
+
+# Non-status httpx errors by base class, resolved once per concrete exception type
+_EXCEPTION_BASES = (
+    (httpx.TimeoutException, error.ASFTimeoutError),
+    (httpx.RequestError, error.ASFNetworkError),
+)
+_exception_classes: dict[type, type] = {}
+
+
+def _exception_class(ex: Exception) -> type:
+    """ASFConnector exception class for an exception without an HTTP status"""
+    cls = _exception_classes.get(type(ex))
+    if cls is None:
+        cls = next((target for base, target in _EXCEPTION_BASES if isinstance(ex, base)), error.ASFIPCError)
+        _exception_classes[type(ex)] = cls
+    return cls
+
+
+def _decode_error_body(response: httpx.Response):
+    """Decode an error response once, returning (payload, reason); JSON first, then text."""
     try:
-        return response.json()
+        data = response.json()
     except ValueError:
         text = response.text.strip()
-        return text or None
+        return text or None, text or f"HTTP {response.status_code}"
+    if isinstance(data, dict):
+        for key in _REASON_KEYS:
+            if key in data:
+                return data, str(data[key])
+    return data, f"HTTP {response.status_code}"
 
 
 def extract_reason_from_exception(ex: Exception):
@@ -151,16 +445,7 @@ def extract_reason_from_exception(ex: Exception):
     if isinstance(ex, httpx.HTTPStatusError):
         response = ex.response
         if response is not None:
-            try:
-                data = response.json()
-                for key in ("Message", "message", "Error", "error", "detail"):
-                    if key in data:
-                        return str(data[key])
-            except ValueError:
-                text = response.text.strip()
-                if text:
-                    return text
-            return f"HTTP {response.status_code}"
+            return _decode_error_body(response)[1]
     if isinstance(ex, httpx.RequestError):
         return str(ex)
     if len(ex.args) > 0:
@@ -174,6 +459,29 @@ def extract_reason_from_exception(ex: Exception):
     return str(ex)
 
 
+def to_asf_exception(ex: httpx.HTTPError) -> error.ASFConnectorError:
+    """
+    Convert an httpx exception to the matching ASFConnector exception.
+
+    The response body of an HTTP status error is decoded once and serves as both
+    the exception payload and the source of its message.
+
+    Args:
+        ex: The httpx exception to convert
+
+    Returns:
+        ASFConnectorError: Exception to raise, not yet raised
+    """
+    if isinstance(ex, httpx.HTTPStatusError) and ex.response is not None:
+        status_code = ex.response.status_code
+        response_payload, message = _decode_error_body(ex.response)
+        exception_cls = error.HTTP_STATUS_EXCEPTION_MAP.get(status_code, error.ASFHTTPError)
+        return exception_cls(message, status_code=status_code, payload=response_payload)
+    exception_cls = _exception_class(ex)
+    message = str(ex) if isinstance(ex, httpx.RequestError) else extract_reason_from_exception(ex)
+    return exception_cls(message)
+
+
 def raise_asf_exception(ex: httpx.HTTPError):
     """
     Convert httpx exceptions to ASFConnector exceptions and raise them.
@@ -187,22 +495,7 @@ def raise_asf_exception(ex: httpx.HTTPError):
         ASFHTTPError: For other HTTP errors
         ASFIPCError: For other IPC errors
     """
-    status_code = None
-    response_payload = None
-
-    if isinstance(ex, httpx.HTTPStatusError) and ex.response is not None:
-        status_code = ex.response.status_code
-        response_payload = _safe_response_payload(ex.response)
-        exception_cls = error.HTTP_STATUS_EXCEPTION_MAP.get(status_code, error.ASFHTTPError)
-    elif isinstance(ex, httpx.RequestError):
-        exception_cls = error.ASFNetworkError
-    else:
-        exception_cls = error.ASFIPCError
-
-    message = extract_reason_from_exception(ex)
-    asf_exception = exception_cls(message, status_code=status_code, payload=response_payload)
-
-    raise asf_exception from ex
+    raise to_asf_exception(ex) from ex
 
 
 def build_error_payload(ex: httpx.HTTPError):
@@ -218,31 +511,17 @@ def build_error_payload(ex: httpx.HTTPError):
     Returns:
         dict: Error information dictionary
     """
-    status_code = None
-    response_payload = None
-
-    if isinstance(ex, httpx.HTTPStatusError) and ex.response is not None:
-        status_code = ex.response.status_code
-        response_payload = _safe_response_payload(ex.response)
-        exception_cls = error.HTTP_STATUS_EXCEPTION_MAP.get(status_code, error.ASFHTTPError)
-    elif isinstance(ex, httpx.RequestError):
-        exception_cls = error.ASFNetworkError
-    else:
-        exception_cls = error.ASFIPCError
-
-    message = extract_reason_from_exception(ex)
-    asf_exception = exception_cls(message, status_code=status_code, payload=response_payload)
-
+    asf_exception = to_asf_exception(ex)
     payload = {
         "Success": False,
-        "Message": message,
+        "Message": str(asf_exception),
         "ExceptionType": asf_exception.__class__.__name__,
         "Exception": asf_exception,
     }
 
-    if status_code is not None:
-        payload["StatusCode"] = status_code
-    if response_payload is not None:
-        payload["ResponsePayload"] = response_payload
+    if asf_exception.status_code is not None:
+        payload["StatusCode"] = asf_exception.status_code
+    if asf_exception.payload is not None:
+        payload["ResponsePayload"] = asf_exception.payload
 
     return payload
@@ -1,6 +1,7 @@
 # 25.10.28 Modified by angjustinl from dmcallejo/ASFBot/IPCProtocol
 # source code at https://github.com/dmcallejo/ASFBot
 # More information see https://deepwiki.com/JustArchiNET/ArchiSteamFarm/4.1-api-controllers#asfcontroller
+import asyncio
 from pathlib import Path
 import sys
 
@@ -8,7 +9,9 @@ import httpx
 from loguru import logger
 
 from . import error as error_module
-from .config import ASFConfig, asf_config, load_config
+from .compression import CompressionPolicy
+from .config import ASFConfig, ASFEndpoint, asf_config, load_config
+from .config_sync import GlobalConfigManager
 from .Controllers.ASFController import ASFController
 from .Controllers.BotController import BotController
 from .Controllers.CommandController import CommandController
@@ -33,8 +36,21 @@ from .error import (
     ASFHTTPError,
     ASFIPCError,
     ASFNetworkError,
+    ASFTimeoutError,
 )
+from .events import BotEvent, BotEventType, EventBus
+from .fanout import BotResult, FanOut
+from .health import HEALTH_CHECK_MODES, HealthMonitor, health_cache
 from .IPCProtocol import IPCProtocolHandler
+from .key_import import import_keys
+from .ledger import KeyLedger, redeem_new
+from .reload import ConfigWatcher
+from .replay import RecordingTransport, ReplayTransport
+from .reports import BotInfoReport, RedeemReport
+from .scheduler import Priority, RequestScheduler, priority
+from .sharding import ShardedPoller
+from .timeouts import deadline
+from .watcher import BotDelta, BotWatcher
 
 logger.remove()
 logger.add(
@@ -74,6 +90,10 @@ class ASFConnector:
         # Method 3: Without context manager (creates temporary connections)
         connector = ASFConnector(host='127.0.0.1', port='1242', password='your_password')
         info = await connector.asf.get_info()
+
+        # Short-lived connectors: reuse a health check result for 60 seconds
+        async with ASFConnector.from_config(config, health_check_mode="cached", health_check_ttl=60) as connector:
+            info = await connector.asf.get_info()
     """
 
     def __init__(
@@ -83,7 +103,43 @@ class ASFConnector:
         path: str | None = None,
         password: str | None = None,
         config: ASFConfig | None = None,
+        health_check_mode: str | None = None,
+        health_check_ttl: float | None = None,
+        health_monitor_interval: float | None = None,
+        fanout_concurrency: int | None = None,
+        max_in_flight: int | None = None,
+        adaptive_timeouts: bool | None = None,
+        key_ledger: str | KeyLedger | None = None,
+        socket_path: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        compression: bool | CompressionPolicy | None = None,
+        endpoint: str | ASFEndpoint | None = None,
     ):
+        """
+        Args:
+            host: ASF IPC host address
+            port: ASF IPC port
+            path: ASF IPC API path (default: /Api)
+            password: ASF IPC password (optional)
+            config: ASFConfig object used when host and port are not given
+            health_check_mode: Health check on context entry: "blocking" (default), "skip",
+                "background" or "cached" (reuse a successful result younger than health_check_ttl)
+            health_check_ttl: Seconds a cached health check result is reused
+            health_monitor_interval: Seconds between background keep-alive health checks
+                while the context is active (disabled if None)
+            fanout_concurrency: Maximum number of per-bot operations run at once by map()
+            max_in_flight: Maximum number of IPC requests in flight to ASF (0 for unlimited)
+            adaptive_timeouts: Derive request timeouts from observed per-endpoint latency percentiles
+            key_ledger: KeyLedger or SQLite file path; redeem_report() and bot_redeem() then skip
+                keys the ledger has settled and record new outcomes
+            socket_path: Unix domain socket to reach ASF through (e.g. a local reverse proxy)
+                instead of TCP to host and port
+            transport: Custom httpx transport for all requests; it is not closed by the connector
+            compression: Request compressed responses from heavy endpoints (Inventory, NLog/File);
+                a CompressionPolicy chooses the endpoints and codecs
+            endpoint: ASFEndpoint, or the name of one in config.asf_endpoints, to connect to when host and
+                port are not given; its pool and in-flight limits apply (default: the config's first endpoint)
+        """
         # Enable rich traceback for better error display
         if asf_config.enable_rich_traceback:
             try:
@@ -102,18 +158,53 @@ class ASFConnector:
             self.port = port
             self.path = path if path is not None else "/Api"
             logger.debug("ASFConnector initialized with parameters")
-        elif config:
-            self.host = config.asf_host
-            self.port = config.asf_port
-            self.path = config.asf_path
-            password = config.asf_password
-            logger.debug("ASFConnector initialized from config object")
+        elif config or endpoint is not None:
+            if not isinstance(endpoint, ASFEndpoint):
+                try:
+                    endpoint = (config or asf_config).get_endpoint(endpoint)
+                except ValueError as ex:
+                    raise ASFConnectorError(str(ex)) from None
+            self.host = endpoint.host
+            self.port = endpoint.port
+            self.path = endpoint.path
+            password = endpoint.password
+            socket_path = socket_path if socket_path is not None else endpoint.socket_path
+            if max_in_flight is None:
+                max_in_flight = endpoint.max_in_flight
+            logger.debug(f"ASFConnector initialized from endpoint '{endpoint.name}'")
         else:
             raise ASFConnectorError("Either config or host and port must be provided")
-
+        # Name of the config endpoint apply_config() follows (None when given host and port)
+        self.endpoint = endpoint.name if isinstance(endpoint, ASFEndpoint) else None
+
+        settings = config or asf_config
+        self.health_check_mode = (health_check_mode or settings.asfc_health_check).lower()
+        if self.health_check_mode not in HEALTH_CHECK_MODES:
+            raise ASFConnectorError(f"Health check mode must be one of {HEALTH_CHECK_MODES}")
+        self.health_check_ttl = health_check_ttl if health_check_ttl is not None else settings.asfc_health_check_ttl
+        self.health_monitor_interval = (
+            health_monitor_interval if health_monitor_interval is not None else settings.asfc_health_monitor_interval
+        )
+        self.health_monitor: HealthMonitor | None = None
+        self._health_task: asyncio.Task | None = None
+        self._events: EventBus | None = None
+
+        self.socket_path = socket_path
         logger.info(f"{__name__} initialized. Host: '{self.host}'. Port: '{self.port}'")
         # Create shared connection handler for all controllers
-        self.connection_handler = IPCProtocolHandler(self.host, self.port, self.path, password)
+        self.scheduler = RequestScheduler(max_in_flight if max_in_flight is not None else settings.asfc_max_in_flight)
+        self.connection_handler = IPCProtocolHandler(
+            self.host,
+            self.port,
+            self.path,
+            password,
+            self.scheduler,
+            adaptive_timeouts=adaptive_timeouts if adaptive_timeouts is not None else settings.asfc_adaptive_timeouts,
+            uds=socket_path,
+            transport=transport,
+            compression=compression if compression is not None else settings.asfc_compression,
+            limits=endpoint.limits() if isinstance(endpoint, ASFEndpoint) else None,
+        )
         self.error = error_module
 
         # Initialize controllers with shared connection handler
@@ -124,14 +215,25 @@ class ASFConnector:
         self.type = TypeController(self.connection_handler)
         self.structure = StructureController(self.connection_handler)
         self.twofa = TwoFactorAuthenticationController(self.connection_handler)
+        self.global_config = GlobalConfigManager(self.asf)
+        self.asf.info_observers.append(self.global_config.observe)
+        self.fanout = FanOut(
+            self.bot,
+            concurrency=fanout_concurrency if fanout_concurrency is not None else settings.asfc_fanout_concurrency,
+        )
+        key_ledger = key_ledger if key_ledger is not None else settings.asfc_key_ledger
+        self.ledger = KeyLedger(key_ledger) if isinstance(key_ledger, str) else key_ledger
+        # A ledger opened here from a path is closed on context exit and reopened when next used
+        self._ledger_path = key_ledger if isinstance(key_ledger, str) else None
 
     @classmethod
-    def from_config(cls, config: ASFConfig | None = None):
+    def from_config(cls, config: ASFConfig | None = None, **kwargs):
         """
         Create ASFConnector from configuration.
 
         Args:
             config: ASFConfig object. If None, loads from .env file
+            **kwargs: Extra connector options, e.g. health_check_mode
 
         Returns:
             ASFConnector: New connector instance
@@ -146,28 +248,195 @@ class ASFConnector:
         """
         if config is None:
             config = asf_config
-        return cls(config=config)
+        return cls(config=config, **kwargs)
 
     async def __aenter__(self):
         """Enable connection pool reuse via context manager"""
         await self.connection_handler.__aenter__()
         logger.debug("ASFConnector connection pool activated")
 
-        # Perform health check
-        try:
-            await self.health_check()
-            logger.info("ASF health check passed")
-        except (ASFNetworkError, ASFHTTPError) as ex:
-            logger.warning(f"Health check failed: {ex}")
-            # Re-raise the exception so caller knows connection failed
-            raise
+        mode = self.health_check_mode
+        if mode == "skip":
+            logger.debug("Health check skipped")
+        elif mode == "cached" and health_cache.get(self._health_key, self.health_check_ttl) is not None:
+            logger.debug("Reusing cached health check result")
+        elif mode == "background":
+            self._health_task = asyncio.create_task(self._background_health())
+        else:
+            # Perform health check
+            try:
+                await self._checked_health()
+                logger.info("ASF health check passed")
+            except (ASFNetworkError, ASFHTTPError) as ex:
+                logger.warning(f"Health check failed: {ex}")
+                await self.connection_handler.__aexit__(type(ex), ex, ex.__traceback__)
+                # Re-raise the exception so caller knows connection failed
+                raise
+
+        if self.health_monitor_interval:
+            self.start_health_monitor(self.health_monitor_interval)
 
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Clean up connection pool"""
-        await self.connection_handler.__aexit__(exc_type, exc_val, exc_tb)
-        logger.debug("ASFConnector connection pool closed")
+        try:
+            if self.health_monitor is not None:
+                await self.health_monitor.stop()
+            if self._health_task is not None and not self._health_task.done():
+                self._health_task.cancel()
+            self._health_task = None
+            if self.twofa.token_cache is not None:
+                await self.twofa.token_cache.stop()
+            if self._events is not None:
+                await self._events.stop()
+        finally:
+            # The pool is closed even if stopping a component failed
+            if self._ledger_path is not None and self.ledger is not None:
+                self.ledger.close()
+                self.ledger = None
+            await self.connection_handler.__aexit__(exc_type, exc_val, exc_tb)
+            logger.debug("ASFConnector connection pool closed")
+
+    async def apply_config(self, config: ASFConfig) -> bool:
+        """
+        Apply a reloaded configuration to this connector without dropping requests in flight.
+
+        The connector follows the endpoint it was created from (by name). Address, path and
+        password changes reuse the warm connection pool, the in-flight cap is resized in place,
+        and only socket or pool limit changes replace the pool after its requests finish.
+
+        Args:
+            config: New configuration
+
+        Returns:
+            bool: Whether the connection pool was replaced
+
+        Raises:
+            ASFConnectorError: If the connector was created from host and port, or its endpoint is gone
+        """
+        if self.endpoint is None:
+            raise ASFConnectorError("Only connectors created from a config endpoint can apply a config")
+        try:
+            endpoint = config.get_endpoint(self.endpoint)
+        except ValueError as ex:
+            raise ASFConnectorError(str(ex)) from None
+        replaced = await self.connection_handler.reconfigure(
+            endpoint.host,
+            endpoint.port,
+            endpoint.path,
+            endpoint.password,
+            uds=endpoint.socket_path,
+            limits=endpoint.limits(),
+        )
+        self.host, self.port, self.path, self.socket_path = (
+            endpoint.host,
+            endpoint.port,
+            endpoint.path,
+            endpoint.socket_path,
+        )
+        self.scheduler.resize(
+            endpoint.max_in_flight if endpoint.max_in_flight is not None else config.asfc_max_in_flight
+        )
+        return replaced
+
+    @property
+    def _health_key(self) -> tuple:
+        return (self.host, self.port, self.socket_path)
+
+    async def _checked_health(self):
+        """Run the health check and remember a successful result in the shared cache"""
+        try:
+            result = await self.health_check()
+        except (ASFNetworkError, ASFHTTPError):
+            health_cache.invalidate(self._health_key)
+            raise
+        health_cache.set(self._health_key, result)
+        return result
+
+    async def _background_health(self):
+        """Health check on context entry without blocking the caller"""
+        try:
+            await self._checked_health()
+            logger.info("ASF background health check passed")
+        except (ASFNetworkError, ASFHTTPError) as ex:
+            logger.warning(f"Background health check failed: {ex}")
+
+    def start_health_monitor(self, interval: float = 30.0) -> HealthMonitor:
+        """
+        Start periodic keep-alive health checks through the connection pool.
+
+        The monitor is stopped automatically when the context manager exits.
+
+        Args:
+            interval: Seconds between checks
+
+        Returns:
+            HealthMonitor: The running monitor (see last_result, last_error)
+        """
+        if self.health_monitor is None or self.health_monitor.interval != interval:
+            self.health_monitor = HealthMonitor(self._checked_health, interval=interval)
+        self.health_monitor.start()
+        return self.health_monitor
+
+    def watch(self, bot_names: str = "ASF", **kwargs) -> BotWatcher:
+        """
+        Create a watcher publishing field-level bot state changes.
+
+        Args:
+            bot_names: Bot name(s) to watch, ASF for all bots
+            **kwargs: BotWatcher options (min_interval, max_interval, backoff, emit_initial)
+
+        Returns:
+            BotWatcher: Watcher to start with ``async with`` or ``start()``
+
+        Example:
+            async with connector.watch(min_interval=2, max_interval=60) as watcher:
+                async for delta in watcher.subscribe(fields={"online"}):
+                    print(delta.bot, delta.changes["online"])
+        """
+        return BotWatcher(self.bot, bot_names, **kwargs)
+
+    @property
+    def events(self) -> EventBus:
+        """
+        Shared bot lifecycle event bus.
+
+        Created on first access over a watcher of all bots (without initial "added" events); it starts
+        polling with its first subscriber and is stopped when the context manager exits. Assign an
+        EventBus to use another source, e.g. EventBus(connector.watch(min_interval=1)) or a ShardedPoller.
+
+        Example:
+            async for event in connector.events.subscribe(types={BotEventType.FARMING_FINISHED}):
+                print(event.bot, "finished farming")
+        """
+        if self._events is None:
+            self._events = EventBus(self.watch("ASF", emit_initial=False))
+        return self._events
+
+    @events.setter
+    def events(self, bus: EventBus):
+        self._events = bus
+
+    def map(self, bots, op, *args, **kwargs):
+        """
+        Run a per-bot operation across bots with bounded concurrency and per-bot FIFO ordering.
+
+        Args:
+            bots: Bot names as an iterable or comma separated string
+            op: BotController method name (e.g. "pause") or coroutine function taking the bot name first
+            *args: Extra positional arguments passed after the bot name
+            **kwargs: Extra keyword arguments for the operation; concurrency=N adds a cap for this call
+
+        Returns:
+            AsyncIterator[BotResult]: Results in completion order
+
+        Example:
+            async for result in connector.map(bots, "get_inventory"):
+                if result.ok:
+                    print(result.bot, len(result.value["Result"]))
+        """
+        return self.fanout.map(bots, op, *args, **kwargs)
 
     async def health_check(self):
         """
@@ -185,18 +454,14 @@ class ASFConnector:
             ASFHTTPError: For HTTP errors
         """
         # Build direct URL to /HealthCheck (not /Api/HealthCheck)
-        health_url = f"http://{self.host}:{self.port}/HealthCheck"
+        health_url = f"{self.connection_handler.root_url}/HealthCheck"
 
-        # Use connection handler's client if available
-        if self.connection_handler._client:
-            client = self.connection_handler._client
-            should_close = False
-        else:
-            client = httpx.AsyncClient(headers=self.connection_handler.headers)
-            should_close = True
+        # Same client accounting and scheduler slot as API requests, so a reconfigure cannot close the client mid-check
+        handler = self.connection_handler
+        client, should_close = handler._acquire_client()
 
         try:
-            response = await client.get(health_url)
+            response = await handler._send("/HealthCheck", lambda **kwargs: client.get(health_url, **kwargs))
             response.raise_for_status()
             logger.debug(f"Health check: {response.url} - {response.status_code}")
 
@@ -230,8 +495,7 @@ class ASFConnector:
 
             raise_asf_exception(ex)
         finally:
-            if should_close:
-                await client.aclose()
+            await handler._release_client(client, should_close)
 
     async def get_asf_info(self):
         """
@@ -250,47 +514,21 @@ class ASFConnector:
         New code should use: connector.bot.get_info(bot)
         """
         logger.debug(f"get_bot_info: bot {bot}")
+        return (await self.bot_info_report(bot)).to_text()
+
+    async def bot_info_report(self, bot):
+        """
+        Fetches info of given bots as a structured report.
+
+        Args:
+            bot: Bot name(s), can use ASF for all bots
+
+        Returns:
+            BotInfoReport: Per-bot farming status with a tally of states,
+                renderable with ASFConnector.reports.render()
+        """
         response = await self.bot.get_info(bot)
-        if "Result" in response:
-            message = ""
-            for bot_name in response["Result"]:
-                message += f"Bot {bot_name}: "
-                bot = response["Result"][bot_name]
-                if bot["IsConnectedAndLoggedOn"]:
-                    cards_farmer = bot["CardsFarmer"]
-                    farm_message = ""
-                    if cards_farmer["Paused"]:
-                        farm_message += "Farming paused."
-                    elif cards_farmer["CurrentGamesFarming"]:
-                        farm_message += "Currently farming games:"
-                    for current_games in cards_farmer["CurrentGamesFarming"]:
-                        appid = current_games["AppID"]
-                        appname = current_games["GameName"]
-                        cards_remaining = current_games["CardsRemaining"]
-                        farm_message += f"\n\t[{appid}/{appname}] {cards_remaining} cards remaining."
-                    if len(cards_farmer["GamesToFarm"]) > 0:
-                        farm_message += " {} game(s) to farm (".format(len(cards_farmer["GamesToFarm"]))
-                        for games_to_farm in cards_farmer["GamesToFarm"]:
-                            appid = games_to_farm["AppID"]
-                            appname = games_to_farm["GameName"]
-                            farm_message += f"[{appid}/{appname}] "
-                        farm_message = farm_message[:-1] + "). "
-                    time_remaining = cards_farmer["TimeRemaining"]
-                    if time_remaining != "00:00:00":
-                        farm_message += f"Time remaining: {time_remaining}"
-                    if len(farm_message) == 0:
-                        farm_message += "Idle."
-                    message += farm_message + "\n"
-                else:
-                    if len(bot["BotConfig"]) == 0:
-                        message += "Not configured.\n"
-                    else:
-                        message += "Offline.\n"
-        elif response["Success"]:
-            message = f"Bot {bot} not found."
-        else:
-            message = "Getting bot info failed: {}".format(response["Message"])
-        return message
+        return BotInfoReport.from_response(response, bot)
 
     async def bot_redeem(self, bot, keys):
         """
@@ -299,46 +537,51 @@ class ASFConnector:
         Note: This method is kept for backward compatibility.
         New code should use: connector.bot.redeem(bot, keys)
         """
-        response = await self.bot.redeem(bot, keys)
-        if "Result" in response:
-            results = response["Result"]
-            message = ""
-            for bot_name in results:
-                bot = results[bot_name]
-                for key in bot:
-                    if bot[key]:
-                        message += f"Bot {bot_name}: \n"
-                        if "purchase_receipt_info" in bot[key] and bot[key]["purchase_receipt_info"]:
-                            purchase_receipt_info = bot[key]["purchase_receipt_info"]
-                            items = ""
-                            # Parse items in the key
-                            for item in purchase_receipt_info["line_items"]:
-                                items += "[{}, {}] ".format(item["packageid"], item["line_item_description"])
-                            # Build message with the receipt info and the items
-                            message += "\t[{}] {}: {}/{}\n".format(
-                                key,
-                                items,
-                                purchase_receipt_info["purchase_status"]
-                                if type(purchase_receipt_info["purchase_status"]) is str
-                                else Result[purchase_receipt_info["purchase_status"]],
-                                purchase_receipt_info["result_detail"]
-                                if type(purchase_receipt_info["result_detail"]) is str
-                                else PurchaseResultDetail[purchase_receipt_info["result_detail"]],
-                            )
-                        else:
-                            message += "\t[{}] {}/{}\n".format(
-                                key,
-                                bot[key]["Result"] if type(bot[key]["Result"]) is str else Result[bot[key]["Result"]],
-                                bot[key]["PurchaseResultDetail"]
-                                if type(bot[key]["PurchaseResultDetail"]) is str
-                                else PurchaseResultDetail[bot[key]["PurchaseResultDetail"]],
-                            )
-
-        elif response["Success"]:
-            message = f"Bot {bot} not found."
-        else:
-            message = "Redeem failed: {}".format(response["Message"])
-        return message
+        return (await self.redeem_report(bot, keys)).to_text()
+
+    def _open_ledger(self) -> KeyLedger | None:
+        """The key ledger, reopening one opened from a path after a context exit closed it"""
+        if self.ledger is None and self._ledger_path is not None:
+            self.ledger = KeyLedger(self._ledger_path)
+        return self.ledger
+
+    async def redeem_report(self, bot, keys):
+        """
+        Redeems cd-keys on given bot and returns a structured report.
+
+        Args:
+            bot: Bot name(s)
+            keys: Key or list of keys
+
+        Returns:
+            RedeemReport: Per-key outcomes with per-bot and per-detail tallies,
+                renderable with ASFConnector.reports.render(). With a key ledger,
+                keys it has settled are listed in skipped instead of being sent.
+        """
+        ledger = self._open_ledger()
+        if ledger is None:
+            response = await self.bot.redeem(bot, keys)
+            return RedeemReport.from_response(response, bot)
+        response, skipped = await redeem_new(self.bot, bot, keys, ledger)
+        report = RedeemReport() if response is None else RedeemReport.from_response(response, bot)
+        report.skipped = skipped
+        return report
+
+    async def import_keys(self, source, bots, **kwargs):
+        """
+        Streams keys from a CSV, TSV or ASF-format file into the background game redeemer.
+
+        Args:
+            source: File path, or an iterable of lines
+            bots: Bot name(s) receiving chunks of keys in turn
+            **kwargs: Extra import options, e.g. chunk_size, concurrency, progress
+                (see ASFConnector.key_import.import_keys)
+
+        Returns:
+            ImportStats: Rows read, keys submitted, skipped and rejected
+        """
+        kwargs.setdefault("ledger", self._open_ledger())
+        return await import_keys(self.bot, source, bots, **kwargs)
 
     async def send_command(self, command):
         """
@@ -365,9 +608,11 @@ __all__ = [
     "ASFConnector",
     "ASFConnectorError",
     "ASFController",
+    "ASFEndpoint",
     "ASFHTTPError",
     "ASFIPCError",
     "ASFNetworkError",
+    "ASFTimeoutError",
     "ASF_BadRequest",
     "ASF_Forbidden",
     "ASF_LengthRequired",
@@ -377,13 +622,34 @@ __all__ = [
     "ASF_NotImplemented",
     "ASF_Unauthorized",
     "BotController",
+    "BotDelta",
+    "BotEvent",
+    "BotEventType",
+    "BotInfoReport",
+    "BotResult",
+    "BotWatcher",
     "CommandController",
+    "CompressionPolicy",
+    "ConfigWatcher",
+    "EventBus",
+    "FanOut",
+    "GlobalConfigManager",
+    "HealthMonitor",
+    "KeyLedger",
     "NLogController",
+    "Priority",
     "PurchaseResultDetail",
+    "RecordingTransport",
+    "RedeemReport",
+    "ReplayTransport",
+    "RequestScheduler",
     "Result",
+    "ShardedPoller",
     "StructureController",
     "TwoFactorAuthenticationController",
     "TypeController",
+    "deadline",
     "error",
     "load_config",
+    "priority",
 ]
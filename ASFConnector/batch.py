@@ -0,0 +1,243 @@
+"""
+JSON-lines batch runner for shell pipelines.
+
+Reads one operation per line from stdin, runs them concurrently over one
+pooled connector and writes one result per line to stdout in completion order.
+Input is read only as fast as results complete, so memory stays flat no matter
+how long the stream is. Operations sharing a bot run in input order; an
+operation on "ASF" (every bot) is ordered with all others.
+
+Input lines:
+    {"id": 1, "op": "stop", "bots": "bot1"}
+    {"id": 2, "op": "start", "bots": "bot1,bot2"}
+    {"id": 3, "op": "redeem", "bots": "bot1", "keys": ["AAAAA-BBBBB-CCCCC"]}
+    {"id": 4, "op": "input", "bots": "bot1", "type": "TwoFactorAuthentication", "value": "ABCDE"}
+    {"id": 5, "op": "update_config", "bots": "bot1", "config": {"BotConfig": {"Enabled": true}}}
+
+Output lines:
+    {"id": 1, "line": 1, "op": "stop", "bots": "bot1", "ok": true, "elapsed": 0.012, "result": {...}}
+    {"id": 3, "line": 3, "op": "redeem", "bots": "bot1", "ok": false, "elapsed": 0.2, "error": "ASF_NotFound: ..."}
+
+Usage:
+    python -m ASFConnector.batch --concurrency 64 < operations.jsonl > results.jsonl
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterable, Callable, Iterable
+import json
+import sys
+import time
+
+from loguru import logger
+
+# Operation name -> (required fields besides "bots", coroutine function of (bot controller, bots, operation))
+OPERATIONS: dict[str, tuple[tuple[str, ...], Callable]] = {
+    "start": ((), lambda bot, bots, op: bot.start(bots)),
+    "stop": ((), lambda bot, bots, op: bot.stop(bots)),
+    "pause": ((), lambda bot, bots, op: bot.pause(bots)),
+    "resume": ((), lambda bot, bots, op: bot.resume(bots)),
+    "redeem": (("keys",), lambda bot, bots, op: bot.redeem(bots, op["keys"])),
+    "input": (("type", "value"), lambda bot, bots, op: bot.input(bots, op["type"], op["value"])),
+    "update_config": (("config",), lambda bot, bots, op: bot.update_config(bots, op["config"])),
+}
+
+
+def parse_operation(line: str) -> dict:
+    """
+    Parse and validate one input line.
+
+    Args:
+        line: JSON object with "op", "bots" and the operation's fields
+
+    Returns:
+        dict: The operation, with "bots" normalized to a comma separated string
+    """
+    operation = json.loads(line)
+    if not isinstance(operation, dict):
+        raise ValueError("Operation must be a JSON object")
+    name = operation.get("op")
+    if name not in OPERATIONS:
+        raise ValueError(f"Unknown operation {name!r}, expected one of {sorted(OPERATIONS)}")
+    bots = operation.get("bots")
+    if isinstance(bots, list):
+        bots = ",".join(bots)
+    if not bots or not isinstance(bots, str):
+        raise ValueError('"bots" must be a bot name, a comma separated string or a list of names')
+    operation["bots"] = bots
+    missing = [field for field in OPERATIONS[name][0] if field not in operation]
+    if missing:
+        raise ValueError(f"Operation {name} is missing {missing}")
+    return operation
+
+
+async def _iterate(lines: AsyncIterable[str] | Iterable[str]):
+    if isinstance(lines, AsyncIterable):
+        async for line in lines:
+            yield line
+    else:
+        for line in lines:
+            yield line
+
+
+async def run_batch(
+    connector,
+    lines: AsyncIterable[str] | Iterable[str],
+    emit: Callable[[dict], None],
+    concurrency: int = 32,
+) -> Counter:
+    """
+    Run JSON-lines operations concurrently and emit results in completion order.
+
+    A new line is only read once fewer than ``concurrency`` operations are running.
+    Operations naming a common bot run in input order, so "stop bot1" finishes
+    before a later "start bot1,bot2" begins; "ASF" counts as naming every bot.
+
+    Args:
+        connector: ASFConnector, usually entered with ``async with``
+        lines: Input lines as an async or plain iterable
+        emit: Called with each result dict as it completes
+        concurrency: Maximum number of operations running at once
+
+    Returns:
+        Counter: "ok" and "failed" totals
+    """
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+    slots = asyncio.Semaphore(concurrency)
+    tasks: set[asyncio.Task] = set()
+    # Bot name -> last task scheduled for it, so the next one naming that bot waits for it
+    chains: dict[str, asyncio.Task] = {}
+    # Last task scheduled for "ASF"; every later task waits for it
+    fleet: asyncio.Task | None = None
+    totals: Counter = Counter()
+
+    def finish(result: dict):
+        totals["ok" if result["ok"] else "failed"] += 1
+        emit(result)
+
+    def schedule(number: int, operation: dict) -> asyncio.Task:
+        nonlocal fleet
+        names = {name.strip() for name in operation["bots"].split(",")}
+        if "ASF" in names:
+            previous = {*chains.values(), fleet}
+            chains.clear()
+        else:
+            previous = {chains.get(name) for name in names} | {fleet}
+        previous.discard(None)
+        task = asyncio.create_task(run(number, operation, names, previous))
+        if "ASF" in names:
+            fleet = task
+        else:
+            chains.update(dict.fromkeys(names, task))
+        return task
+
+    async def run(number: int, operation: dict, names: set[str], previous: set[asyncio.Task]):
+        nonlocal fleet
+        bots = operation["bots"]
+        result = {"id": operation.get("id"), "line": number, "op": operation["op"], "bots": bots}
+        try:
+            if previous:
+                await asyncio.wait(previous)
+            start = time.perf_counter()
+            try:
+                response = await OPERATIONS[operation["op"]][1](connector.bot, bots, operation)
+            except Exception as ex:
+                result.update(ok=False, elapsed=round(time.perf_counter() - start, 6))
+                result["error"] = f"{type(ex).__name__}: {ex}"
+            else:
+                ok = not (isinstance(response, dict) and response.get("Success") is False)
+                result.update(ok=ok, elapsed=round(time.perf_counter() - start, 6), result=response)
+            finish(result)
+        finally:
+            slots.release()
+            current = asyncio.current_task()
+            for name in names:
+                if chains.get(name) is current:
+                    del chains[name]
+            if fleet is current:
+                fleet = None
+
+    number = 0
+    try:
+        async for line in _iterate(lines):
+            number += 1
+            if not line.strip():
+                continue
+            try:
+                operation = parse_operation(line)
+            except ValueError as ex:
+                # json.JSONDecodeError is a ValueError too
+                finish({"id": None, "line": number, "ok": False, "error": f"{type(ex).__name__}: {ex}"})
+                continue
+            await slots.acquire()
+            task = schedule(number, operation)
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return totals
+
+
+async def _stdin_lines():
+    loop = asyncio.get_running_loop()
+    while True:
+        # A thread read works for pipes, terminals and redirected files alike
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        if not line:
+            return
+        yield line
+
+
+def _write_result(result: dict):
+    sys.stdout.write(json.dumps(result, separators=(",", ":"), ensure_ascii=False, default=str) + "\n")
+    sys.stdout.flush()
+
+
+async def _batch(args) -> Counter:
+    from . import ASFConnector
+
+    params = {
+        key: value
+        for key, value in {
+            "host": args.host,
+            "port": args.port,
+            "path": args.path,
+            "password": args.password,
+            "socket_path": args.unix_socket,
+        }.items()
+        if value is not None
+    }
+    async with ASFConnector(**params, health_check_mode=args.health_check) as connector:
+        return await run_batch(connector, _stdin_lines(), _write_result, concurrency=args.concurrency)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run operations from stdin; the exit status is 1 when any operation failed"""
+    parser = argparse.ArgumentParser(prog="python -m ASFConnector.batch", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default=None, help="Defaults come from the ASF configuration")
+    parser.add_argument("--port", default=None)
+    parser.add_argument("--path", default=None)
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--unix-socket", default=None)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--health-check", default="blocking", choices=("blocking", "skip"))
+    parser.add_argument("--verbose", action="store_true", help="Keep connector logs on stderr")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        # Failures are reported on stdout; per-request ERROR lines would only duplicate them
+        logger.disable("ASFConnector")
+    try:
+        totals = asyncio.run(_batch(args))
+    except KeyboardInterrupt:
+        return 130
+    return 1 if totals["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
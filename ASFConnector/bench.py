@@ -0,0 +1,301 @@
+"""
+Load generator for sizing ASF hosts.
+
+Drives a weighted mix of ``BotController`` and ``ASFController`` calls from a
+number of concurrent workers, started gradually over a ramp-up period, for a
+fixed duration. Reports throughput, latency percentiles per operation and
+errors broken down by the ``error.py`` exception classes.
+
+Usage:
+    python -m ASFConnector.bench --simulate 200 --mix bot.info=7,asf.info=2,bot.redeem=1 --concurrency 32
+    python -m ASFConnector.bench --host 10.0.0.5 --port 1242 --password secret --duration 60 --ramp-up 10
+
+The default mix is read-only. Operations that change bots (pause, resume and
+redeem with random keys, which burns the accounts' redeem attempts) only run
+against a non-simulated host with --allow-mutating.
+"""
+
+import argparse
+import asyncio
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+import json
+import random
+import sys
+import time
+
+from loguru import logger
+
+# Operation name -> coroutine function of (connector, bot name, rng)
+OPERATIONS = {
+    "asf.info": lambda connector, bot, rng: connector.asf.get_info(),
+    "bot.info": lambda connector, bot, rng: connector.bot.get_info(bot),
+    "bot.info_all": lambda connector, bot, rng: connector.bot.get_info("ASF"),
+    "bot.pause": lambda connector, bot, rng: connector.bot.pause(bot),
+    "bot.resume": lambda connector, bot, rng: connector.bot.resume(bot),
+    "bot.redeem": lambda connector, bot, rng: connector.bot.redeem(bot, _random_key(rng)),
+    "bot.inventory": lambda connector, bot, rng: connector.bot.get_inventory(bot),
+    "bot.background": lambda connector, bot, rng: connector.bot.get_games_to_redeem_in_background(bot),
+}
+
+# Operations that change bots or spend redeem attempts on real accounts
+MUTATING_OPERATIONS = frozenset({"bot.pause", "bot.resume", "bot.redeem"})
+
+DEFAULT_MIX = {"bot.info": 6, "asf.info": 2, "bot.inventory": 1, "bot.background": 1}
+
+PERCENTILES = (50, 90, 99)
+
+
+def _random_key(rng: random.Random) -> str:
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    return "-".join("".join(rng.choices(alphabet, k=5)) for _ in range(3))
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """
+    Parse a workload mix such as "bot.info=7,asf.info=2,bot.redeem=1".
+
+    Args:
+        text: Comma separated operation=weight pairs; a bare operation has weight 1
+
+    Returns:
+        dict: Operation name -> weight
+    """
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.strip().partition("=")
+        if not name:
+            continue
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, expected some of {sorted(OPERATIONS)}")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] < 0:
+            raise ValueError(f"Weight of {name} must not be negative")
+    if not mix or not any(mix.values()):
+        raise ValueError("The mix needs at least one operation with a positive weight")
+    return mix
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending list, 0.0 for an empty one"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(percent / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class BenchResult:
+    """Measurements of one workload run"""
+
+    duration: float = 0.0
+    concurrency: int = 0
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    # Exception class name (or "Unsuccessful" for Success=false responses) -> count
+    errors: Counter = field(default_factory=Counter)
+    errors_by_operation: dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+
+    @property
+    def requests(self) -> int:
+        return sum(len(values) for values in self.latencies.values())
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second, failed ones included"""
+        return self.requests / self.duration if self.duration else 0.0
+
+    def summary(self) -> dict:
+        """
+        Summarize the run.
+
+        Returns:
+            dict: requests, throughput, errors and per-operation count, errors and latency percentiles in ms
+        """
+        everything = sorted(value for values in self.latencies.values() for value in values)
+        operations = {}
+        for name, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            operations[name] = {
+                "requests": len(values),
+                "errors": sum(self.errors_by_operation[name].values()),
+                **{f"p{p}": round(percentile(ordered, p) * 1000, 3) for p in PERCENTILES},
+            }
+        return {
+            "duration": round(self.duration, 3),
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "throughput": round(self.throughput, 1),
+            **{f"p{p}": round(percentile(everything, p) * 1000, 3) for p in PERCENTILES},
+            "errors": dict(self.errors.most_common()),
+            "operations": operations,
+        }
+
+    def __str__(self) -> str:
+        summary = self.summary()
+        percentile_headers = "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES)
+        lines = [
+            f"{summary['requests']} requests in {summary['duration']}s with {self.concurrency} workers: "
+            f"{summary['throughput']} req/s",
+            f"{'operation':<16}{'requests':>10}{'errors':>8}{percentile_headers}",
+        ]
+        rows = [*summary["operations"].items(), ("total", {**summary, "errors": sum(self.errors.values())})]
+        for name, stats in rows:
+            values = "".join(f"{stats[f'p{p}']:>10.2f}" for p in PERCENTILES)
+            lines.append(f"{name:<16}{stats['requests']:>10}{stats['errors']:>8}{values}")
+        if self.errors:
+            lines.append("errors: " + ", ".join(f"{name}={count}" for name, count in self.errors.most_common()))
+        return "\n".join(lines)
+
+
+async def run_workload(
+    connector,
+    bots: list[str],
+    mix: dict[str, float] | None = None,
+    concurrency: int = 16,
+    duration: float = 10.0,
+    ramp_up: float = 0.0,
+    seed: int | None = None,
+) -> BenchResult:
+    """
+    Drive a workload through a connector.
+
+    Args:
+        connector: ASFConnector, usually entered with ``async with``
+        bots: Bot names the per-bot operations pick from
+        mix: Operation name -> weight, defaults to DEFAULT_MIX
+        concurrency: Number of workers, each running one request at a time
+        duration: Seconds to run, ramp-up included
+        ramp_up: Seconds over which the workers are started evenly
+        seed: Seed for operation, bot and key choices
+
+    Returns:
+        BenchResult: Latencies and errors
+    """
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+    if not bots:
+        raise ValueError("At least one bot name is required")
+    mix = mix or DEFAULT_MIX
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    result = BenchResult(concurrency=concurrency)
+    started = time.perf_counter()
+    end = started + duration
+
+    async def worker(index: int):
+        rng = random.Random(None if seed is None else seed + index)
+        await asyncio.sleep(ramp_up * index / concurrency)
+        while time.perf_counter() < end:
+            name = rng.choices(names, weights)[0]
+            operation = OPERATIONS[name](connector, rng.choice(bots), rng)
+            start = time.perf_counter()
+            error = None
+            try:
+                response = await operation
+                if isinstance(response, dict) and response.get("Success") is False:
+                    error = "Unsuccessful"
+            except Exception as ex:
+                # ASFConnectorError subclasses name the failure; anything else is counted by its type too
+                error = type(ex).__name__
+            result.latencies[name].append(time.perf_counter() - start)
+            if error is not None:
+                result.errors[error] += 1
+                result.errors_by_operation[name][error] += 1
+
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    result.duration = time.perf_counter() - started
+    return result
+
+
+async def _bench(args) -> BenchResult:
+    from . import ASFConnector
+    from .simulator import ASFSimulator, FaultProfile, parse_latency
+
+    mix = parse_mix(args.mix) if args.mix else None
+    simulator = None
+    if args.simulate:
+        profile = FaultProfile(latency=parse_latency(args.sim_latency) if args.sim_latency else None)
+        simulator = ASFSimulator(bots=args.simulate, profile=profile, seed=args.seed)
+        await simulator.start()
+        params = simulator.connection_params()
+    else:
+        params = {
+            key: value
+            for key, value in {
+                "host": args.host,
+                "port": args.port,
+                "path": args.path,
+                "password": args.password,
+                "socket_path": args.unix_socket,
+            }.items()
+            if value is not None
+        }
+    try:
+        async with ASFConnector(**params, max_in_flight=args.max_in_flight) as connector:
+            bots = [name for name in (args.bots or "").split(",") if name]
+            if not bots:
+                response = await connector.bot.get_info("ASF")
+                bots = list(response.get("Result") or {})
+            return await run_workload(
+                connector,
+                bots,
+                mix=mix,
+                concurrency=args.concurrency,
+                duration=args.duration,
+                ramp_up=args.ramp_up,
+                seed=args.seed,
+            )
+    finally:
+        if simulator is not None:
+            await simulator.stop()
+
+
+def main(argv: list[str] | None = None):
+    """Run a workload and print the report"""
+    parser = argparse.ArgumentParser(prog="python -m ASFConnector.bench", description=__doc__.split("\n\n")[0])
+    target = parser.add_argument_group("target (defaults come from the ASF configuration)")
+    target.add_argument("--host", default=None)
+    target.add_argument("--port", default=None)
+    target.add_argument("--path", default=None)
+    target.add_argument("--password", default=None)
+    target.add_argument("--unix-socket", default=None)
+    target.add_argument("--simulate", type=int, default=0, metavar="BOTS", help="Benchmark a local simulator")
+    target.add_argument("--sim-latency", default=None, help="Simulator latency, e.g. lognormal:0.01,0.8")
+    workload = parser.add_argument_group("workload")
+    workload.add_argument("--mix", default=None, help=f"operation=weight list of {', '.join(OPERATIONS)}")
+    workload.add_argument("--bots", default=None, help="Comma separated bot names, defaults to all bots")
+    workload.add_argument("--concurrency", type=int, default=16)
+    workload.add_argument("--duration", type=float, default=10.0)
+    workload.add_argument("--ramp-up", type=float, default=0.0)
+    workload.add_argument("--max-in-flight", type=int, default=None, help="Connector request cap")
+    workload.add_argument("--seed", type=int, default=None)
+    workload.add_argument(
+        "--allow-mutating",
+        action="store_true",
+        help=f"Allow {', '.join(sorted(MUTATING_OPERATIONS))} against a non-simulated host",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Keep connector logs; errors are counted either way")
+    args = parser.parse_args(argv)
+    if args.mix:
+        try:
+            mix = parse_mix(args.mix)
+        except ValueError as ex:
+            parser.error(str(ex))
+        mutating = sorted(name for name, weight in mix.items() if weight and name in MUTATING_OPERATIONS)
+        if mutating and not args.simulate and not args.allow_mutating:
+            parser.error(f"{', '.join(mutating)} change real bots; pass --allow-mutating to run them")
+
+    if not args.verbose:
+        # One ERROR line per failed request would drown the report
+        logger.disable("ASFConnector")
+    try:
+        result = asyncio.run(_bench(args))
+    except KeyboardInterrupt:
+        return
+    report = json.dumps(result.summary(), indent=2) if args.json else str(result)
+    sys.stdout.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Multi-bot command batching.
+
+ASF commands accept a comma separated list of bots as their first argument,
+e.g. ``!owns bot1,bot2,bot3 730``, and answer with one ``<bot> response`` block
+per bot. ``pack_commands`` splits a long bot list into such commands and
+``parse_command_response`` maps the mixed response back to bots, so a command
+over hundreds of bots costs a handful of requests.
+"""
+
+from collections.abc import Iterable, Iterator
+import re
+
+_BOT_LINE = re.compile(r"^<([^<>\r\n]+)> ?(.*)$")
+
+
+def split_command(command: str) -> tuple[str, str]:
+    """
+    Split a command into its name and arguments following the bot list.
+
+    Args:
+        command: Command without bots, e.g. "owns 730" or "!level"
+
+    Returns:
+        tuple[str, str]: (name, arguments), e.g. ("owns", "730")
+    """
+    name, _, arguments = command.strip().lstrip("!").partition(" ")
+    if not name:
+        raise ValueError("Command is empty")
+    return name, arguments.strip()
+
+
+def pack_commands(command: str, bots: Iterable[str], chunk_size: int = 100) -> Iterator[tuple[list[str], str]]:
+    """
+    Build multi-bot commands covering ``bots``, at most ``chunk_size`` bots each.
+
+    Args:
+        command: Command without bots, e.g. "owns 730"
+        bots: Target bot names
+        chunk_size: Maximum number of bots per command
+
+    Yields:
+        tuple[list[str], str]: Bots of the chunk and the command text, e.g. "!owns bot1,bot2 730"
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be at least 1, got {chunk_size}")
+    name, arguments = split_command(command)
+    suffix = f" {arguments}" if arguments else ""
+    bots = list(dict.fromkeys(bots))
+    for start in range(0, len(bots), chunk_size):
+        chunk = bots[start : start + chunk_size]
+        yield chunk, f"!{name} {','.join(chunk)}{suffix}"
+
+
+def parse_command_response(text: str | None) -> dict[str, str]:
+    """
+    Map a multi-bot command response to the response of each bot.
+
+    Lines starting with ``<bot>`` open the bot's response; following lines without
+    a prefix belong to the same bot. Text before the first prefixed line (ASF's
+    own messages, e.g. an unknown bot) is returned under the empty key.
+
+    Args:
+        text: Result of a command response
+
+    Returns:
+        dict: Bot name -> response text
+    """
+    current: list[str] = []
+    results = {"": current}
+    for line in (text or "").splitlines():
+        match = _BOT_LINE.match(line)
+        if match:
+            current = results.setdefault(match.group(1), [])
+            current.append(match.group(2))
+        else:
+            current.append(line)
+    parsed = {bot: "\n".join(lines).strip() for bot, lines in results.items()}
+    if not parsed.get("", True):
+        del parsed[""]
+    return parsed
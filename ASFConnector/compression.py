@@ -0,0 +1,104 @@
+"""
+Per-endpoint response compression negotiation.
+
+``IPCProtocolHandler`` sends the ``Accept-Encoding`` header chosen by a
+``CompressionPolicy`` with every request. Heavy endpoints such as inventories
+and the log file ask for the most compact codec httpx can decode here (zstd
+and brotli when their packages are installed, gzip otherwise). Endpoints known
+to answer with a few hundred bytes, such as single-bot actions, ask for
+``identity`` because compression would not pay off there. Every other endpoint
+keeps httpx's default, so large responses like ``/Bot/ASF`` stay compressed.
+"""
+
+from collections.abc import Iterable
+from importlib.util import find_spec
+import re
+
+# Codecs httpx decodes; br needs brotli or brotlicffi, zstd needs zstandard
+SUPPORTED_ENCODINGS = ("zstd", "br", "gzip", "deflate")
+
+DEFAULT_COMPRESSED_ROUTES = (
+    r"/Inventory(/|$)",
+    r"^/NLog/File",
+)
+
+# Endpoints whose responses are known to be small: actions on one bot (not ASF or a list) and ASF actions
+DEFAULT_IDENTITY_ROUTES = (
+    r"^/Bot/(?!ASF/)[^/,]+/(Start|Stop|Pause|Resume|Input|Rename|AddLicense|Redeem|RedeemPoints/\d+)$",
+    r"^/Bot/(?!ASF/)[^/,]+/TwoFactorAuthentication/Token$",
+    r"^/ASF/(Exit|Restart|Update|Encrypt|Hash)$",
+)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Encodings httpx can decode in this environment, most compact first"""
+    encodings = []
+    if find_spec("zstandard") is not None:
+        encodings.append("zstd")
+    if find_spec("brotli") is not None or find_spec("brotlicffi") is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return tuple(encodings)
+
+
+class CompressionPolicy:
+    """
+    Chooses the Accept-Encoding header of each request by its resource.
+
+    Usage:
+        policy = CompressionPolicy(routes=[*DEFAULT_COMPRESSED_ROUTES, r"^/Bot/ASF$"])
+        connector = ASFConnector(host, port, compression=policy)
+    """
+
+    def __init__(
+        self,
+        routes: Iterable[str | re.Pattern] = DEFAULT_COMPRESSED_ROUTES,
+        encodings=None,
+        identity_routes: Iterable[str | re.Pattern] = DEFAULT_IDENTITY_ROUTES,
+        default: str | None = None,
+    ):
+        """
+        Initialize the policy
+
+        Args:
+            routes: Resource patterns whose responses are requested with the most compact codecs
+            encodings: Codecs to offer, in order of preference; defaults to available_encodings()
+            identity_routes: Resource patterns of small responses, requested uncompressed
+            default: Accept-Encoding of all other resources; None keeps httpx's default
+        """
+        self.routes = tuple(re.compile(route) if isinstance(route, str) else route for route in routes)
+        self.identity_routes = tuple(
+            re.compile(route) if isinstance(route, str) else route for route in identity_routes
+        )
+        self.default = default
+        self.encodings = tuple(encodings) if encodings is not None else available_encodings()
+        unknown = [encoding for encoding in self.encodings if encoding not in SUPPORTED_ENCODINGS]
+        if unknown:
+            raise ValueError(f"Unsupported encodings {unknown}, expected some of {SUPPORTED_ENCODINGS}")
+        self._compressed = ", ".join(self.encodings) or "identity"
+
+    @classmethod
+    def disabled(cls) -> "CompressionPolicy":
+        """Policy asking every endpoint for uncompressed responses"""
+        return cls(routes=(), identity_routes=(), default="identity")
+
+    def compresses(self, resource: str) -> bool:
+        """Whether responses of ``resource`` are requested compressed"""
+        return any(route.search(resource) for route in self.routes)
+
+    def accept_encoding(self, resource: str) -> str | None:
+        """
+        Get the Accept-Encoding header for a request.
+
+        Args:
+            resource: API resource path, e.g. "/Bot/bot1/Inventory"
+
+        Returns:
+            str | None: e.g. "br, gzip" for heavy endpoints, "identity" for small ones,
+                otherwise the policy default (None: leave httpx's default header)
+        """
+        if self.compresses(resource):
+            return self._compressed
+        if any(route.search(resource) for route in self.identity_routes):
+            return "identity"
+        return self.default
@@ -3,10 +3,107 @@ Configuration module for ASFConnector using Pydantic.
 Reads configuration from .env file with validation.
 """
 
+import httpx
 from loguru import logger
-from pydantic import Field, ValidationError, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .health import HEALTH_CHECK_MODES
+
+
+def _validate_port(v: str) -> str:
+    v = v.strip()
+    try:
+        port_num = int(v)
+        if not (1 <= port_num <= 65535):
+            raise ValueError(f"Port must be between 1 and 65535, got {port_num}")
+    except ValueError as e:
+        if "invalid literal" in str(e):
+            raise ValueError(f'Port must be a valid number, got "{v}"')
+        raise
+    return v
+
+
+def _validate_path(v: str) -> str:
+    v = v.strip()
+    if not v.startswith("/"):
+        v = "/" + v
+    return v
+
+
+class ASFEndpoint(BaseModel):
+    """
+    One ASF IPC endpoint with its own connection pool and request limits.
+
+    Listed in ASF_ENDPOINTS as JSON, e.g.
+    ASF_ENDPOINTS='[{"name": "eu", "host": "10.0.0.5", "password": "secret", "max_connections": 50}]'
+    """
+
+    # Validation errors would otherwise print the input, passwords included
+    model_config = ConfigDict(hide_input_in_errors=True)
+
+    name: str = Field(default="default", description="Name to select the endpoint by")
+
+    host: str = Field(default="127.0.0.1", description="ASF IPC host address")
+
+    port: str = Field(default="1242", description="ASF IPC port")
+
+    path: str = Field(default="/Api", description="ASF IPC API path")
+
+    password: str | None = Field(default=None, repr=False, description="ASF IPC password (optional)")
+
+    socket_path: str | None = Field(default=None, description="Unix domain socket instead of host and port")
+
+    max_connections: int | None = Field(default=None, description="Pool size (httpx default if unset)")
+
+    max_keepalive_connections: int | None = Field(
+        default=None, description="Idle connections kept in the pool (httpx default if unset)"
+    )
+
+    keepalive_expiry: float | None = Field(default=5.0, description="Seconds an idle pooled connection is kept")
+
+    max_in_flight: int | None = Field(
+        default=None, description="Maximum number of IPC requests in flight (ASFC_MAX_IN_FLIGHT if unset)"
+    )
+
+    @field_validator("port", mode="before")
+    @classmethod
+    def validate_port(cls, v) -> str:
+        """Validate port is a valid number"""
+        return _validate_port(str(v))
+
+    @field_validator("path")
+    @classmethod
+    def validate_path(cls, v: str) -> str:
+        """Validate path starts with /"""
+        return _validate_path(v)
+
+    def connection_params(self) -> dict:
+        """
+        Get connection parameters as a dictionary for ASFConnector.
+
+        Returns:
+            dict: Connection parameters
+        """
+        params = {"host": self.host, "port": self.port, "path": self.path}
+        if self.password:
+            params["password"] = self.password
+        if self.socket_path:
+            params["socket_path"] = self.socket_path
+        return params
+
+    def limits(self) -> httpx.Limits | None:
+        """Pool limits of the endpoint, None when every limit is left at the httpx default"""
+        if self.max_connections is None and self.max_keepalive_connections is None and self.keepalive_expiry == 5.0:
+            return None
+        return httpx.Limits(
+            max_connections=self.max_connections if self.max_connections is not None else 100,
+            max_keepalive_connections=(
+                self.max_keepalive_connections if self.max_keepalive_connections is not None else 20
+            ),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
 
 class ASFConfig(BaseSettings):
     """
@@ -15,7 +112,14 @@ class ASFConfig(BaseSettings):
     Reads from environment variables or .env file.
     """
 
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="ignore")
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+        # Keep passwords (ASF_PASSWORD, ASF_ENDPOINTS) out of validation errors, which are logged
+        hide_input_in_errors=True,
+    )
 
     # ASF IPC settings with defaults
     asf_host: str = Field(default="127.0.0.1", description="ASF IPC host address")
@@ -26,10 +130,57 @@ class ASFConfig(BaseSettings):
 
     asf_path: str = Field(default="/Api", description="ASF IPC API path")
 
+    asf_socket_path: str | None = Field(
+        default=None, description="Unix domain socket to reach ASF IPC through instead of host and port"
+    )
+
+    asf_endpoints: list[ASFEndpoint] = Field(
+        default_factory=list,
+        description="ASF IPC endpoints as a JSON list; when set they replace the single ASF_HOST endpoint",
+    )
+
+    asfc_max_connections: int | None = Field(
+        default=None, description="Connection pool size of the ASF_HOST endpoint (httpx default if unset)"
+    )
+
+    asfc_max_keepalive_connections: int | None = Field(
+        default=None, description="Idle connections kept in the pool of the ASF_HOST endpoint (httpx default if unset)"
+    )
+
     enable_rich_traceback: bool = Field(default=False, description="Enable rich traceback for better error display")
 
     asfc_log_level: str = Field(default="INFO", description="ASFConnector Logging level")
 
+    asfc_health_check: str = Field(
+        default="blocking", description="Health check on context entry: blocking, skip, background or cached"
+    )
+
+    asfc_health_check_ttl: float = Field(default=30.0, description="Seconds a cached health check result is reused")
+
+    asfc_health_monitor_interval: float | None = Field(
+        default=None, description="Seconds between background keep-alive health checks (disabled if unset)"
+    )
+
+    asfc_fanout_concurrency: int = Field(
+        default=8, description="Maximum number of per-bot operations run at once by ASFConnector.map"
+    )
+
+    asfc_max_in_flight: int = Field(
+        default=16, description="Maximum number of IPC requests in flight to ASF (0 for unlimited)"
+    )
+
+    asfc_adaptive_timeouts: bool = Field(
+        default=False, description="Derive request timeouts from observed per-endpoint latency percentiles"
+    )
+
+    asfc_compression: bool = Field(
+        default=True, description="Request compressed responses from heavy endpoints (Inventory, NLog/File)"
+    )
+
+    asfc_key_ledger: str | None = Field(
+        default=None, description="SQLite file of key redemption outcomes used to skip settled keys (disabled if unset)"
+    )
+
     @field_validator("asf_host")
     @classmethod
     def validate_host(cls, v: str) -> str:
@@ -42,26 +193,32 @@ class ASFConfig(BaseSettings):
     @classmethod
     def validate_port(cls, v: str) -> str:
         """Validate port is a valid number"""
-        v = v.strip()
-        try:
-            port_num = int(v)
-            if not (1 <= port_num <= 65535):
-                raise ValueError(f"Port must be between 1 and 65535, got {port_num}")
-        except ValueError as e:
-            if "invalid literal" in str(e):
-                raise ValueError(f'Port must be a valid number, got "{v}"')
-            raise
-        return v
+        return _validate_port(v)
 
     @field_validator("asf_path")
     @classmethod
     def validate_path(cls, v: str) -> str:
         """Validate path starts with /"""
-        v = v.strip()
-        if not v.startswith("/"):
-            v = "/" + v
+        return _validate_path(v)
+
+    @field_validator("asf_endpoints")
+    @classmethod
+    def validate_endpoints(cls, v: list[ASFEndpoint]) -> list[ASFEndpoint]:
+        """Validate endpoint names are unique"""
+        names = [endpoint.name for endpoint in v]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Endpoint names must be unique, got duplicates {duplicates}")
         return v
 
+    @field_validator("asf_socket_path")
+    @classmethod
+    def validate_socket_path(cls, v: str | None) -> str | None:
+        """Validate socket path, treating an empty value as TCP"""
+        if v is None or not v.strip():
+            return None
+        return v.strip()
+
     @field_validator("asfc_log_level")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
@@ -71,6 +228,47 @@ class ASFConfig(BaseSettings):
             raise ValueError(f"Log level must be one of {allowed_levels}, got {v}")
         return v
 
+    @field_validator("asfc_health_check")
+    @classmethod
+    def validate_health_check(cls, v: str) -> str:
+        """Validate health check mode is one of the allowed values"""
+        v = v.strip().lower()
+        if v not in HEALTH_CHECK_MODES:
+            raise ValueError(f"Health check mode must be one of {HEALTH_CHECK_MODES}, got {v}")
+        return v
+
+    @field_validator("asfc_health_check_ttl")
+    @classmethod
+    def validate_health_check_ttl(cls, v: float) -> float:
+        """Validate health check TTL is not negative"""
+        if v < 0:
+            raise ValueError(f"Health check TTL must not be negative, got {v}")
+        return v
+
+    @field_validator("asfc_fanout_concurrency")
+    @classmethod
+    def validate_fanout_concurrency(cls, v: int) -> int:
+        """Validate fan-out concurrency is positive"""
+        if v < 1:
+            raise ValueError(f"Fan-out concurrency must be at least 1, got {v}")
+        return v
+
+    @field_validator("asfc_max_in_flight")
+    @classmethod
+    def validate_max_in_flight(cls, v: int) -> int:
+        """Validate in-flight cap is not negative"""
+        if v < 0:
+            raise ValueError(f"Max in-flight requests must not be negative, got {v}")
+        return v
+
+    @field_validator("asfc_key_ledger")
+    @classmethod
+    def validate_key_ledger(cls, v: str | None) -> str | None:
+        """Validate key ledger path, treating an empty value as disabled"""
+        if v is None or not v.strip():
+            return None
+        return v.strip()
+
     def get_connection_params(self) -> dict:
         """
         Get connection parameters as a dictionary for ASFConnector.
@@ -86,9 +284,53 @@ class ASFConfig(BaseSettings):
 
         if self.asf_password:
             params["password"] = self.asf_password
+        if self.asf_socket_path:
+            params["socket_path"] = self.asf_socket_path
 
         return params
 
+    def get_endpoints(self) -> list[ASFEndpoint]:
+        """
+        Get the configured endpoints.
+
+        Returns:
+            list[ASFEndpoint]: ASF_ENDPOINTS, or a single "default" endpoint built from the ASF_* settings
+        """
+        if self.asf_endpoints:
+            return list(self.asf_endpoints)
+        return [
+            ASFEndpoint(
+                host=self.asf_host,
+                port=self.asf_port,
+                path=self.asf_path,
+                password=self.asf_password,
+                socket_path=self.asf_socket_path,
+                max_connections=self.asfc_max_connections,
+                max_keepalive_connections=self.asfc_max_keepalive_connections,
+            )
+        ]
+
+    def get_endpoint(self, name: str | None = None) -> ASFEndpoint:
+        """
+        Get an endpoint by name.
+
+        Args:
+            name: Endpoint name, None for the first endpoint
+
+        Returns:
+            ASFEndpoint: The endpoint
+
+        Raises:
+            ValueError: If no endpoint has that name
+        """
+        endpoints = self.get_endpoints()
+        if name is None:
+            return endpoints[0]
+        for endpoint in endpoints:
+            if endpoint.name == name:
+                return endpoint
+        raise ValueError(f"Unknown endpoint {name!r}, expected one of {[endpoint.name for endpoint in endpoints]}")
+
     def log_config(self) -> None:
         """Log current configuration (without password)"""
         password_display = "***" if self.asf_password else "None"
@@ -126,3 +368,18 @@ try:
 except ValidationError:
     logger.warning("Failed to load config from .env, using defaults")
     asf_config = ASFConfig()
+
+
+def update_shared_config(config: ASFConfig):
+    """
+    Replace the values of the shared ``asf_config`` in place.
+
+    Other modules import ``asf_config`` by name, so the object is updated rather
+    than rebound; ``ASFConnector.from_config()`` and endpoint lookups then use
+    the new values.
+
+    Args:
+        config: Configuration to copy into ``asf_config``
+    """
+    for name in ASFConfig.model_fields:
+        setattr(asf_config, name, getattr(config, name))
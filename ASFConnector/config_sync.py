@@ -0,0 +1,303 @@
+"""
+Diff-based configuration updates.
+
+``rollout_bot_config`` pushes a partial ``BotConfig`` template to many bots. It
+reads the current configs in one multi-bot request and posts a merged config
+only to the bots it would actually change, because every config write makes ASF
+restart the bot. ``GlobalConfigManager`` does the same for ``GlobalConfig``,
+where a write may restart ASF itself.
+"""
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import hashlib
+import json
+
+from loguru import logger
+
+from .error import ASFConnectorError, ASFIPCError
+
+
+def merge_config(current: dict, template: dict) -> dict:
+    """
+    Overlay a partial config onto a full one.
+
+    Args:
+        current: Current configuration
+        template: Keys to set; nested dicts are merged recursively
+
+    Returns:
+        dict: New merged configuration (inputs are not modified)
+    """
+    merged = dict(current)
+    for key, value in template.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def diff_config(current: dict, desired: dict) -> dict[str, tuple]:
+    """
+    Compare two configurations key by key.
+
+    Args:
+        current: Current configuration
+        desired: Desired configuration
+
+    Returns:
+        dict: Key -> (current value, desired value) for every key whose value differs
+    """
+    return {
+        key: (current.get(key), value) for key, value in desired.items() if key not in current or current[key] != value
+    }
+
+
+def config_hash(config: dict) -> str:
+    """
+    Content hash of a configuration, independent of key order.
+
+    Args:
+        config: Configuration dict
+
+    Returns:
+        str: Hex SHA-256 of the canonical JSON encoding
+    """
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class BotConfigRolloutReport:
+    """
+    Outcome of a bot config rollout.
+
+    Attributes:
+        dry_run: Whether writes were skipped
+        changes: Bot name -> changed keys -> (current value, desired value), for bots that need a write
+        unchanged: Bots already matching the template
+        missing: Requested bots ASF did not return
+        updated: Bots successfully written
+        failed: Bot name -> error of a failed write
+    """
+
+    dry_run: bool
+    changes: dict[str, dict[str, tuple]] = field(default_factory=dict)
+    unchanged: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    failed: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """True if no write failed"""
+        return not self.failed
+
+    def summary(self) -> str:
+        """One-line human readable summary"""
+        action = "would update" if self.dry_run else "updated"
+        count = len(self.changes) if self.dry_run else len(self.updated)
+        return (
+            f"{action} {count}, unchanged {len(self.unchanged)}, missing {len(self.missing)}, failed {len(self.failed)}"
+        )
+
+
+async def rollout_bot_config(
+    bot_controller,
+    template: dict,
+    bot_names: str | Iterable[str] = "ASF",
+    concurrency: int = 8,
+    dry_run: bool = False,
+) -> BotConfigRolloutReport:
+    """
+    Apply a partial BotConfig template to bots, writing only where it changes something.
+
+    Args:
+        bot_controller: BotController used for reading and writing configs
+        template: BotConfig keys to set
+        bot_names: Bot name(s) as a comma separated string or iterable, ASF for all bots
+        concurrency: Maximum number of simultaneous config writes
+        dry_run: Only compute the report without writing
+
+    Returns:
+        BotConfigRolloutReport: Planned or applied changes per bot
+
+    Raises:
+        ASFIPCError: If fetching the current configs fails
+    """
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+    names = bot_names if isinstance(bot_names, str) else ",".join(bot_names)
+    response = await bot_controller.get_info(names)
+    if not response.get("Success", True):
+        raise ASFIPCError(response.get("Message") or "Fetching bot configs failed")
+    result = response.get("Result") or {}
+
+    report = BotConfigRolloutReport(dry_run=dry_run)
+    merged_configs = {}
+    for name, bot in result.items():
+        if bot is None:
+            report.missing.append(name)
+            continue
+        current = bot.get("BotConfig") or {}
+        merged = merge_config(current, template)
+        changes = diff_config(current, merged)
+        if changes:
+            report.changes[name] = changes
+            merged_configs[name] = merged
+        else:
+            report.unchanged.append(name)
+    if names != "ASF":
+        report.missing.extend(name for name in names.split(",") if name and name not in result)
+
+    logger.info(f"Bot config rollout: {len(report.changes)} to update, {len(report.unchanged)} unchanged")
+    if dry_run or not merged_configs:
+        return report
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def write(name: str, config: dict):
+        async with semaphore:
+            try:
+                response = await bot_controller.update_config(name, {"BotConfig": config})
+                if not response.get("Success", True):
+                    raise ASFIPCError(response.get("Message") or "Updating bot config failed")
+            except ASFConnectorError as ex:
+                logger.warning(f"Updating config of bot {name} failed: {ex}")
+                report.failed[name] = ex
+            else:
+                report.updated.append(name)
+
+    await asyncio.gather(*(write(name, config) for name, config in merged_configs.items()))
+    return report
+
+
+class GlobalConfigManager:
+    """
+    Conditional writer for ASF's GlobalConfig.
+
+    Keeps the last known GlobalConfig with its content hash and ASF's
+    ProcessStartTime. Updates are merged locally and only posted when they
+    change the hash. Any ASF info response with a new ProcessStartTime (ASF was
+    restarted, possibly with an edited config) replaces the known config; the
+    connector registers ``observe`` with ``ASFController.info_observers`` so
+    every ``connector.asf.get_info()`` call feeds it.
+
+    Usage:
+        manager = connector.global_config
+        if await manager.update({"AutoRestart": False}):
+            print("GlobalConfig written, ASF restarts")
+    """
+
+    def __init__(self, asf_controller):
+        """
+        Initialize the manager
+
+        Args:
+            asf_controller: ASFController used for reading and writing the config
+        """
+        self.asf_controller = asf_controller
+        self.config: dict | None = None
+        self.hash: str | None = None
+        self.process_start_time: str | None = None
+        self.writes = 0
+        self.skipped = 0
+
+    def observe(self, info: dict) -> bool:
+        """
+        Take the GlobalConfig from an ASF info response if ASF restarted since it was last seen.
+
+        Args:
+            info: Response of ASFController.get_info (or its "Result")
+
+        Returns:
+            bool: True if the known config was replaced
+        """
+        result = info.get("Result", info) if "Success" in info else info
+        if not isinstance(result, dict) or not isinstance(result.get("GlobalConfig"), dict):
+            return False
+        start_time = result.get("ProcessStartTime")
+        if self.config is not None and start_time is not None and start_time == self.process_start_time:
+            return False
+        self.config = dict(result["GlobalConfig"])
+        self.hash = config_hash(self.config)
+        self.process_start_time = start_time
+        logger.debug(f"GlobalConfig refreshed (ProcessStartTime {start_time}, hash {self.hash[:12]})")
+        return True
+
+    async def refresh(self) -> dict:
+        """
+        Fetch the current GlobalConfig from ASF.
+
+        Returns:
+            dict: Current GlobalConfig
+
+        Raises:
+            ASFIPCError: If ASF reports an unsuccessful response
+        """
+        response = await self.asf_controller.get_info()
+        if not response.get("Success", True):
+            raise ASFIPCError(response.get("Message") or "Fetching ASF info failed")
+        # Always take the fetched config, even from an ASF process seen before
+        self.process_start_time = None
+        self.observe(response)
+        if self.config is None:
+            raise ASFIPCError("ASF info response did not contain GlobalConfig")
+        return self.config
+
+    def plan(self, changes: dict) -> dict[str, tuple]:
+        """
+        Compute what an update would change against the known config.
+
+        Args:
+            changes: Partial GlobalConfig
+
+        Returns:
+            dict: Key -> (current value, new value) for every key that would change
+        """
+        if self.config is None:
+            raise ASFConnectorError("GlobalConfig is unknown, call refresh() first")
+        return diff_config(self.config, merge_config(self.config, changes))
+
+    async def update(self, changes: dict, force: bool = False, verify: bool = False) -> bool:
+        """
+        Merge a partial GlobalConfig and post it only if the result differs from the known config.
+
+        Args:
+            changes: Partial GlobalConfig
+            force: Post even if nothing changes
+            verify: Fetch the current config first instead of trusting the known one
+
+        Returns:
+            bool: True if a write was posted
+
+        Raises:
+            ASFIPCError: If reading or writing the config fails
+        """
+        if self.config is None or verify:
+            await self.refresh()
+        merged = merge_config(self.config, changes)
+        merged_hash = config_hash(merged)
+        if merged_hash == self.hash and not force:
+            self.skipped += 1
+            logger.debug("GlobalConfig unchanged, skipping write")
+            return False
+        response = await self.asf_controller.update_config({"GlobalConfig": merged})
+        if not response.get("Success", True):
+            raise ASFIPCError(response.get("Message") or "Updating GlobalConfig failed")
+        changed = ", ".join(diff_config(self.config, merged)) or "forced"
+        self.writes += 1
+        self.config = merged
+        self.hash = merged_hash
+        # The write restarts ASF, so the next observed info response is taken as the new baseline
+        self.process_start_time = None
+        logger.info(f"GlobalConfig written ({changed})")
+        return True
+
+    def invalidate(self):
+        """Forget the known config so the next update fetches it again"""
+        self.config = None
+        self.hash = None
+        self.process_start_time = None
@@ -33,6 +33,12 @@ class ASFNetworkError(ASFIPCError):
     default_message = "Network error while communicating with ASF IPC"
 
 
+class ASFTimeoutError(ASFNetworkError):
+    """Exception raised when a request exceeds its timeout or deadline."""
+
+    default_message = "Request to ASF IPC timed out"
+
+
 class ASF_BadRequest(ASFHTTPError):
     default_message = "Bad request"
 
@@ -83,6 +89,7 @@ __all__ = [
     "ASFHTTPError",
     "ASFIPCError",
     "ASFNetworkError",
+    "ASFTimeoutError",
     "ASF_BadRequest",
     "ASF_Forbidden",
     "ASF_LengthRequired",
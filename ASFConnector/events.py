@@ -0,0 +1,256 @@
+"""
+In-process bot lifecycle event bus.
+
+``EventBus`` turns the field-level deltas of one shared ``BotWatcher`` (or
+``ShardedPoller``) into typed ``BotEvent``s such as a bot going offline or
+finishing farming, and delivers them to async subscribers filtered by bot and
+event type. Components react to the same events instead of each running its
+own ``get_info`` poll loop. Lines of the ASF log can be fed in as a second,
+lower latency source.
+"""
+
+import asyncio
+from collections.abc import AsyncIterable, Iterable
+from dataclasses import dataclass, field
+from enum import Enum
+import re
+import time
+
+from loguru import logger
+
+from .watcher import BaseSubscription, BotDelta
+
+
+class BotEventType(str, Enum):
+    """Bot lifecycle event types"""
+
+    ADDED = "added"
+    REMOVED = "removed"
+    ONLINE = "online"
+    OFFLINE = "offline"
+    ENABLED = "enabled"
+    DISABLED = "disabled"
+    PAUSED = "paused"
+    RESUMED = "resumed"
+    FARMING_STARTED = "farming_started"
+    FARMING_FINISHED = "farming_finished"
+    CARDS_DROPPED = "cards_dropped"
+
+
+@dataclass(frozen=True, slots=True)
+class BotEvent:
+    """A lifecycle event of one bot"""
+
+    bot: str
+    type: BotEventType
+    # "poll" for events derived from watcher deltas, "log" for events parsed from log lines
+    source: str = "poll"
+    # Field changes for poll events ({"online": (True, False)}), {"line": ...} for log events
+    detail: dict = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+# Boolean field -> (event when it becomes True, event when it becomes False)
+_FLAG_EVENTS = {
+    "online": (BotEventType.ONLINE, BotEventType.OFFLINE),
+    "enabled": (BotEventType.ENABLED, BotEventType.DISABLED),
+    "paused": (BotEventType.PAUSED, BotEventType.RESUMED),
+}
+
+# ASF log messages (message part after "Method() ") -> event type
+LOG_PATTERNS = {
+    re.compile(r"Successfully logged on!"): BotEventType.ONLINE,
+    re.compile(r"Disconnected from Steam!"): BotEventType.OFFLINE,
+    re.compile(r"Now farming: "): BotEventType.FARMING_STARTED,
+    re.compile(r"Farming finished!"): BotEventType.FARMING_FINISHED,
+}
+
+
+def events_from_delta(delta: BotDelta) -> list[BotEvent]:
+    """
+    Translate a watcher delta into lifecycle events.
+
+    Args:
+        delta: Field-level change of one bot
+
+    Returns:
+        list[BotEvent]: Events in SNAPSHOT_FIELDS order; empty when no tracked transition happened
+    """
+    if delta.kind == "added":
+        return [BotEvent(delta.bot, BotEventType.ADDED, detail=delta.changes)]
+    if delta.kind == "removed":
+        return [BotEvent(delta.bot, BotEventType.REMOVED, detail=delta.changes)]
+    events = []
+    for name, (before, after) in delta.changes.items():
+        change = {name: (before, after)}
+        if name in _FLAG_EVENTS:
+            on, off = _FLAG_EVENTS[name]
+            events.append(BotEvent(delta.bot, on if after else off, detail=change))
+        elif name == "farming" and bool(before) != bool(after):
+            event_type = BotEventType.FARMING_STARTED if after else BotEventType.FARMING_FINISHED
+            events.append(BotEvent(delta.bot, event_type, detail=change))
+        elif name == "cards_remaining" and before is not None and after is not None and after < before:
+            events.append(BotEvent(delta.bot, BotEventType.CARDS_DROPPED, detail=change))
+    return events
+
+
+def event_from_log_line(line: str, patterns: dict | None = None) -> BotEvent | None:
+    """
+    Parse an ASF log line ("date|process|LEVEL|bot|Method() message") into an event.
+
+    Args:
+        line: Log line
+        patterns: Message pattern -> event type, defaults to LOG_PATTERNS
+
+    Returns:
+        BotEvent | None: The event, or None when the line is not a known bot lifecycle message
+    """
+    parts = line.rstrip("\r\n").split("|", 4)
+    if len(parts) < 5:
+        return None
+    bot, message = parts[3], parts[4]
+    for pattern, event_type in (patterns or LOG_PATTERNS).items():
+        if pattern.search(message):
+            return BotEvent(bot, event_type, source="log", detail={"line": line.rstrip("\r\n")})
+    return None
+
+
+class EventSubscription(BaseSubscription):
+    """Async iterator over the events delivered to one subscriber"""
+
+    def __init__(self, bus, bots: Iterable[str] | None, types: Iterable[BotEventType | str] | None, maxsize: int):
+        super().__init__(bus, maxsize)
+        self.bots = frozenset(bots) if bots is not None else None
+        self.types = frozenset(BotEventType(event_type) for event_type in types) if types is not None else None
+
+    def _offer(self, event: BotEvent):
+        if self.bots is not None and event.bot not in self.bots:
+            return
+        if self.types is not None and event.type not in self.types:
+            return
+        self._put(event)
+
+    async def __anext__(self) -> BotEvent:
+        return await super().__anext__()
+
+
+class EventBus:
+    """
+    Publishes typed bot lifecycle events from one shared source.
+
+    The source (a BotWatcher or ShardedPoller) is started with the bus when it
+    is not running yet, and stopped with it in that case.
+
+    Usage:
+        async with connector:
+            async for event in connector.events.subscribe(types={BotEventType.OFFLINE}):
+                print(event.bot, "went offline")
+    """
+
+    def __init__(self, source=None, log_patterns: dict | None = None):
+        """
+        Initialize the bus
+
+        Args:
+            source: BotWatcher, ShardedPoller or any object with start(), stop(), running and subscribe();
+                None for a bus fed only by publish() and feed_log()
+            log_patterns: Message pattern -> event type for feed_log(), defaults to LOG_PATTERNS
+        """
+        self.source = source
+        self.log_patterns = log_patterns or LOG_PATTERNS
+        self.published = 0
+        self._subscriptions: set[EventSubscription] = set()
+        self._owns_source = False
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(
+        self,
+        bots: Iterable[str] | None = None,
+        types: Iterable[BotEventType | str] | None = None,
+        maxsize: int = 0,
+    ) -> EventSubscription:
+        """
+        Subscribe to events; starts the bus if needed.
+
+        Args:
+            bots: Only deliver events of these bots (None for all)
+            types: Only deliver these event types (None for all)
+            maxsize: Queue bound; events are dropped and counted in ``dropped`` when full (0 for unbounded)
+
+        Returns:
+            EventSubscription: Async iterator of BotEvent
+        """
+        subscription = EventSubscription(self, bots, types, maxsize)
+        self._subscriptions.add(subscription)
+        self.start()
+        return subscription
+
+    def publish(self, event: BotEvent):
+        """Deliver an event to every matching subscriber"""
+        self.published += 1
+        for subscription in tuple(self._subscriptions):
+            subscription._offer(event)
+
+    async def feed_log(self, lines: AsyncIterable[str] | Iterable[str]):
+        """
+        Publish the lifecycle events found in ASF log lines, e.g. from the /Api/NLog WebSocket.
+
+        Args:
+            lines: Log lines as an async or plain iterable
+        """
+        if isinstance(lines, AsyncIterable):
+            async for line in lines:
+                self._publish_line(line)
+        else:
+            for line in lines:
+                self._publish_line(line)
+
+    def _publish_line(self, line: str):
+        event = event_from_log_line(line, self.log_patterns)
+        if event is not None:
+            self.publish(event)
+
+    def start(self):
+        """Subscribe to the source and start publishing in the running event loop"""
+        if self.running or self.source is None:
+            return
+        if not self.source.running:
+            self.source.start()
+            self._owns_source = True
+        self._task = asyncio.create_task(self._run(self.source.subscribe()))
+        logger.debug("EventBus started")
+
+    async def stop(self):
+        """Stop publishing, end all subscriptions and stop the source if the bus started it"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._owns_source:
+            await self.source.stop()
+            self._owns_source = False
+        for subscription in tuple(self._subscriptions):
+            subscription.close()
+        logger.debug("EventBus stopped")
+
+    async def _run(self, deltas):
+        try:
+            async for delta in deltas:
+                for event in events_from_delta(delta):
+                    self.publish(event)
+        finally:
+            deltas.close()
@@ -0,0 +1,153 @@
+"""
+Bounded-concurrency fan-out of per-bot operations.
+
+``FanOut`` runs one operation per bot with a connector-wide concurrency cap.
+Operations on the same bot run one at a time in submission order, even across
+separate ``map`` calls, while different bots proceed in parallel. Results are
+yielded as they complete.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+from loguru import logger
+
+
+@dataclass(frozen=True, slots=True)
+class BotResult:
+    """
+    Outcome of an operation on a single bot.
+
+    Attributes:
+        bot: Bot name
+        index: Position of the bot in the submitted list
+        value: Return value of the operation (None on error)
+        error: Exception raised by the operation, if any
+    """
+
+    bot: str
+    index: int
+    value: object = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self):
+        """Return the value, or raise the operation's exception"""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class FanOut:
+    """
+    Runs per-bot operations in parallel under a global cap, serialized per bot.
+
+    Usage:
+        async for result in connector.map(["bot1", "bot2"], "pause"):
+            print(result.bot, result.ok, result.value)
+    """
+
+    def __init__(self, bot_controller, concurrency: int = 8):
+        """
+        Initialize the fan-out helper
+
+        Args:
+            bot_controller: BotController whose methods can be named as operations
+            concurrency: Maximum number of operations running at once across all map() calls
+        """
+        if concurrency < 1:
+            raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+        self.bot_controller = bot_controller
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # Bot name -> [lock, number of holders and waiters]; asyncio.Lock wakes waiters in FIFO order
+        self._bot_locks: dict[str, list] = {}
+
+    def _resolve(self, op: str | Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        if callable(op):
+            return op
+        method = getattr(self.bot_controller, op, None)
+        if op.startswith("_") or not callable(method):
+            raise ValueError(f"{type(self.bot_controller).__name__} has no operation {op!r}")
+        return method
+
+    async def _run_one(self, bot: str, call: Callable[[], Awaitable], limit: asyncio.Semaphore | None):
+        entry = self._bot_locks.get(bot)
+        if entry is None:
+            entry = self._bot_locks[bot] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            # Take the bot lock first so blocked bots do not occupy global slots
+            async with entry[0]:
+                if limit is None:
+                    async with self._semaphore:
+                        return await call()
+                async with limit, self._semaphore:
+                    return await call()
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._bot_locks[bot]
+
+    async def map(
+        self,
+        bots: str | Iterable[str],
+        op: str | Callable[..., Awaitable],
+        *args,
+        concurrency: int | None = None,
+        **kwargs,
+    ) -> AsyncIterator[BotResult]:
+        """
+        Run ``op`` for every bot and yield results as they complete.
+
+        Args:
+            bots: Bot names as an iterable or comma separated string; a bot may appear more than once
+            op: BotController method name (e.g. "pause") or coroutine function taking the bot name first
+            *args: Extra positional arguments passed after the bot name
+            concurrency: Optional cap for this call, on top of the global cap
+            **kwargs: Extra keyword arguments passed to the operation
+
+        Yields:
+            BotResult: One result per submitted bot, in completion order
+
+        Exiting the iteration early cancels operations that have not finished.
+        """
+        function = self._resolve(op)
+        names = [name.strip() for name in bots.split(",")] if isinstance(bots, str) else list(bots)
+        limit = asyncio.Semaphore(concurrency) if concurrency is not None else None
+        done: asyncio.Queue[BotResult] = asyncio.Queue()
+
+        async def run(index: int, bot: str):
+            try:
+                value = await self._run_one(bot, lambda: function(bot, *args, **kwargs), limit)
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.debug(f"Fan-out operation on bot {bot} failed: {ex}")
+                done.put_nowait(BotResult(bot, index, error=ex))
+            else:
+                done.put_nowait(BotResult(bot, index, value))
+
+        # Tasks start in creation order, so each bot's lock is requested in submission order
+        tasks = [asyncio.create_task(run(index, bot)) for index, bot in enumerate(names)]
+        try:
+            for _ in range(len(tasks)):
+                yield await done.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def gather(self, bots: str | Iterable[str], op: str | Callable[..., Awaitable], *args, **kwargs):
+        """
+        Like map(), but wait for all bots and return the results in submission order.
+
+        Returns:
+            list[BotResult]: One result per submitted bot
+        """
+        results = [result async for result in self.map(bots, op, *args, **kwargs)]
+        return sorted(results, key=lambda result: result.index)
@@ -0,0 +1,132 @@
+"""
+Health check helpers for ASFConnector.
+
+Provides a process-wide cache of recent health check results, so short-lived
+connectors can skip the /HealthCheck round trip, and a background monitor that
+periodically checks ASF through the shared connection pool to keep it warm.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import time
+
+from loguru import logger
+
+HEALTH_CHECK_MODES = ("blocking", "skip", "background", "cached")
+
+
+class HealthCheckCache:
+    """Cache of successful health check results keyed by ASF endpoint"""
+
+    def __init__(self):
+        self._entries: dict[tuple, tuple[float, dict]] = {}
+
+    def get(self, key: tuple, ttl: float) -> dict | None:
+        """
+        Get a cached result if it is younger than ``ttl`` seconds
+
+        Args:
+            key: Endpoint key, e.g. (host, port)
+            ttl: Maximum age in seconds
+
+        Returns:
+            dict | None: Cached health check response, or None if missing or stale
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        checked_at, result = entry
+        if time.monotonic() - checked_at > ttl:
+            return None
+        return result
+
+    def set(self, key: tuple, result: dict):
+        """Store a successful health check result"""
+        self._entries[key] = (time.monotonic(), result)
+
+    def invalidate(self, key: tuple | None = None):
+        """Drop the entry for ``key``, or every entry if no key is given"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+health_cache = HealthCheckCache()
+
+
+class HealthMonitor:
+    """
+    Periodically runs a health check in the background.
+
+    Each check goes through the pooled client, which keeps idle keep-alive
+    connections from expiring between bursts of requests.
+    """
+
+    def __init__(
+        self,
+        check: Callable[[], Awaitable[dict]],
+        interval: float = 30.0,
+        on_result: Callable[[dict | None, Exception | None], None] | None = None,
+    ):
+        """
+        Initialize the monitor
+
+        Args:
+            check: Coroutine function performing the health check
+            interval: Seconds between checks
+            on_result: Optional callback receiving (result, error) after every check
+        """
+        if interval <= 0:
+            raise ValueError(f"Health monitor interval must be positive, got {interval}")
+        self.check = check
+        self.interval = interval
+        self.on_result = on_result
+        self.last_result: dict | None = None
+        self.last_error: Exception | None = None
+        self.consecutive_failures = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the monitor loop in the running event loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+            logger.debug(f"Health monitor started with interval {self.interval}s")
+
+    async def stop(self):
+        """Stop the monitor loop and wait for it to finish"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.debug("Health monitor stopped")
+
+    async def run_once(self):
+        """Run a single health check and record the outcome"""
+        try:
+            result = await self.check()
+        except Exception as ex:
+            self.last_error = ex
+            self.consecutive_failures += 1
+            logger.warning(f"Background health check failed ({self.consecutive_failures} in a row): {ex}")
+            if self.on_result:
+                self.on_result(None, ex)
+            return
+        self.last_result = result
+        self.last_error = None
+        self.consecutive_failures = 0
+        if self.on_result:
+            self.on_result(result, None)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
@@ -0,0 +1,291 @@
+"""
+Columnar aggregation of fleet inventories.
+
+Inventory items from ``BotController.get_inventory`` or ``iter_inventory`` are
+loaded into flat integer columns (NumPy arrays when NumPy is installed, the
+``array`` module otherwise) with bot names and item types interned in string
+tables, so group-by and count queries over millions of items run in bulk
+instead of walking nested dicts.
+"""
+
+from array import array
+from collections import defaultdict
+from collections.abc import AsyncIterable, Callable, Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+COLUMNS = ("bot", "appid", "contextid", "classid", "type", "amount")
+_STRING_COLUMNS = ("bot", "type")
+
+
+class StringTable:
+    """Interns strings to dense integer ids"""
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def intern(self, value: str) -> int:
+        """Get the id of ``value``, adding it if unseen"""
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def get(self, value: str) -> int | None:
+        """Get the id of ``value`` without adding it"""
+        return self._ids.get(value)
+
+
+class InventoryFrame:
+    """
+    Column store of inventory assets across bots.
+
+    Usage:
+        frame = await InventoryFrame.from_stream(connector.bot.iter_inventory("ASF"))
+        cards = frame.total(appid=753, type=lambda t: "Trading Card" in t)
+        per_bot = frame.sum_by("bot", appid=753)
+        per_app_type = frame.count_by("appid", "type")
+    """
+
+    def __init__(self):
+        self.bots = StringTable()
+        self.types = StringTable()
+        self._unknown_type = self.types.intern("")
+        self._columns = {name: array("q") for name in ("bot", "appid", "contextid", "classid", "class", "amount")}
+        # (appid, classid) -> class index, and class index -> type id
+        self._classes: dict[tuple[int, int], int] = {}
+        self._class_types = array("q")
+        self._arrays: dict | None = None
+
+    def __len__(self) -> int:
+        return len(self._columns["bot"])
+
+    @property
+    def backend(self) -> str:
+        """Name of the array backend in use"""
+        return "numpy" if np is not None else "array"
+
+    def _class_index(self, app_id: int, class_id: int) -> int:
+        key = (app_id, class_id)
+        index = self._classes.get(key)
+        if index is None:
+            index = self._classes[key] = len(self._class_types)
+            self._class_types.append(self._unknown_type)
+        return index
+
+    def add_asset(self, bot_name: str, asset: dict):
+        """
+        Append a single asset.
+
+        Args:
+            bot_name: Owning bot
+            asset: Asset dict with appid, contextid, classid and amount
+        """
+        app_id = int(asset.get("appid", 0))
+        class_id = int(asset.get("classid", 0))
+        columns = self._columns
+        columns["bot"].append(self.bots.intern(bot_name))
+        columns["appid"].append(app_id)
+        columns["contextid"].append(int(asset.get("contextid", 0)))
+        columns["classid"].append(class_id)
+        columns["class"].append(self._class_index(app_id, class_id))
+        columns["amount"].append(int(asset.get("amount", 1)))
+        self._arrays = None
+
+    def add_description(self, description: dict):
+        """
+        Register the type of an item class from a description dict.
+
+        Args:
+            description: Description dict with appid, classid and type
+        """
+        index = self._class_index(int(description.get("appid", 0)), int(description.get("classid", 0)))
+        self._class_types[index] = self.types.intern(description.get("type") or "")
+        self._arrays = None
+
+    def add_bot_inventory(self, bot_name: str, inventory: dict):
+        """Append the Assets and Descriptions of one bot's inventory"""
+        for description in inventory.get("Descriptions") or ():
+            self.add_description(description)
+        for asset in inventory.get("Assets") or ():
+            self.add_asset(bot_name, asset)
+
+    @classmethod
+    def from_inventory(cls, response: dict) -> "InventoryFrame":
+        """
+        Build a frame from a get_inventory() response.
+
+        Args:
+            response: Response of BotController.get_inventory (or its "Result")
+
+        Returns:
+            InventoryFrame: Loaded frame
+        """
+        frame = cls()
+        result = response.get("Result", response) if "Success" in response else response
+        for bot_name, inventory in (result or {}).items():
+            if inventory:
+                frame.add_bot_inventory(bot_name, inventory)
+        return frame
+
+    @classmethod
+    async def from_stream(cls, items: AsyncIterable[tuple]) -> "InventoryFrame":
+        """
+        Build a frame from the (bot_name, section, item) tuples of iter_inventory().
+
+        Args:
+            items: Async iterable from BotController.iter_inventory
+
+        Returns:
+            InventoryFrame: Loaded frame
+        """
+        frame = cls()
+        async for bot_name, section, item in items:
+            if section == "Assets":
+                frame.add_asset(bot_name, item)
+            elif section == "Descriptions":
+                frame.add_description(item)
+        return frame
+
+    def column(self, name: str):
+        """
+        Get a column as an integer array (ids for "bot" and "type").
+
+        Args:
+            name: One of COLUMNS
+
+        Returns:
+            numpy.ndarray or array.array: Column values
+        """
+        if name not in COLUMNS:
+            raise ValueError(f"Unknown column {name!r}, expected one of {COLUMNS}")
+        if np is None:
+            if name == "type":
+                class_types = self._class_types
+                return array("q", (class_types[index] for index in self._columns["class"]))
+            return self._columns[name]
+        if self._arrays is None:
+            self._arrays = {key: np.array(values, dtype=np.int64) for key, values in self._columns.items()}
+            self._arrays["type"] = np.array(self._class_types, dtype=np.int64)[self._arrays["class"]]
+        return self._arrays[name]
+
+    def _decode(self, name: str, value: int):
+        if name == "bot":
+            return self.bots.values[value]
+        if name == "type":
+            return self.types.values[value]
+        return value
+
+    def _allowed_ids(self, name: str, condition) -> set[int]:
+        table = self.bots if name == "bot" else self.types
+        if callable(condition):
+            return {index for index, value in enumerate(table.values) if condition(value)}
+        values = [condition] if isinstance(condition, str) else condition
+        return {index for index in (table.get(value) for value in values) if index is not None}
+
+    def _mask(self, filters: dict):
+        """Build a row mask (NumPy bool array, or list of bools without NumPy) from column filters"""
+        conditions = []
+        for name, condition in filters.items():
+            if name not in COLUMNS:
+                raise ValueError(f"Unknown column {name!r}, expected one of {COLUMNS}")
+            if name in _STRING_COLUMNS:
+                allowed = self._allowed_ids(name, condition)
+            elif callable(condition):
+                conditions.append((name, condition))
+                continue
+            elif isinstance(condition, Iterable):
+                allowed = set(condition)
+            else:
+                allowed = {condition}
+            conditions.append((name, allowed))
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            for name, allowed in conditions:
+                column = self.column(name)
+                if callable(allowed):
+                    mask &= np.fromiter((bool(allowed(value)) for value in column), dtype=bool, count=len(column))
+                else:
+                    mask &= np.isin(column, np.fromiter(allowed, dtype=np.int64, count=len(allowed)))
+            return mask
+        mask = [True] * len(self)
+        for name, allowed in conditions:
+            test = allowed if callable(allowed) else allowed.__contains__
+            mask = [keep and test(value) for keep, value in zip(mask, self.column(name))]
+        return mask
+
+    def _group(self, columns: tuple[str, ...], weighted: bool, filters: dict) -> dict:
+        for name in columns:
+            if name not in COLUMNS:
+                raise ValueError(f"Unknown column {name!r}, expected one of {COLUMNS}")
+        if not columns:
+            raise ValueError("At least one column is required")
+        mask = self._mask(filters)
+        if np is not None:
+            keys = np.stack([self.column(name)[mask] for name in columns], axis=1)
+            weights = self.column("amount")[mask] if weighted else None
+            if len(keys) == 0:
+                return {}
+            unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+            totals = np.bincount(inverse.reshape(-1), weights=weights, minlength=len(unique))
+            rows = ((tuple(int(value) for value in key), int(total)) for key, total in zip(unique, totals))
+        else:
+            selected = [self.column(name) for name in columns]
+            amounts = self.column("amount")
+            counter = defaultdict(int)
+            for index, keep in enumerate(mask):
+                if keep:
+                    counter[tuple(column[index] for column in selected)] += amounts[index] if weighted else 1
+            rows = counter.items()
+        result = {}
+        for key, total in rows:
+            decoded = tuple(self._decode(name, value) for name, value in zip(columns, key))
+            result[decoded[0] if len(decoded) == 1 else decoded] = total
+        return result
+
+    def sum_by(self, *columns: str, **filters) -> dict:
+        """
+        Sum item amounts grouped by columns.
+
+        Args:
+            *columns: Group-by columns out of COLUMNS
+            **filters: Column filters; a value, a collection of values or a predicate
+
+        Returns:
+            dict: Group key (scalar for one column, tuple otherwise) -> total amount
+        """
+        return self._group(columns, True, filters)
+
+    def count_by(self, *columns: str, **filters) -> dict:
+        """
+        Count asset rows grouped by columns.
+
+        Args:
+            *columns: Group-by columns out of COLUMNS
+            **filters: Column filters; a value, a collection of values or a predicate
+
+        Returns:
+            dict: Group key (scalar for one column, tuple otherwise) -> number of assets
+        """
+        return self._group(columns, False, filters)
+
+    def total(self, **filters: object | Callable) -> int:
+        """
+        Total item amount matching the filters.
+
+        Example:
+            frame.total(appid=753, contextid=6, type=lambda t: "Trading Card" in t)
+        """
+        mask = self._mask(filters)
+        amounts = self.column("amount")
+        if np is not None:
+            return int(amounts[mask].sum())
+        return sum(amount for amount, keep in zip(amounts, mask) if keep)
@@ -0,0 +1,309 @@
+"""
+Streaming bulk import of keys into ASF's background game redeemer.
+
+``read_keys`` parses CSV, TSV or ASF-format key files line by line and
+``import_keys`` posts the keys in fixed-size chunks to
+``/Bot/{bot}/GamesToRedeemInBackground``, spreading chunks round-robin across
+bots. Duplicates are dropped exactly while the distinct keys fit a bounded set;
+beyond that a Bloom filter of fixed size catches repeats, and keys it drops
+are counted separately and returned in the stats because they may be new. Chunks go through a
+bounded queue so the reader never runs ahead of the uploads; memory use does
+not depend on the size of the file.
+"""
+
+import asyncio
+from collections.abc import Callable, Iterable, Iterator
+import csv
+from dataclasses import dataclass, field
+import hashlib
+import math
+import os
+from pathlib import Path
+import re
+
+from loguru import logger
+
+KEY_PATTERN = re.compile(r"^[0-9A-Z]{4,5}(-[0-9A-Z]{4,5}){2,4}$")
+
+KEY_FILE_FORMATS = ("asf", "csv", "tsv")
+
+_DELIMITERS = {"csv": ",", "tsv": "\t"}
+
+
+def normalize_key(value: str) -> str | None:
+    """
+    Normalize a key to ASF's upper-case form.
+
+    Returns:
+        str | None: The key, or None if the value is not a valid key
+    """
+    key = value.strip().upper()
+    return key if KEY_PATTERN.match(key) else None
+
+
+class BloomFilter:
+    """
+    Fixed-size set membership with a bounded false positive rate.
+
+    A false positive makes a new key look like a duplicate, so ``error_rate`` is
+    the chance of dropping a key that was never seen, once ``capacity`` keys
+    have been added.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-4):
+        """
+        Initialize the filter
+
+        Args:
+            capacity: Expected number of distinct items
+            error_rate: False positive rate at capacity, in (0, 1)
+        """
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, got {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"Error rate must be in (0, 1), got {error_rate}")
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """
+        Add an item.
+
+        Returns:
+            bool: True if the item was not (probably) present before
+        """
+        bits = self._bits
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        return added
+
+
+def _detect_format(source) -> str:
+    suffix = Path(source).suffix.lower().lstrip(".") if isinstance(source, (str, os.PathLike)) else ""
+    return suffix if suffix in _DELIMITERS else "asf"
+
+
+def _parse_asf(lines: Iterable[str]) -> Iterator[tuple[str | None, str]]:
+    # ASF's background redeemer format: "name<TAB>key", or a bare key
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        name, separator, key = line.rpartition("\t")
+        yield normalize_key(key), (name.strip() if separator else "")
+
+
+def _parse_delimited(lines: Iterable[str], delimiter: str) -> Iterator[tuple[str | None, str]]:
+    # The first field that is a valid key is the key, the first other non-empty field its name
+    for row in csv.reader(lines, delimiter=delimiter):
+        if not any(value.strip() for value in row):
+            continue
+        key = None
+        name = ""
+        for value in row:
+            if key is None:
+                key = normalize_key(value)
+                if key is not None:
+                    continue
+            if not name and value.strip():
+                name = value.strip()
+        yield key, name
+
+
+def read_keys(source: str | os.PathLike | Iterable[str], fmt: str | None = None) -> Iterator[tuple[str | None, str]]:
+    """
+    Parse a key file lazily.
+
+    Args:
+        source: File path, or an iterable of lines such as an open text file
+        fmt: "asf", "csv" or "tsv"; detected from the file suffix if None ("asf" otherwise)
+
+    Yields:
+        tuple: (normalized key or None for an invalid row, game name or "")
+    """
+    fmt = fmt or _detect_format(source)
+    if fmt not in KEY_FILE_FORMATS:
+        raise ValueError(f"Unknown key file format {fmt!r}, expected one of {KEY_FILE_FORMATS}")
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8-sig", newline="") as file:
+            yield from read_keys(file, fmt)
+        return
+    if fmt == "asf":
+        yield from _parse_asf(source)
+    else:
+        yield from _parse_delimited(source, _DELIMITERS[fmt])
+
+
+@dataclass(slots=True)
+class ImportStats:
+    """
+    Progress of a key import.
+
+    Attributes:
+        rows: Rows read from the source
+        invalid: Rows without a valid key
+        duplicates: Keys dropped as certainly seen before in this import
+        probable_duplicates: Keys dropped by the Bloom filter past exact_keys, as a false positive may
+            have dropped a key never seen
+        probable_duplicate_keys: Those keys, so they can be checked and re-imported; logs only show their tail
+        settled: Keys dropped because the key ledger has settled them
+        submitted: Keys accepted by ASF
+        rejected: Keys in chunks ASF answered with Success false
+        chunks: Requests sent
+        per_bot: Bot name -> keys accepted
+    """
+
+    rows: int = 0
+    invalid: int = 0
+    duplicates: int = 0
+    probable_duplicates: int = 0
+    probable_duplicate_keys: list[str] = field(default_factory=list)
+    settled: int = 0
+    submitted: int = 0
+    rejected: int = 0
+    chunks: int = 0
+    per_bot: dict[str, int] = field(default_factory=dict)
+
+
+async def import_keys(
+    bot_controller,
+    source: str | os.PathLike | Iterable[str],
+    bots: str | Iterable[str],
+    chunk_size: int = 500,
+    concurrency: int = 4,
+    fmt: str | None = None,
+    progress: Callable[[ImportStats], object] | None = None,
+    ledger=None,
+    exact_keys: int = 200_000,
+    capacity: int = 1_000_000,
+    error_rate: float = 1e-4,
+) -> ImportStats:
+    """
+    Stream keys from a file into GamesToRedeemInBackground.
+
+    Errors raised by a request stop the import and propagate; the progress
+    callback has seen every chunk completed before that.
+
+    Args:
+        bot_controller: BotController used to post the chunks
+        source: File path, or an iterable of lines
+        bots: Bot name(s) receiving chunks in turn
+        chunk_size: Keys per request
+        concurrency: Requests in flight; the reader waits while this many chunks are queued
+        fmt: Key file format, see read_keys()
+        progress: Called with the running ImportStats after every chunk
+        ledger: Optional KeyLedger; keys it has settled are skipped
+        exact_keys: Distinct keys deduplicated exactly; later keys go through the Bloom filter
+        capacity: Expected number of distinct keys past exact_keys, sizes the Bloom filter
+        error_rate: Chance of dropping a new key as a probable duplicate at capacity
+
+    Returns:
+        ImportStats: Final counts
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be at least 1, got {chunk_size}")
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, got {concurrency}")
+    bots = [bots] if isinstance(bots, str) else list(bots)
+    if not bots:
+        raise ValueError("At least one bot is required")
+    stats = ImportStats(per_bot=dict.fromkeys(bots, 0))
+    seen: set[str] = set()
+    # Created once the exact set is full
+    overflow: BloomFilter | None = None
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+    async def send(bot: str, games: dict[str, str]):
+        response = await bot_controller.add_games_to_redeem_in_background(bot, {"GamesToRedeemInBackground": games})
+        stats.chunks += 1
+        if response.get("Success"):
+            stats.submitted += len(games)
+            stats.per_bot[bot] += len(games)
+        else:
+            stats.rejected += len(games)
+            logger.warning(f"Background redeemer of {bot} rejected {len(games)} key(s): {response.get('Message')}")
+        if progress is not None:
+            progress(stats)
+
+    errors: list[Exception] = []
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                # After a failure, drain the queue so the reader never blocks on it
+                if not errors:
+                    await send(*item)
+            except Exception as ex:
+                errors.append(ex)
+            finally:
+                queue.task_done()
+
+    async def flush(chunk: dict[str, str], index: int):
+        if ledger is not None:
+            pending = ledger.pending(chunk)
+            stats.settled += len(chunk) - len(pending)
+            chunk = {key: chunk[key] for key in pending}
+        if chunk:
+            await queue.put((bots[index % len(bots)], chunk))
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        chunk: dict[str, str] = {}
+        index = 0
+        for key, name in read_keys(source, fmt):
+            stats.rows += 1
+            if key is None:
+                stats.invalid += 1
+                continue
+            if key in seen:
+                stats.duplicates += 1
+                continue
+            if len(seen) < exact_keys:
+                seen.add(key)
+            else:
+                if overflow is None:
+                    overflow = BloomFilter(capacity, error_rate)
+                if not overflow.add(key):
+                    stats.probable_duplicates += 1
+                    stats.probable_duplicate_keys.append(key)
+                    # Keys are redeemable, only their tail goes to the logs
+                    logger.warning(f"Dropped probable duplicate key ...{key[-5:]}; it is listed in the import stats")
+                    continue
+            chunk[key] = name or key
+            if len(chunk) >= chunk_size:
+                await flush(chunk, index)
+                chunk = {}
+                index += 1
+                if errors:
+                    break
+        if chunk and not errors:
+            await flush(chunk, index)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    if errors:
+        raise errors[0]
+    logger.debug(f"Imported {stats.submitted} key(s) from {stats.rows} row(s) in {stats.chunks} request(s)")
+    return stats
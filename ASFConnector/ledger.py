@@ -0,0 +1,213 @@
+"""
+Local SQLite ledger of key redemption outcomes.
+
+``KeyLedger`` records the last outcome of every key sent to
+``BotController.redeem``. Before redeeming, ``pending()`` drops keys that were
+already redeemed or failed permanently, using the primary key index in chunks,
+so overlapping key lists are only sent for keys never tried or whose last
+outcome is worth retrying (timeouts, rate limits).
+"""
+
+from collections.abc import Iterable, Iterator
+import sqlite3
+import time
+
+from loguru import logger
+
+from .Controllers.enum import PurchaseResultDetail, Result
+from .key_import import normalize_key
+from .reports import RedeemReport
+
+_DETAIL_CODES = {name: code for code, name in PurchaseResultDetail.items()}
+_RESULT_CODES = {name: code for code, name in Result.items()}
+
+RESULT_OK = _RESULT_CODES["OK"]
+
+# Details after which the same key can succeed on a later attempt
+RETRYABLE_DETAILS = frozenset(
+    _DETAIL_CODES[name] for name in ("Timeout", "OthersInProgress", "OtherAbortableInProgress", "RateLimited")
+)
+
+# SQLite's default limit of host parameters per statement is 999 on older builds
+_LOOKUP_CHUNK = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS redeemed_keys (
+    key TEXT PRIMARY KEY,
+    bot TEXT NOT NULL,
+    result INTEGER NOT NULL,
+    detail INTEGER NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+# A recorded outcome is replaced only while it is retryable, or by an OK for a key that failed for good,
+# so another bot's RateLimited in the same multi-bot redeem never reopens a key redeemed as OK
+_UPSERT = """
+INSERT INTO redeemed_keys (key, bot, result, detail, attempts, updated_at) VALUES (?, ?, ?, ?, 1, ?)
+ON CONFLICT(key) DO UPDATE SET
+    bot = CASE WHEN {replace} THEN excluded.bot ELSE bot END,
+    result = CASE WHEN {replace} THEN excluded.result ELSE result END,
+    detail = CASE WHEN {replace} THEN excluded.detail ELSE detail END,
+    attempts = attempts + 1,
+    updated_at = excluded.updated_at
+"""
+
+
+def _code(value, table: dict) -> int:
+    if isinstance(value, str):
+        return table[value] if value in table else int(value)
+    return int(value)
+
+
+class KeyLedger:
+    """
+    Outcome of every redeemed key, keyed by the key itself.
+
+    Usage:
+        ledger = KeyLedger("keys.sqlite3")
+        response, skipped = await redeem_new(connector.bot, "bot1", keys, ledger)
+    """
+
+    def __init__(self, path: str = ":memory:", retryable: Iterable[int] = RETRYABLE_DETAILS):
+        """
+        Open or create the ledger
+
+        Args:
+            path: SQLite database file, ":memory:" for a ledger that lives as long as the object
+            retryable: PurchaseResultDetail codes whose keys are sent again
+        """
+        self.path = path
+        self.retryable = frozenset(retryable)
+        # SQL twin of is_retryable() on the stored row, with the (integer) codes inlined
+        stored_retryable = (
+            f"(detail IN ({','.join(str(int(code)) for code in sorted(self.retryable)) or 'NULL'})"
+            f" OR (result != {RESULT_OK} AND detail = 0))"
+        )
+        replace = f"({stored_retryable} OR (excluded.result = {RESULT_OK} AND result != {RESULT_OK}))"
+        self._upsert = _UPSERT.format(replace=replace)
+        self._db = sqlite3.connect(path)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM redeemed_keys").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the database connection"""
+        self._db.close()
+
+    def is_retryable(self, result: int, detail: int) -> bool:
+        """Whether a key with this outcome should be sent again"""
+        return detail in self.retryable or (result != RESULT_OK and detail == 0)
+
+    def _lookup(self, keys: list[str]) -> Iterator[tuple]:
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[start : start + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            yield from self._db.execute(
+                f"SELECT key, bot, result, detail, attempts FROM redeemed_keys WHERE key IN ({placeholders})",
+                chunk,
+            )
+
+    def outcome(self, key: str) -> dict | None:
+        """
+        Get the recorded outcome of a key.
+
+        Returns:
+            dict | None: bot, result and detail names and attempts, None if the key was never recorded
+        """
+        for _, bot, result, detail, attempts in self._lookup([key]):
+            return {
+                "bot": bot,
+                "result": Result.get(result, str(result)),
+                "detail": PurchaseResultDetail.get(detail, str(detail)),
+                "attempts": attempts,
+            }
+        return None
+
+    def pending(self, keys: Iterable[str]) -> list[str]:
+        """
+        Filter keys down to those never tried or with a retryable outcome.
+
+        Args:
+            keys: Keys to redeem; duplicates are dropped
+
+        Returns:
+            list[str]: Keys to send, in input order
+        """
+        keys = list(dict.fromkeys(keys))
+        done = {key for key, _, result, detail, _ in self._lookup(keys) if not self.is_retryable(result, detail)}
+        return [key for key in keys if key not in done] if done else keys
+
+    def record(self, bot: str, key: str, result: int | str, detail: int | str):
+        """Record the outcome of one key; names and codes are both accepted"""
+        self.record_many([(bot, key, result, detail)])
+
+    def record_many(self, outcomes: Iterable[tuple]):
+        """
+        Record outcomes in one transaction.
+
+        A settled outcome is never downgraded: it is only replaced by an OK when
+        the key had failed for good, and still counts the attempt otherwise.
+
+        Args:
+            outcomes: (bot, key, result, detail) tuples; names and codes are both accepted
+        """
+        now = time.time()
+        rows = [
+            (key, bot, _code(result, _RESULT_CODES), _code(detail, _DETAIL_CODES), now)
+            for bot, key, result, detail in outcomes
+        ]
+        with self._db:
+            self._db.executemany(self._upsert, rows)
+
+    def record_response(self, response: dict) -> int:
+        """
+        Record the outcomes of a BotController.redeem() response.
+
+        Keys without an outcome (bot offline) are not recorded.
+
+        Returns:
+            int: Number of recorded keys
+        """
+        entries = RedeemReport.from_response(response).entries
+        self.record_many((entry.bot, entry.key, entry.result, entry.detail) for entry in entries)
+        return len(entries)
+
+
+async def redeem_new(bot_controller, bot_names: str, keys, ledger: KeyLedger) -> tuple[dict | None, list[str]]:
+    """
+    Redeem only the keys the ledger has not settled yet, and record their outcomes.
+
+    Args:
+        bot_controller: BotController used to redeem
+        bot_names: Bot name(s)
+        keys: Single key string or iterable of keys; valid keys are normalized like import_keys() does
+        ledger: Ledger to filter against and record into
+
+    Returns:
+        tuple: (redeem response, or None if no key was sent; keys skipped by the ledger)
+    """
+    keys = [normalize_key(key) or key.strip() for key in ([keys] if isinstance(keys, str) else keys)]
+    pending = ledger.pending(keys)
+    pending_set = set(pending)
+    skipped = [key for key in dict.fromkeys(keys) if key not in pending_set]
+    if skipped:
+        logger.debug(f"Key ledger skipped {len(skipped)} of {len(keys)} key(s)")
+    if not pending:
+        return None, skipped
+    response = await bot_controller.redeem(bot_names, pending)
+    if response.get("Success"):
+        ledger.record_response(response)
+    return response, skipped
@@ -0,0 +1,153 @@
+"""
+Hot reload of ASFConfig from a .env file.
+
+``ConfigWatcher`` polls the modification time of an env file and, when it
+changes, loads a new ``ASFConfig`` from it and applies that to the attached
+connectors with ``ASFConnector.apply_config``. Requests in flight are not
+dropped and warm connection pools are kept unless the change requires a new
+pool. When the file is the one the shared ``asf_config`` reads, that object is
+refreshed too, so connectors created later see the new values. A file that
+fails validation is logged and ignored, so a half-written edit never takes a
+connector down. Environment variables still take precedence over the file,
+like for ``ASFConfig()``.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import os
+from pathlib import Path
+
+from loguru import logger
+from pydantic import ValidationError
+
+from .config import ASFConfig, update_shared_config
+
+
+class ConfigWatcher:
+    """
+    Reloads the configuration when its file changes and applies it to connectors.
+
+    Usage:
+        connector = ASFConnector.from_config(endpoint="eu")
+        async with connector, ConfigWatcher(".env", interval=2).attach(connector):
+            ...
+    """
+
+    def __init__(
+        self,
+        env_file: str | Path = ".env",
+        interval: float = 2.0,
+        config: ASFConfig | None = None,
+        shared: bool | None = None,
+    ):
+        """
+        Initialize the watcher
+
+        Args:
+            env_file: Env file to watch
+            interval: Seconds between modification time checks
+            config: Currently applied configuration, loaded from env_file if None
+            shared: Also update the shared asf_config on reload; if None, only when env_file is
+                the file it reads (.env in the working directory)
+        """
+        if interval <= 0:
+            raise ValueError(f"Interval must be positive, got {interval}")
+        self.env_file = Path(env_file)
+        self.interval = interval
+        self.config = config if config is not None else ASFConfig(_env_file=self.env_file)
+        if shared is None:
+            shared = self.env_file.resolve() == Path(ASFConfig.model_config["env_file"]).resolve()
+        self.shared = shared
+        self.reloads = 0
+        self.failures = 0
+        self._stamp = self._file_stamp()
+        self._connectors: list = []
+        self._callbacks: list[Callable[[ASFConfig], Awaitable | None]] = []
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def attach(self, connector) -> "ConfigWatcher":
+        """Apply reloaded configurations to a connector created from a config endpoint"""
+        self._connectors.append(connector)
+        return self
+
+    def on_reload(self, callback: Callable[[ASFConfig], Awaitable | None]) -> "ConfigWatcher":
+        """Call ``callback(config)`` (plain or coroutine function) after every successful reload"""
+        self._callbacks.append(callback)
+        return self
+
+    def _file_stamp(self) -> tuple | None:
+        try:
+            stat = os.stat(self.env_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    async def check(self) -> bool:
+        """
+        Reload and apply the configuration if the file changed since the last check.
+
+        Returns:
+            bool: Whether a new configuration was applied
+        """
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            config = ASFConfig(_env_file=self.env_file)
+        except ValidationError as ex:
+            self.failures += 1
+            logger.warning(f"Ignoring invalid configuration in {self.env_file}: {ex}")
+            return False
+        if config == self.config:
+            return False
+        self.config = config
+        self.reloads += 1
+        if self.shared:
+            update_shared_config(config)
+        for connector in self._connectors:
+            try:
+                await connector.apply_config(config)
+            except Exception as ex:
+                self.failures += 1
+                logger.warning(f"Applying reloaded configuration to {connector.host}:{connector.port} failed: {ex}")
+        for callback in self._callbacks:
+            result = callback(config)
+            if asyncio.iscoroutine(result):
+                await result
+        logger.info(f"Reloaded configuration from {self.env_file}")
+        return True
+
+    def start(self):
+        """Start checking in the running event loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop checking"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as ex:
+                logger.warning(f"Configuration reload failed: {ex}")
@@ -0,0 +1,200 @@
+"""
+Record and replay IPC traffic for deterministic performance tests.
+
+``RecordingTransport`` wraps the transport ``IPCProtocolHandler`` would use and
+writes every exchange (method, path, request body, response status, headers,
+raw body and duration) as one line of a gzip-compressed JSON lines file.
+``ReplayTransport`` serves such a capture back, answering each request with the
+next recorded response for the same method, path and body after its recorded
+duration divided by ``speed``. Only these service times are reproduced; when
+and how concurrently requests arrive is up to the replaying client. Both plug
+into ``ASFConnector(transport=...)``. Request headers are not recorded, so the
+IPC password never ends up in a capture.
+"""
+
+import asyncio
+import base64
+from collections import defaultdict, deque
+import gzip
+import json
+from pathlib import Path
+import time
+
+import httpx
+
+CAPTURE_VERSION = 1
+
+
+def _request_key(method: str, target: str, body: str | None) -> tuple:
+    return (method, target, body)
+
+
+def _target(url: httpx.URL) -> str:
+    return url.raw_path.decode("ascii")
+
+
+def _body_text(content: bytes) -> str | None:
+    return content.decode("utf-8", errors="replace") if content else None
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that forwards requests and records the exchanges.
+
+    The connection handler never closes injected transports, so close the recorder
+    yourself to flush the capture.
+
+    Usage:
+        async with RecordingTransport("capture.jsonl.gz") as recorder:
+            async with ASFConnector(host, port, transport=recorder) as connector:
+                await connector.get_bot_info("ASF")
+    """
+
+    def __init__(self, path: str | Path, transport: httpx.AsyncBaseTransport | None = None):
+        """
+        Initialize the recorder
+
+        Args:
+            path: Capture file to write (gzip-compressed JSON lines)
+            transport: Transport doing the actual requests, defaults to httpx.AsyncHTTPTransport();
+                pass httpx.AsyncHTTPTransport(uds=...) to record over a Unix domain socket
+        """
+        self.path = Path(path)
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.recorded = 0
+        self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        self._write({"version": CAPTURE_VERSION, "created": time.time()})
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        content = await request.aread()
+        start = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        try:
+            raw = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        duration = time.perf_counter() - start
+
+        record = {
+            "d": round(duration, 6),
+            "method": request.method,
+            "target": _target(request.url),
+            "body": _body_text(content),
+            "status": response.status_code,
+            "headers": [[name, value] for name, value in response.headers.multi_items()],
+        }
+        try:
+            text = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            text = None
+        # Compressed bodies are stored raw so replay reproduces the decoding work too; so are non-UTF-8 ones
+        if text is None or "content-encoding" in response.headers:
+            record["b64"] = base64.b64encode(raw).decode("ascii")
+        else:
+            record["text"] = text
+        self._write(record)
+        self.recorded += 1
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(raw),
+            extensions=response.extensions,
+            request=request,
+        )
+
+    def close(self):
+        """Flush and close the capture file"""
+        if not self._file.closed:
+            self._file.close()
+
+    async def aclose(self):
+        self.close()
+        await self.transport.aclose()
+
+
+def load_capture(path: str | Path) -> list[dict]:
+    """
+    Read the exchanges of a capture file.
+
+    Args:
+        path: File written by RecordingTransport
+
+    Returns:
+        list[dict]: Exchange records in recording order
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(file.readline())
+        if header.get("version") != CAPTURE_VERSION:
+            raise ValueError(f"Unsupported capture version {header.get('version')!r}, expected {CAPTURE_VERSION}")
+        return [json.loads(line) for line in file if line.strip()]
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that answers requests from a capture.
+
+    Requests are matched on method, path with query and body; repeated requests get
+    the recorded responses in order. Unmatched requests get a 404 with an ASF-style
+    body and are listed in ``misses``.
+
+    Usage:
+        transport = ReplayTransport("capture.jsonl.gz", speed=10)
+        async with ASFConnector("replay", "1242", transport=transport) as connector:
+            await connector.get_bot_info("ASF")
+    """
+
+    def __init__(self, capture: str | Path | list[dict], speed: float = 1.0, cycle: bool = False):
+        """
+        Initialize the replay
+
+        Args:
+            capture: Capture file or records from load_capture()
+            speed: Latency scale; 1 replays recorded durations, 10 ten times faster, float("inf") without delay
+            cycle: Start over with the first recorded response of a request once all were served
+        """
+        if speed <= 0:
+            raise ValueError(f"Speed must be positive, got {speed}")
+        records = capture if isinstance(capture, list) else load_capture(capture)
+        self.speed = speed
+        self.cycle = cycle
+        self.served = 0
+        self.misses: list[str] = []
+        self._recorded: dict[tuple, list[dict]] = defaultdict(list)
+        for record in records:
+            self._recorded[_request_key(record["method"], record["target"], record["body"])].append(record)
+        self._pending = {key: deque(entries) for key, entries in self._recorded.items()}
+
+    def remaining(self) -> int:
+        """Number of recorded responses not served yet"""
+        return sum(len(entries) for entries in self._pending.values())
+
+    def _next(self, key: tuple) -> dict | None:
+        pending = self._pending.get(key)
+        if pending is None:
+            return None
+        if not pending and self.cycle:
+            pending.extend(self._recorded[key])
+        return pending.popleft() if pending else None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        content = await request.aread()
+        target = _target(request.url)
+        record = self._next(_request_key(request.method, target, _body_text(content)))
+        if record is None:
+            self.misses.append(f"{request.method} {target}")
+            return httpx.Response(
+                404,
+                json={"Message": f"No recorded response for {request.method} {target}", "Success": False},
+                request=request,
+            )
+        if self.speed != float("inf") and record["d"]:
+            await asyncio.sleep(record["d"] / self.speed)
+        if "b64" in record:
+            body = base64.b64decode(record["b64"])
+        else:
+            body = record["text"].encode("utf-8")
+        self.served += 1
+        return httpx.Response(record["status"], headers=record["headers"], content=body, request=request)
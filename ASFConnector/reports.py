@@ -0,0 +1,325 @@
+"""
+Structured reports for redeem and bot info responses.
+
+``RedeemReport`` and ``BotInfoReport`` turn raw API responses into flat entry
+lists with per-bot and per-outcome tallies. Renderers write one entry at a
+time to any writable target, so text, JSON lines or table output for
+thousands of keys or bots takes linear time and can be streamed.
+"""
+
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+import io
+import json
+from typing import TextIO
+
+from .Controllers.enum import PurchaseResultDetail, Result
+
+REPORT_FORMATS = ("text", "jsonl", "table")
+
+
+def decode_codes(values: Iterable, table: dict) -> list[str]:
+    """
+    Translate numeric ASF codes to their names in one pass.
+
+    Args:
+        values: Codes as ints or already decoded strings
+        table: Code -> name mapping, e.g. Result or PurchaseResultDetail
+
+    Returns:
+        list[str]: Names; strings pass through and unknown codes are kept as their number
+    """
+    get = table.get
+    return [value if isinstance(value, str) else get(value, str(value)) for value in values]
+
+
+@dataclass(slots=True)
+class RedeemEntry:
+    """
+    Outcome of one key on one bot.
+
+    Attributes:
+        bot: Bot name
+        key: Redeemed key
+        result: Result name, e.g. "OK"
+        detail: PurchaseResultDetail name, e.g. "AlreadyPurchased"
+        items: (package id, description) pairs from the purchase receipt, None without a receipt
+    """
+
+    bot: str
+    key: str
+    result: str
+    detail: str
+    items: list[tuple] | None = None
+
+
+@dataclass(slots=True)
+class RedeemReport:
+    """
+    Redeem response as entries with tallies.
+
+    Attributes:
+        entries: One entry per bot and key, in response order
+        message: Outcome message when the response has no results ("not found" or failure)
+        per_bot: Bot name -> Counter of detail names
+        per_detail: Detail name -> number of keys
+        skipped: Keys not sent because the key ledger had settled them
+    """
+
+    entries: list[RedeemEntry] = field(default_factory=list)
+    message: str | None = None
+    per_bot: dict[str, Counter] = field(default_factory=dict)
+    per_detail: Counter = field(default_factory=Counter)
+    skipped: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_response(cls, response: dict, bot: str = "") -> "RedeemReport":
+        """
+        Build a report from a BotController.redeem() response.
+
+        Args:
+            response: Redeem API response
+            bot: Requested bot name(s), used in the "not found" message
+
+        Returns:
+            RedeemReport: Structured report
+        """
+        report = cls()
+        if "Result" not in response:
+            if response["Success"]:
+                report.message = f"Bot {bot} not found."
+            else:
+                report.message = "Redeem failed: {}".format(response["Message"])
+            return report
+        raw = []
+        for bot_name, keys in (response["Result"] or {}).items():
+            for key, outcome in (keys or {}).items():
+                if not outcome:
+                    continue
+                receipt = outcome.get("purchase_receipt_info")
+                if receipt:
+                    items = [(item["packageid"], item["line_item_description"]) for item in receipt["line_items"]]
+                    raw.append((bot_name, key, receipt["purchase_status"], receipt["result_detail"], items))
+                else:
+                    raw.append((bot_name, key, outcome["Result"], outcome["PurchaseResultDetail"], None))
+        results = decode_codes((row[2] for row in raw), Result)
+        details = decode_codes((row[3] for row in raw), PurchaseResultDetail)
+        for (bot_name, key, _, _, items), result, detail in zip(raw, results, details):
+            report.entries.append(RedeemEntry(bot_name, key, result, detail, items))
+            tally = report.per_bot.get(bot_name)
+            if tally is None:
+                tally = report.per_bot[bot_name] = Counter()
+            tally[detail] += 1
+        report.per_detail = Counter(details)
+        return report
+
+    def text_lines(self) -> Iterator[str]:
+        """Lines of the classic bot_redeem() text output"""
+        if self.message is not None:
+            yield self.message
+            return
+        for entry in self.entries:
+            yield f"Bot {entry.bot}: \n"
+            if entry.items is not None:
+                items = "".join(f"[{package_id}, {description}] " for package_id, description in entry.items)
+                yield f"\t[{entry.key}] {items}: {entry.result}/{entry.detail}\n"
+            else:
+                yield f"\t[{entry.key}] {entry.result}/{entry.detail}\n"
+        if self.skipped:
+            yield f"Skipped {len(self.skipped)} key(s) already settled in the key ledger.\n"
+
+    def rows(self) -> Iterator[dict]:
+        """One flat dict per entry"""
+        for entry in self.entries:
+            yield asdict(entry)
+
+    columns = ("bot", "key", "result", "detail")
+
+    def summary(self) -> dict:
+        """Tallies as plain dicts"""
+        return {
+            "keys": len(self.entries),
+            "skipped": len(self.skipped),
+            "per_detail": dict(self.per_detail),
+            "per_bot": {bot: dict(tally) for bot, tally in self.per_bot.items()},
+        }
+
+    def to_text(self) -> str:
+        """Render the classic text output as one string"""
+        return render(self, "text")
+
+
+@dataclass(slots=True)
+class BotStatus:
+    """
+    Farming status of one bot.
+
+    Attributes:
+        bot: Bot name
+        state: "farming", "paused", "idle", "offline" or "not_configured"
+        current_games: (app id, name, cards remaining) of games being farmed
+        games_to_farm: (app id, name) of queued games
+        time_remaining: ASF TimeSpan string
+    """
+
+    bot: str
+    state: str
+    current_games: list[tuple] = field(default_factory=list)
+    games_to_farm: list[tuple] = field(default_factory=list)
+    time_remaining: str = "00:00:00"
+
+
+@dataclass(slots=True)
+class BotInfoReport:
+    """
+    Bot info response as per-bot statuses with a tally of states.
+
+    Attributes:
+        bots: One status per bot, in response order
+        message: Outcome message when the response has no results ("not found" or failure)
+        per_state: State -> number of bots
+    """
+
+    bots: list[BotStatus] = field(default_factory=list)
+    message: str | None = None
+    per_state: Counter = field(default_factory=Counter)
+
+    @classmethod
+    def from_response(cls, response: dict, bot: str = "") -> "BotInfoReport":
+        """
+        Build a report from a BotController.get_info() response.
+
+        Args:
+            response: Bot info API response
+            bot: Requested bot name(s), used in the "not found" message
+
+        Returns:
+            BotInfoReport: Structured report
+        """
+        report = cls()
+        if "Result" not in response:
+            if response["Success"]:
+                report.message = f"Bot {bot} not found."
+            else:
+                report.message = "Getting bot info failed: {}".format(response["Message"])
+            return report
+        for bot_name, info in (response["Result"] or {}).items():
+            if not info["IsConnectedAndLoggedOn"]:
+                state = "offline" if info.get("BotConfig") else "not_configured"
+                report.bots.append(BotStatus(bot_name, state))
+                continue
+            cards_farmer = info["CardsFarmer"]
+            current = [
+                (game["AppID"], game["GameName"], game["CardsRemaining"])
+                for game in cards_farmer.get("CurrentGamesFarming") or ()
+            ]
+            queued = [(game["AppID"], game["GameName"]) for game in cards_farmer.get("GamesToFarm") or ()]
+            if cards_farmer.get("Paused"):
+                state = "paused"
+            elif current or queued:
+                state = "farming"
+            else:
+                state = "idle"
+            report.bots.append(
+                BotStatus(bot_name, state, current, queued, cards_farmer.get("TimeRemaining") or "00:00:00")
+            )
+        report.per_state = Counter(status.state for status in report.bots)
+        return report
+
+    def text_lines(self) -> Iterator[str]:
+        """Lines of the classic get_bot_info() text output"""
+        if self.message is not None:
+            yield self.message
+            return
+        for status in self.bots:
+            if status.state == "offline":
+                yield f"Bot {status.bot}: Offline.\n"
+                continue
+            if status.state == "not_configured":
+                yield f"Bot {status.bot}: Not configured.\n"
+                continue
+            parts = []
+            if status.state == "paused":
+                parts.append("Farming paused.")
+            elif status.current_games:
+                parts.append("Currently farming games:")
+            parts.extend(
+                f"\n\t[{app_id}/{name}] {cards} cards remaining." for app_id, name, cards in status.current_games
+            )
+            if status.games_to_farm:
+                games = " ".join(f"[{app_id}/{name}]" for app_id, name in status.games_to_farm)
+                parts.append(f" {len(status.games_to_farm)} game(s) to farm ({games}). ")
+            if status.time_remaining != "00:00:00":
+                parts.append(f"Time remaining: {status.time_remaining}")
+            yield f"Bot {status.bot}: {''.join(parts) or 'Idle.'}\n"
+
+    def rows(self) -> Iterator[dict]:
+        """One flat dict per bot"""
+        for status in self.bots:
+            yield asdict(status)
+
+    columns = ("bot", "state", "time_remaining")
+
+    def summary(self) -> dict:
+        """Tallies as plain dicts"""
+        return {"bots": len(self.bots), "per_state": dict(self.per_state)}
+
+    def to_text(self) -> str:
+        """Render the classic text output as one string"""
+        return render(self, "text")
+
+
+def _render_text(report, write: Callable[[str], object]):
+    for line in report.text_lines():
+        write(line)
+
+
+def _render_jsonl(report, write: Callable[[str], object]):
+    if report.message is not None:
+        write(json.dumps({"message": report.message}, ensure_ascii=False) + "\n")
+        return
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    for row in report.rows():
+        write(dumps(row) + "\n")
+
+
+def _render_table(report, write: Callable[[str], object]):
+    if report.message is not None:
+        write(report.message + "\n")
+        return
+    columns = report.columns
+    widths = [len(column) for column in columns]
+    for row in report.rows():
+        for index, column in enumerate(columns):
+            widths[index] = max(widths[index], len(str(row[column])))
+    write("  ".join(column.upper().ljust(width) for column, width in zip(columns, widths)).rstrip() + "\n")
+    write("  ".join("-" * width for width in widths) + "\n")
+    for row in report.rows():
+        write("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)).rstrip() + "\n")
+
+
+_RENDERERS = {"text": _render_text, "jsonl": _render_jsonl, "table": _render_table}
+
+
+def render(report: RedeemReport | BotInfoReport, fmt: str = "text", out: TextIO | None = None) -> str | None:
+    """
+    Render a report entry by entry.
+
+    Args:
+        report: RedeemReport or BotInfoReport
+        fmt: One of REPORT_FORMATS
+        out: Writable text stream; if None the output is collected and returned
+
+    Returns:
+        str | None: Rendered output when no stream is given
+    """
+    renderer = _RENDERERS.get(fmt)
+    if renderer is None:
+        raise ValueError(f"Unknown report format {fmt!r}, expected one of {REPORT_FORMATS}")
+    if out is not None:
+        renderer(report, out.write)
+        return None
+    buffer = io.StringIO()
+    renderer(report, buffer.write)
+    return buffer.getvalue()
@@ -0,0 +1,181 @@
+"""
+Priority scheduling of IPC requests.
+
+Every request sent by ``IPCProtocolHandler`` takes a slot from a
+``RequestScheduler`` first. The scheduler caps the number of requests in flight
+to ASF, and when the cap is reached it hands freed slots to waiting requests by
+weighted fair queuing over three priority classes. Interactive calls such as 2FA
+tokens keep low latency while bulk jobs (inventories, redeeming) still progress.
+"""
+
+import asyncio
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+import re
+
+
+class Priority(IntEnum):
+    """Request priority classes"""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+DEFAULT_WEIGHTS = {Priority.INTERACTIVE: 16, Priority.NORMAL: 4, Priority.BULK: 1}
+
+# First matching resource pattern decides the class of a request; everything else is NORMAL
+ROUTE_PRIORITIES = (
+    (re.compile(r"/TwoFactorAuthentication/"), Priority.INTERACTIVE),
+    (re.compile(r"/Bot/[^/]+/Input$"), Priority.INTERACTIVE),
+    (re.compile(r"/Inventory(/|$)"), Priority.BULK),
+    (re.compile(r"/Redeem$"), Priority.BULK),
+    (re.compile(r"/GamesToRedeemInBackground$"), Priority.BULK),
+    (re.compile(r"^/NLog/File"), Priority.BULK),
+)
+
+_priority_override: ContextVar[Priority | None] = ContextVar("asfc_priority", default=None)
+
+
+@contextmanager
+def priority(level: Priority | str) -> Iterator[Priority]:
+    """
+    Override the priority of every request made inside the block.
+
+    Args:
+        level: Priority or its name, e.g. "bulk"
+
+    Example:
+        with priority(Priority.BULK):
+            await connector.bot.get_info("ASF")
+    """
+    if isinstance(level, str):
+        level = Priority[level.upper()]
+    token = _priority_override.set(Priority(level))
+    try:
+        yield level
+    finally:
+        _priority_override.reset(token)
+
+
+def classify(resource: str) -> Priority:
+    """
+    Get the priority of a request to ``resource``, honouring an active ``priority()`` override.
+
+    Args:
+        resource: API resource path, e.g. "/Bot/ASF/Inventory"
+
+    Returns:
+        Priority: Priority class
+    """
+    override = _priority_override.get()
+    if override is not None:
+        return override
+    for pattern, level in ROUTE_PRIORITIES:
+        if pattern.search(resource):
+            return level
+    return Priority.NORMAL
+
+
+class RequestScheduler:
+    """
+    Global in-flight cap with weighted fair queuing between priority classes.
+
+    Waiting requests are tagged with a virtual finish time that advances by
+    ``1 / weight`` per request of a class; a freed slot goes to the earliest tag.
+    With the default weights, while both classes are waiting, interactive
+    requests receive sixteen freed slots for every one given to bulk requests.
+    """
+
+    def __init__(self, max_in_flight: int | None = 16, weights: dict[Priority, float] | None = None):
+        """
+        Initialize the scheduler
+
+        Args:
+            max_in_flight: Maximum number of requests in flight (None or 0 for unlimited)
+            weights: Relative share of freed slots per priority class
+        """
+        self.max_in_flight = max_in_flight or None
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights:
+            self.weights.update({Priority(key): value for key, value in weights.items()})
+        if any(weight <= 0 for weight in self.weights.values()):
+            raise ValueError("Priority weights must be positive")
+        self.in_flight = 0
+        self.stats: Counter = Counter()
+        self._queues: dict[Priority, deque] = {level: deque() for level in Priority}
+        self._last_tag = dict.fromkeys(Priority, 0.0)
+        self._virtual_time = 0.0
+
+    @property
+    def queued(self) -> dict[Priority, int]:
+        """Number of waiting requests per priority class"""
+        return {level: sum(not future.done() for _, future in queue) for level, queue in self._queues.items()}
+
+    def _has_capacity(self) -> bool:
+        return self.max_in_flight is None or self.in_flight < self.max_in_flight
+
+    def _dispatch(self):
+        while self._has_capacity():
+            best = None
+            for level, queue in self._queues.items():
+                while queue and queue[0][1].done():
+                    queue.popleft()
+                if queue and (best is None or queue[0][0] < self._queues[best][0][0]):
+                    best = level
+            if best is None:
+                return
+            tag, future = self._queues[best].popleft()
+            self._virtual_time = tag
+            self.in_flight += 1
+            future.set_result(None)
+
+    async def acquire(self, level: Priority = Priority.NORMAL):
+        """Wait for a slot; every successful acquire must be paired with release()"""
+        self.stats[f"requests:{level.name.lower()}"] += 1
+        if self._has_capacity() and not any(self._queues.values()):
+            self.in_flight += 1
+            return
+        self.stats[f"queued:{level.name.lower()}"] += 1
+        tag = max(self._virtual_time, self._last_tag[level]) + 1 / self.weights[level]
+        self._last_tag[level] = tag
+        future = asyncio.get_running_loop().create_future()
+        self._queues[level].append((tag, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just before the waiter was cancelled
+                self.release()
+            raise
+
+    def resize(self, max_in_flight: int | None):
+        """
+        Change the in-flight cap without disturbing running requests.
+
+        Raising the cap dispatches waiting requests at once; lowering it lets the
+        requests in flight finish and admits new ones only below the new cap.
+
+        Args:
+            max_in_flight: New maximum (None or 0 for unlimited)
+        """
+        self.max_in_flight = max_in_flight or None
+        self._dispatch()
+
+    def release(self):
+        """Return a slot and hand it to the next waiting request"""
+        self.in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, level: Priority = Priority.NORMAL):
+        """Hold a slot for the duration of the block"""
+        await self.acquire(level)
+        try:
+            yield
+        finally:
+            self.release()
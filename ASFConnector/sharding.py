@@ -0,0 +1,328 @@
+"""
+Multi-process sharded polling of very large fleets.
+
+``ShardedPoller`` splits bot names across worker processes. Each worker runs
+its own event loop and ``ASFConnector`` with its own connection pool, polls
+``BotController.get_info`` for its shard, decodes and diffs the responses
+locally and sends only compact deltas back to the parent. JSON decoding and
+diffing therefore scale with the number of cores. The parent merges the
+deltas into one fleet snapshot, publishes them to subscribers like
+``BotWatcher`` does, and restarts workers that die.
+"""
+
+import asyncio
+from collections.abc import Iterable
+import contextlib
+import multiprocessing
+from multiprocessing import connection
+import os
+import time
+import zlib
+
+from loguru import logger
+
+from .watcher import SNAPSHOT_FIELDS, BotDelta, BotSnapshot, WatchSubscription, diff_snapshots, snapshot_fleet
+
+_KINDS = ("added", "removed", "changed")
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+_FIELD_CODES = {name: code for code, name in enumerate(SNAPSHOT_FIELDS)}
+
+
+def shard_bots(bot_names: Iterable[str], shards: int) -> list[list[str]]:
+    """
+    Assign bots to shards by a stable hash of their name.
+
+    Args:
+        bot_names: Bot names
+        shards: Number of shards
+
+    Returns:
+        list: One list of bot names per shard; a bot keeps its shard across runs
+    """
+    if shards < 1:
+        raise ValueError(f"Shards must be at least 1, got {shards}")
+    assignment: list[list[str]] = [[] for _ in range(shards)]
+    for name in dict.fromkeys(bot_names):
+        assignment[zlib.crc32(name.encode()) % shards].append(name)
+    return assignment
+
+
+def encode_deltas(deltas: Iterable[BotDelta]) -> list[tuple]:
+    """Encode deltas as (bot, kind code, ((field code, old, new), ...)) tuples for cheap pickling"""
+    return [
+        (
+            delta.bot,
+            _KIND_CODES[delta.kind],
+            tuple((_FIELD_CODES[name], old, new) for name, (old, new) in delta.changes.items()),
+        )
+        for delta in deltas
+    ]
+
+
+def decode_deltas(encoded: Iterable[tuple]) -> list[BotDelta]:
+    """Decode the output of encode_deltas()"""
+    return [
+        BotDelta(bot, _KINDS[kind], {SNAPSHOT_FIELDS[code]: (old, new) for code, old, new in changes})
+        for bot, kind, changes in encoded
+    ]
+
+
+async def _poll_shard(connector, chunks: list[str]) -> dict[str, BotSnapshot]:
+    responses = await asyncio.gather(*(connector.bot.get_info(chunk) for chunk in chunks))
+    current: dict[str, BotSnapshot] = {}
+    for response in responses:
+        current.update(snapshot_fleet(response.get("Result") or {}))
+    return current
+
+
+async def _worker_loop(index, bot_names, connection_params, interval, chunk_size, conn):
+    from . import ASFConnector
+
+    chunks = [",".join(bot_names[start : start + chunk_size]) for start in range(0, len(bot_names), chunk_size)]
+    loop = asyncio.get_running_loop()
+    previous: dict[str, BotSnapshot] | None = None
+    async with ASFConnector(**connection_params, health_check_mode="skip") as connector:
+        while True:
+            try:
+                current = await _poll_shard(connector, chunks)
+            except Exception as ex:
+                conn.send(("error", index, f"{type(ex).__name__}: {ex}"))
+            else:
+                if previous is None:
+                    conn.send(("snapshot", index, current))
+                else:
+                    conn.send(("delta", index, encode_deltas(diff_snapshots(previous, current))))
+                previous = current
+            # Anything from the parent, including EOF when it goes away, means stop
+            if await loop.run_in_executor(None, conn.poll, interval):
+                return
+
+
+def _worker_main(index, bot_names, connection_params, interval, chunk_size, conn):
+    """Entry point of a worker process"""
+    try:
+        asyncio.run(_worker_loop(index, bot_names, connection_params, interval, chunk_size, conn))
+    except (KeyboardInterrupt, BrokenPipeError, EOFError):
+        pass
+
+
+class ShardedPoller:
+    """
+    Polls a fleet from several processes and publishes merged deltas.
+
+    Usage:
+        poller = ShardedPoller(config.get_connection_params(), bot_names, shards=8, interval=5)
+        async with poller:
+            async for delta in poller.subscribe(fields={"online"}):
+                print(delta.bot, delta.changes)
+    """
+
+    def __init__(
+        self,
+        connection_params: dict,
+        bot_names: Iterable[str],
+        shards: int | None = None,
+        interval: float = 5.0,
+        chunk_size: int = 200,
+        restart_delay: float = 1.0,
+        emit_initial: bool = True,
+    ):
+        """
+        Initialize the poller
+
+        Args:
+            connection_params: ASFConnector keyword arguments used by every worker,
+                e.g. ASFConfig.get_connection_params(); must be picklable
+            bot_names: Bots to poll
+            shards: Number of worker processes, defaults to the number of CPUs
+            interval: Seconds between polls of a shard
+            chunk_size: Bots per get_info request inside a worker
+            restart_delay: Seconds before a dead worker is restarted
+            emit_initial: Publish "added" deltas for every bot on the first poll
+        """
+        if interval <= 0:
+            raise ValueError(f"Interval must be positive, got {interval}")
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be at least 1, got {chunk_size}")
+        self.connection_params = dict(connection_params)
+        self.shards = [shard for shard in shard_bots(bot_names, shards or os.cpu_count() or 1) if shard]
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.restart_delay = restart_delay
+        self.emit_initial = emit_initial
+        self.snapshot: dict[str, BotSnapshot] = {}
+        self.polls = [0] * len(self.shards)
+        self.restarts = 0
+        self.errors = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: list = []
+        # Parent end of each worker's pipe; a pipe per worker so a killed worker cannot corrupt the others' channel
+        self._connections: list = []
+        # Shard index -> monotonic time its worker was found dead
+        self._dead_since: dict[int, float] = {}
+        # Shards whose pipe reported EOF; left out of wait() until restarted, or it would return at once forever
+        self._closed: set[int] = set()
+        self._subscriptions: set[WatchSubscription] = set()
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(
+        self, bots: Iterable[str] | None = None, fields: Iterable[str] | None = None, maxsize: int = 0
+    ) -> WatchSubscription:
+        """
+        Subscribe to merged deltas, see BotWatcher.subscribe().
+
+        Returns:
+            WatchSubscription: Async iterator of BotDelta
+        """
+        if fields is not None:
+            unknown = set(fields) - set(SNAPSHOT_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown fields {sorted(unknown)}, expected some of {SNAPSHOT_FIELDS}")
+        subscription = WatchSubscription(self, bots, fields, maxsize)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def get(self, bot: str) -> dict | None:
+        """Get the last known state of a bot as a field dict"""
+        snapshot = self.snapshot.get(bot)
+        if snapshot is None:
+            return None
+        return dict(zip(SNAPSHOT_FIELDS, snapshot))
+
+    def _spawn(self, index: int):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                index,
+                self.shards[index],
+                self.connection_params,
+                self.interval,
+                self.chunk_size,
+                child_conn,
+            ),
+            name=f"asfc-shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def start(self):
+        """Start the worker processes and the merge loop in the running event loop"""
+        if self.running:
+            return
+        spawned = [self._spawn(index) for index in range(len(self.shards))]
+        self._processes = [process for process, _ in spawned]
+        self._connections = [conn for _, conn in spawned]
+        self._closed.clear()
+        self._task = asyncio.create_task(self._run())
+        logger.debug(f"ShardedPoller started {len(self.shards)} worker(s)")
+
+    async def stop(self):
+        """Stop the workers and end all subscriptions"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for conn in self._connections:
+            with contextlib.suppress(OSError):
+                conn.send(None)
+        loop = asyncio.get_running_loop()
+        for process, conn in zip(self._processes, self._connections):
+            await loop.run_in_executor(None, process.join, 5)
+            if process.is_alive():
+                process.kill()
+            conn.close()
+        self._processes = []
+        self._connections = []
+        for subscription in tuple(self._subscriptions):
+            subscription.close()
+        logger.debug("ShardedPoller stopped")
+
+    def _publish(self, deltas: list[BotDelta]):
+        for delta in deltas:
+            for subscription in tuple(self._subscriptions):
+                subscription._offer(delta)
+
+    def _handle(self, message: tuple):
+        kind, index, body = message
+        if kind == "error":
+            self.errors += 1
+            logger.warning(f"Shard {index} poll failed: {body}")
+            return
+        self.polls[index] += 1
+        if kind == "snapshot":
+            # First poll of a (re)started worker: diff against what the parent knew of its shard
+            known = {name: self.snapshot[name] for name in self.shards[index] if name in self.snapshot}
+            deltas = diff_snapshots(known, body)
+            for name in known.keys() - body.keys():
+                del self.snapshot[name]
+            self.snapshot.update(body)
+            if not known and not self.emit_initial:
+                return
+        else:
+            deltas = decode_deltas(body)
+            for delta in deltas:
+                if delta.kind == "removed":
+                    self.snapshot.pop(delta.bot, None)
+                else:
+                    current = self.snapshot.get(delta.bot) or (None,) * len(SNAPSHOT_FIELDS)
+                    updated = list(current)
+                    for name, (_, new) in delta.changes.items():
+                        updated[_FIELD_CODES[name]] = new
+                    self.snapshot[delta.bot] = tuple(updated)
+        self._publish(deltas)
+
+    def _supervise(self):
+        now = time.monotonic()
+        for index, process in enumerate(self._processes):
+            if process.is_alive():
+                continue
+            dead_since = self._dead_since.setdefault(index, now)
+            if now - dead_since >= self.restart_delay:
+                logger.warning(f"Shard {index} worker exited with code {process.exitcode}, restarting")
+                del self._dead_since[index]
+                self._connections[index].close()
+                self._processes[index], self._connections[index] = self._spawn(index)
+                self._closed.discard(index)
+                self.restarts += 1
+
+    def _receive(self) -> list[tuple]:
+        messages = []
+        open_connections = {conn: index for index, conn in enumerate(self._connections) if index not in self._closed}
+        if not open_connections:
+            time.sleep(0.2)
+            return messages
+        for conn in connection.wait(list(open_connections), timeout=0.2):
+            # Drain what is already buffered without another executor round trip
+            try:
+                while True:
+                    messages.append(conn.recv())
+                    if not conn.poll():
+                        break
+            except (EOFError, OSError):
+                # The worker died; the supervisor restarts it
+                self._closed.add(open_connections[conn])
+        return messages
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            for message in await loop.run_in_executor(None, self._receive):
+                self._handle(message)
+            self._supervise()
@@ -0,0 +1,907 @@
+"""
+Local ArchiSteamFarm IPC stand-in for offline load and fault testing.
+
+The simulator speaks plain HTTP/1.1 on a local socket and serves every route
+used by the controllers, backed by an in-memory fleet of simulated bots.
+Latency, HTTP errors, slow bodies, dropped connections and rate-limited
+redeem results are injected according to a ``FaultProfile``.
+
+Usage:
+    async with ASFSimulator(bots=5000, profile=FaultProfile(drop_rate=0.01)) as sim:
+        async with ASFConnector(**sim.connection_params()) as connector:
+            await connector.bot.get_info("ASF")
+
+    # Or as a standalone stand-in
+    python -m ASFConnector.simulator --bots 5000 --port 1242
+"""
+
+import argparse
+import asyncio
+import base64
+from collections import Counter
+from collections.abc import Callable
+import contextlib
+from datetime import datetime, timezone
+import gzip
+import hashlib
+import json
+import math
+import os
+import random
+import re
+from urllib.parse import unquote, urlsplit
+
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from .Controllers.enum import PurchaseResultDetail, Result
+from .error import HTTP_STATUS_EXCEPTION_MAP
+from .steam_guard import SteamGuardGenerator
+
+LatencyDistribution = Callable[[random.Random], float]
+
+_REASON_PHRASES = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    406: "Not Acceptable",
+    411: "Length Required",
+    500: "Internal Server Error",
+    501: "Not Implemented",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+
+_RESULT_CODES = {name: code for code, name in Result.items()}
+_DETAIL_CODES = {name: code for code, name in PurchaseResultDetail.items()}
+_KEY_PATTERN = re.compile(r"^[0-9A-Z]{4,5}(-[0-9A-Z]{4,5}){2,4}$")
+_ASF_VERSION = "6.2.2.3"
+
+
+def constant_latency(seconds: float) -> LatencyDistribution:
+    """Always delay by ``seconds``."""
+    return lambda rng: seconds
+
+
+def uniform_latency(low: float, high: float) -> LatencyDistribution:
+    """Delay uniformly distributed between ``low`` and ``high`` seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def exponential_latency(mean: float) -> LatencyDistribution:
+    """Exponentially distributed delay with the given mean in seconds."""
+    return lambda rng: rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> LatencyDistribution:
+    """Log-normal delay with the given median in seconds (long tail for large ``sigma``)."""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def parse_latency(spec: str) -> LatencyDistribution:
+    """
+    Parse a latency specification such as ``"constant:0.01"``, ``"uniform:0.005,0.02"``,
+    ``"exponential:0.01"`` or ``"lognormal:0.01,0.8"``.
+
+    Args:
+        spec: Distribution name and comma-separated arguments in seconds
+
+    Returns:
+        LatencyDistribution: Callable drawing a delay from a random generator
+    """
+    factories = {
+        "constant": constant_latency,
+        "uniform": uniform_latency,
+        "exponential": exponential_latency,
+        "lognormal": lognormal_latency,
+    }
+    name, _, arguments = spec.partition(":")
+    if name not in factories:
+        raise ValueError(f"Unknown latency distribution {name!r}, expected one of {sorted(factories)}")
+    values = [float(value) for value in arguments.split(",") if value.strip()]
+    return factories[name](*values)
+
+
+class FaultProfile(BaseModel):
+    """
+    Fault and latency injection settings for ``ASFSimulator``.
+
+    Rates are probabilities in ``[0, 1]`` evaluated independently for every request
+    (``rate_limit_rate`` is evaluated for every redeemed key).
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    latency: LatencyDistribution | None = Field(default=None, description="Base latency for every request")
+
+    route_latency: dict[str, LatencyDistribution] = Field(
+        default_factory=dict, description="Per-route latency overrides, keyed by route name (e.g. 'Bot.Inventory')"
+    )
+
+    error_rates: dict[int, float] = Field(default_factory=dict, description="HTTP status code -> probability")
+
+    drop_rate: float = Field(default=0.0, description="Probability of closing the connection without a response")
+
+    slow_body_rate: float = Field(default=0.0, description="Probability of trickling the body in small chunks")
+
+    slow_body_chunk_size: int = Field(default=512, description="Chunk size in bytes for slow bodies")
+
+    slow_body_chunk_delay: float = Field(default=0.01, description="Delay in seconds between slow body chunks")
+
+    rate_limit_rate: float = Field(default=0.0, description="Probability that a redeemed key is RateLimited")
+
+    fault_health_check: bool = Field(default=False, description="Also inject faults into /HealthCheck")
+
+    @field_validator("drop_rate", "slow_body_rate", "rate_limit_rate")
+    @classmethod
+    def validate_rate(cls, v: float) -> float:
+        """Validate rate is a probability"""
+        if not (0.0 <= v <= 1.0):
+            raise ValueError(f"Rate must be between 0 and 1, got {v}")
+        return v
+
+    @field_validator("error_rates")
+    @classmethod
+    def validate_error_rates(cls, v: dict[int, float]) -> dict[int, float]:
+        """Validate error statuses are HTTP errors and rates sum to at most 1"""
+        for status, rate in v.items():
+            if status not in HTTP_STATUS_EXCEPTION_MAP and not (500 <= status <= 599):
+                raise ValueError(f"Status {status} is neither mapped in HTTP_STATUS_EXCEPTION_MAP nor a 5xx error")
+            if not (0.0 <= rate <= 1.0):
+                raise ValueError(f"Rate for status {status} must be between 0 and 1, got {rate}")
+        if sum(v.values()) > 1.0:
+            raise ValueError("Sum of error rates must not exceed 1")
+        return v
+
+
+class SimulatedBot:
+    """In-memory state of a single simulated bot."""
+
+    __slots__ = (
+        "background_keys",
+        "config",
+        "games_farming",
+        "games_to_farm",
+        "inventory_size",
+        "name",
+        "online",
+        "paused",
+        "redeemed_keys",
+        "shared_secret",
+        "steam_id",
+        "time_remaining",
+    )
+
+    def __init__(self, name: str, rng: random.Random, inventory_size: int = 0):
+        self.name = name
+        self.steam_id = 76561197960265728 + rng.randrange(1, 2**31)
+        self.online = rng.random() < 0.9
+        self.paused = False
+        self.games_to_farm = [
+            {"AppID": app_id, "GameName": f"Game {app_id}", "CardsRemaining": rng.randint(1, 6)}
+            for app_id in rng.sample(range(10, 2_000_000, 10), rng.randint(0, 3))
+        ]
+        self.games_farming = self.games_to_farm[:1] if self.online else []
+        self.time_remaining = sum(game["CardsRemaining"] for game in self.games_to_farm) * 1800
+        self.config = {"Enabled": True, "Paused": False, "SteamLogin": None, "SteamPassword": None}
+        self.shared_secret = base64.b64encode(hashlib.sha1(f"{name}:{self.steam_id}".encode()).digest()).decode()
+        self.inventory_size = inventory_size
+        self.redeemed_keys: set[str] = set()
+        self.background_keys: dict[str, str] = {}
+
+    def to_json(self) -> dict:
+        """Serialize in the shape returned by GET /Api/Bot/{botNames}"""
+        return {
+            "BotName": self.name,
+            "SteamID": self.steam_id,
+            "IsConnectedAndLoggedOn": self.online,
+            "KeepRunning": self.config.get("Enabled", True),
+            "HasMobileAuthenticator": True,
+            "CardsFarmer": {
+                "Paused": self.paused,
+                "CurrentGamesFarming": [dict(game, HoursPlayed=0.0) for game in self.games_farming],
+                "GamesToFarm": [dict(game, HoursPlayed=0.0) for game in self.games_to_farm],
+                "TimeRemaining": _format_timespan(self.time_remaining if self.online else 0),
+            },
+            "BotConfig": dict(self.config),
+        }
+
+    def inventory_json(self, app_id: int | None = None, context_id: int | None = None) -> dict:
+        """Build a deterministic inventory in the shape of ASF's BotInventoryResponse"""
+        assets = []
+        descriptions = {}
+        for index in range(self.inventory_size):
+            item_app_id = (753, 440, 730)[index % 3]
+            item_context_id = 6 if item_app_id == 753 else 2
+            if app_id is not None and (item_app_id != app_id or item_context_id != context_id):
+                continue
+            class_id = str(1_000_000 + index % 97)
+            assets.append(
+                {
+                    "appid": item_app_id,
+                    "contextid": str(item_context_id),
+                    "assetid": str(self.steam_id % 1_000_000 * 100_000 + index),
+                    "classid": class_id,
+                    "instanceid": "0",
+                    "amount": "1",
+                }
+            )
+            if (item_app_id, class_id) not in descriptions:
+                descriptions[(item_app_id, class_id)] = {
+                    "appid": item_app_id,
+                    "classid": class_id,
+                    "instanceid": "0",
+                    "market_hash_name": f"{item_app_id}-Item {class_id}",
+                    "type": "Trading Card" if item_app_id == 753 else "Item",
+                    "tradable": True,
+                    "marketable": True,
+                }
+        return {"Assets": assets, "Descriptions": list(descriptions.values())}
+
+
+class ASFSimulator:
+    """
+    Asynchronous HTTP stand-in for ASF IPC with fault injection.
+
+    Every route called by ``ASFController``, ``BotController``, ``CommandController``,
+    ``NLogController``, ``StructureController``, ``TwoFactorAuthenticationController``
+    and ``TypeController`` is served, plus ``/HealthCheck``.
+    """
+
+    def __init__(
+        self,
+        bots: int | list[str] = 10,
+        password: str | None = None,
+        profile: FaultProfile | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = "/Api",
+        inventory_size: int = 0,
+        log_lines: int = 100,
+        seed: int | None = None,
+        unix_socket: str | None = None,
+        compress_min_size: int | None = 1024,
+    ):
+        """
+        Initialize the simulator
+
+        Args:
+            bots: Number of bots to generate, or explicit list of bot names
+            password: IPC password required in the Authentication header (optional)
+            profile: Fault and latency injection settings
+            host: Address to listen on
+            port: Port to listen on, 0 picks a free port
+            path: API path prefix
+            inventory_size: Number of inventory items per bot
+            log_lines: Number of lines returned by /NLog/File
+            seed: Seed for deterministic fleet generation and fault injection
+            unix_socket: Listen on this Unix domain socket path instead of host and port
+            compress_min_size: Gzip response bodies of at least this many bytes when the client
+                accepts gzip, like ASF's response compression (None disables)
+        """
+        self.host = host
+        self.unix_socket = unix_socket
+        self.compress_min_size = compress_min_size
+        self.port = port
+        self.path = path.rstrip("/")
+        self.password = password
+        self.profile = profile or FaultProfile()
+        self.log_lines = log_lines
+        self.rng = random.Random(seed)
+        self.stats: Counter[str] = Counter()
+        self.process_start_time = _utc_now()
+        self.global_config = {"AutoRestart": True, "IPC": True, "UpdatePeriod": 24, "SteamOwnerID": 0}
+        names = bots if isinstance(bots, list) else [f"bot{index:05d}" for index in range(bots)]
+        self.bots: dict[str, SimulatedBot] = {
+            name: SimulatedBot(name, self.rng, inventory_size=inventory_size) for name in names
+        }
+        # Steam Guard codes are computed from the bots' shared secrets, registered on first use
+        self.steam_guard = SteamGuardGenerator()
+        self._server: asyncio.AbstractServer | None = None
+        self._routes = self._build_routes()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    async def start(self):
+        """Start listening; ``self.port`` is updated with the bound port"""
+        if self.unix_socket is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, self.unix_socket)
+            logger.info(f"ASF simulator listening on unix:{self.unix_socket} with {len(self.bots)} bots")
+            return
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"ASF simulator listening on http://{self.host}:{self.port} with {len(self.bots)} bots")
+
+    async def stop(self):
+        """Stop listening and close the server"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if self.unix_socket is not None:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(self.unix_socket)
+            logger.debug("ASF simulator stopped")
+
+    async def serve_forever(self):
+        """Start and serve until cancelled"""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    def connection_params(self) -> dict:
+        """
+        Get connection parameters as a dictionary for ASFConnector.
+
+        Returns:
+            dict: Connection parameters
+        """
+        params = {"host": self.host, "port": str(self.port), "path": self.path or "/"}
+        if self.password:
+            params["password"] = self.password
+        if self.unix_socket is not None:
+            params["socket_path"] = self.unix_socket
+        return params
+
+    def mutate(self, fraction: float = 0.1):
+        """
+        Randomly change the state of a fraction of the fleet (connectivity, pause state, farming progress).
+
+        Args:
+            fraction: Share of bots to change
+        """
+        for bot in self.rng.sample(list(self.bots.values()), int(len(self.bots) * fraction)):
+            roll = self.rng.random()
+            if roll < 0.3:
+                bot.online = not bot.online
+            elif roll < 0.5:
+                bot.paused = not bot.paused
+            elif bot.games_to_farm:
+                bot.games_to_farm[0]["CardsRemaining"] -= 1
+                bot.time_remaining = max(0, bot.time_remaining - 1800)
+                if bot.games_to_farm[0]["CardsRemaining"] <= 0:
+                    bot.games_to_farm.pop(0)
+                bot.games_farming = bot.games_to_farm[:1]
+
+    # Connection handling
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = await self._dispatch(writer, method, target, headers, body)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if not writer.is_closing():
+                writer.close()
+
+    async def _dispatch(self, writer, method: str, target: str, headers: dict, body: bytes) -> bool:
+        url = urlsplit(target)
+        path = unquote(url.path)
+        route_name, handler, arguments = self._match(method, path)
+        self.stats["requests"] += 1
+        self.stats[f"route:{route_name}"] += 1
+        profile = self.profile
+        inject = route_name != "HealthCheck" or profile.fault_health_check
+
+        if inject:
+            latency = profile.route_latency.get(route_name, profile.latency)
+            if latency is not None:
+                await asyncio.sleep(max(0.0, latency(self.rng)))
+            if profile.drop_rate and self.rng.random() < profile.drop_rate:
+                self.stats["dropped"] += 1
+                writer.transport.abort()
+                return False
+            status = self._roll_error()
+            if status is not None:
+                self.stats[f"status:{status}"] += 1
+                message = f"Simulated {_REASON_PHRASES.get(status, 'error')}"
+                await _write_response(writer, status, {"Success": False, "Message": message})
+                return True
+
+        if self.password and route_name != "HealthCheck" and headers.get("authentication") != self.password:
+            self.stats["status:401"] += 1
+            await _write_response(writer, 401, {"Success": False, "Message": "Unauthorized"})
+            return True
+
+        if handler is None:
+            status = 404 if route_name == "NotFound" else 405
+            self.stats[f"status:{status}"] += 1
+            await _write_response(writer, status, {"Success": False, "Message": _REASON_PHRASES[status]})
+            return True
+
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            await _write_response(writer, 400, {"Success": False, "Message": "Invalid JSON body"})
+            return True
+
+        try:
+            status, response = handler(payload, *arguments)
+        except Exception as ex:
+            logger.exception(ex)
+            status, response = 500, _failure(f"Simulator error: {ex}")
+        self.stats[f"status:{status}"] += 1
+        slow = inject and profile.slow_body_rate and self.rng.random() < profile.slow_body_rate
+        if slow:
+            self.stats["slow_bodies"] += 1
+            await _write_chunked_response(
+                writer, status, response, profile.slow_body_chunk_size, profile.slow_body_chunk_delay
+            )
+        else:
+            gzip_ok = self.compress_min_size is not None and "gzip" in headers.get("accept-encoding", "")
+            sent, compressed = await _write_response(
+                writer, status, response, self.compress_min_size if gzip_ok else None
+            )
+            self.stats["body_bytes"] += sent
+            self.stats["compressed"] += compressed
+        return True
+
+    def _roll_error(self) -> int | None:
+        if not self.profile.error_rates:
+            return None
+        roll = self.rng.random()
+        for status, rate in self.profile.error_rates.items():
+            if roll < rate:
+                return status
+            roll -= rate
+        return None
+
+    def _match(self, method: str, path: str):
+        allowed = False
+        for route_method, pattern, name, handler in self._routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if route_method == method:
+                return name, handler, match.groups()
+            allowed = True
+        if allowed:
+            return "MethodNotAllowed", None, ()
+        return "NotFound", None, ()
+
+    def _build_routes(self):
+        api = re.escape(self.path)
+        bot = rf"{api}/Bot/([^/]+)"
+        table = [
+            ("GET", r"/HealthCheck", "HealthCheck", self._health_check),
+            ("GET", rf"{api}/ASF", "ASF", self._asf_info),
+            ("POST", rf"{api}/ASF", "ASF.Update", self._asf_update_config),
+            ("POST", rf"{api}/ASF/Exit", "ASF.Exit", self._asf_ok),
+            ("POST", rf"{api}/ASF/Restart", "ASF.Restart", self._asf_restart),
+            ("POST", rf"{api}/ASF/Update", "ASF.UpdateVersion", self._asf_update),
+            ("POST", rf"{api}/ASF/Encrypt", "ASF.Encrypt", self._asf_encrypt),
+            ("POST", rf"{api}/ASF/Hash", "ASF.Hash", self._asf_hash),
+            ("GET", bot, "Bot", self._bot_info),
+            ("POST", bot, "Bot.Config", self._bot_update_config),
+            ("DELETE", bot, "Bot.Delete", self._bot_delete),
+            ("POST", rf"{bot}/Start", "Bot.Start", self._bot_start),
+            ("POST", rf"{bot}/Stop", "Bot.Stop", self._bot_stop),
+            ("POST", rf"{bot}/Pause", "Bot.Pause", self._bot_pause),
+            ("POST", rf"{bot}/Resume", "Bot.Resume", self._bot_resume),
+            ("POST", rf"{bot}/Redeem", "Bot.Redeem", self._bot_redeem),
+            ("POST", rf"{bot}/AddLicense", "Bot.AddLicense", self._bot_add_license),
+            ("GET", rf"{bot}/Inventory", "Bot.Inventory", self._bot_inventory),
+            ("GET", rf"{bot}/Inventory/(\d+)/(\d+)", "Bot.Inventory", self._bot_inventory),
+            ("POST", rf"{bot}/Input", "Bot.Input", self._bot_input),
+            ("POST", rf"{bot}/Rename", "Bot.Rename", self._bot_rename),
+            ("GET", rf"{bot}/GamesToRedeemInBackground", "Bot.GamesToRedeemInBackground", self._bot_background_get),
+            ("POST", rf"{bot}/GamesToRedeemInBackground", "Bot.GamesToRedeemInBackground", self._bot_background_add),
+            (
+                "DELETE",
+                rf"{bot}/GamesToRedeemInBackground",
+                "Bot.GamesToRedeemInBackground",
+                self._bot_background_delete,
+            ),
+            ("POST", rf"{bot}/RedeemPoints/(\d+)", "Bot.RedeemPoints", self._bot_redeem_points),
+            ("GET", rf"{bot}/TwoFactorAuthentication/Token", "Bot.TwoFactorAuthentication", self._bot_2fa_token),
+            ("POST", rf"{api}/Command", "Command", self._command),
+            ("GET", rf"{api}/NLog/File", "NLog.File", self._nlog_file),
+            ("GET", rf"{api}/Structure/([^/]+)", "Structure", self._structure),
+            ("GET", rf"{api}/Type/([^/]+)", "Type", self._type),
+        ]
+        return [(method, re.compile(pattern + "/?$"), name, handler) for method, pattern, name, handler in table]
+
+    # Helpers
+
+    def _select(self, bot_names: str) -> list[SimulatedBot]:
+        selected = []
+        for name in bot_names.split(","):
+            name = name.strip()
+            if name == "ASF":
+                return list(self.bots.values())
+            if name in self.bots:
+                selected.append(self.bots[name])
+        return selected
+
+    def _per_bot(self, bot_names: str, action: Callable[[SimulatedBot], object]):
+        bots = self._select(bot_names)
+        if not bots:
+            return 400, _failure(f"Couldn't find any bot named {bot_names}!")
+        return 200, _success({bot.name: action(bot) for bot in bots})
+
+    # ASF routes
+
+    def _health_check(self, payload):
+        return 200, {"Success": True, "Message": "OK"}
+
+    def _asf_info(self, payload):
+        return 200, _success(
+            {
+                "BuildVariant": "generic",
+                "CanUpdate": True,
+                "GlobalConfig": dict(self.global_config),
+                "MemoryUsage": 40_000 + len(self.bots) * 64,
+                "ProcessStartTime": self.process_start_time,
+                "Version": _ASF_VERSION,
+            }
+        )
+
+    def _asf_update_config(self, payload):
+        if not isinstance(payload, dict) or not isinstance(payload.get("GlobalConfig"), dict):
+            return 400, _failure("GlobalConfig is required")
+        self.global_config = dict(payload["GlobalConfig"])
+        self.stats["asf_restarts"] += 1
+        self.process_start_time = _utc_now()
+        return 200, _success(True)
+
+    def _asf_ok(self, payload):
+        return 200, _success(True)
+
+    def _asf_restart(self, payload):
+        self.stats["asf_restarts"] += 1
+        self.process_start_time = _utc_now()
+        return 200, _success(True)
+
+    def _asf_update(self, payload):
+        return 200, _success(_ASF_VERSION)
+
+    def _asf_encrypt(self, payload):
+        value = (payload or {}).get("StringToEncrypt")
+        if value is None:
+            return 400, _failure("StringToEncrypt is required")
+        return 200, _success(base64.b64encode(value.encode()).decode())
+
+    def _asf_hash(self, payload):
+        value = (payload or {}).get("StringToHash")
+        if value is None:
+            return 400, _failure("StringToHash is required")
+        return 200, _success(base64.b64encode(hashlib.sha256(value.encode()).digest()).decode())
+
+    # Bot routes
+
+    def _bot_info(self, payload, bot_names):
+        return self._per_bot(bot_names, lambda bot: bot.to_json())
+
+    def _bot_update_config(self, payload, bot_names):
+        if not isinstance(payload, dict) or not isinstance(payload.get("BotConfig"), dict):
+            return 400, _failure("BotConfig is required")
+        results = {}
+        for name in bot_names.split(","):
+            bot = self.bots.get(name)
+            if bot is None:
+                bot = self.bots[name] = SimulatedBot(name, self.rng)
+            bot.config = dict(payload["BotConfig"])
+            self.stats["bot_restarts"] += 1
+            results[name] = True
+        return 200, _success(results)
+
+    def _bot_delete(self, payload, bot_names):
+        bots = self._select(bot_names)
+        if not bots:
+            return 400, _failure(f"Couldn't find any bot named {bot_names}!")
+        for bot in bots:
+            del self.bots[bot.name]
+            self.steam_guard.remove(bot.name)
+        return 200, _success(True)
+
+    def _bot_start(self, payload, bot_names):
+        return self._per_bot(bot_names, lambda bot: _set(bot, "online", True))
+
+    def _bot_stop(self, payload, bot_names):
+        return self._per_bot(bot_names, lambda bot: _set(bot, "online", False))
+
+    def _bot_pause(self, payload, bot_names):
+        return self._per_bot(bot_names, lambda bot: _set(bot, "paused", True))
+
+    def _bot_resume(self, payload, bot_names):
+        return self._per_bot(bot_names, lambda bot: _set(bot, "paused", False))
+
+    def _bot_redeem(self, payload, bot_names):
+        keys = (payload or {}).get("KeysToRedeem")
+        if not keys:
+            return 400, _failure("KeysToRedeem is required")
+        redeemed_anywhere = set().union(*(bot.redeemed_keys for bot in self.bots.values()))
+        return self._per_bot(bot_names, lambda bot: self._redeem_keys(bot, keys, redeemed_anywhere))
+
+    def _redeem_keys(self, bot: SimulatedBot, keys: list[str], redeemed_anywhere: set[str]):
+        results = {}
+        for key in keys:
+            if not bot.online:
+                results[key] = None
+                continue
+            if self.profile.rate_limit_rate and self.rng.random() < self.profile.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                detail = "RateLimited"
+            elif not _KEY_PATTERN.match(key):
+                detail = "BadActivationCode"
+            elif key in bot.redeemed_keys:
+                detail = "AlreadyPurchased"
+            elif key in redeemed_anywhere:
+                detail = "DuplicateActivationCode"
+            else:
+                detail = "NoDetail"
+                bot.redeemed_keys.add(key)
+                redeemed_anywhere.add(key)
+            results[key] = {
+                "Result": _RESULT_CODES["OK"] if detail == "NoDetail" else _RESULT_CODES["Fail"],
+                "PurchaseResultDetail": _DETAIL_CODES[detail],
+            }
+        return results
+
+    def _bot_add_license(self, payload, bot_names):
+        licenses = (payload or {}).get("Licenses") or []
+        return self._per_bot(bot_names, lambda bot: {str(license_id): "OK" for license_id in licenses})
+
+    def _bot_inventory(self, payload, bot_names, app_id=None, context_id=None):
+        app_id = int(app_id) if app_id is not None else None
+        context_id = int(context_id) if context_id is not None else None
+        return self._per_bot(bot_names, lambda bot: bot.inventory_json(app_id, context_id))
+
+    def _bot_input(self, payload, bot_names):
+        if not isinstance(payload, dict) or "Type" not in payload:
+            return 400, _failure("Type is required")
+        bots = self._select(bot_names)
+        if not bots:
+            return 400, _failure(f"Couldn't find any bot named {bot_names}!")
+        return 200, _success(True)
+
+    def _bot_rename(self, payload, bot_name):
+        new_name = (payload or {}).get("NewName")
+        if not new_name or bot_name not in self.bots or new_name in self.bots:
+            return 400, _failure(f"Couldn't rename {bot_name}!")
+        bot = self.bots.pop(bot_name)
+        bot.name = new_name
+        self.bots[new_name] = bot
+        return 200, _success(True)
+
+    def _bot_background_get(self, payload, bot_names):
+        return self._per_bot(bot_names, lambda bot: {"UnusedKeys": dict(bot.background_keys), "UsedKeys": {}})
+
+    def _bot_background_add(self, payload, bot_names):
+        games = (payload or {}).get("GamesToRedeemInBackground")
+        if not isinstance(games, dict):
+            return 400, _failure("GamesToRedeemInBackground is required")
+        bots = self._select(bot_names)
+        if not bots:
+            return 400, _failure(f"Couldn't find any bot named {bot_names}!")
+        for bot in bots:
+            bot.background_keys.update(games)
+        return 200, _success(games)
+
+    def _bot_background_delete(self, payload, bot_names):
+        return self._per_bot(bot_names, lambda bot: _clear(bot.background_keys))
+
+    def _bot_redeem_points(self, payload, bot_names, definition_id):
+        return self._per_bot(bot_names, lambda bot: "OK" if bot.online else "NoConnection")
+
+    def _bot_2fa_token(self, payload, bot_names):
+        bots = self._select(bot_names)
+        unknown = {bot.name: bot.shared_secret for bot in bots if bot.name not in self.steam_guard}
+        if unknown:
+            self.steam_guard.add_secrets(unknown)
+        codes = self.steam_guard.generate_many([bot.name for bot in bots])
+        return self._per_bot(bot_names, lambda bot: {"Success": True, "Message": "OK", "Result": codes[bot.name]})
+
+    # Other routes
+
+    def _command(self, payload):
+        command = (payload or {}).get("Command")
+        if not command:
+            return 400, _failure("Command is required")
+        parts = command.lstrip("!").split()
+        name = parts[0].lower()
+        if name == "version":
+            return 200, _success(f"<ASF> ASF V{_ASF_VERSION}")
+        targets = self._select(parts[1]) if len(parts) > 1 else list(self.bots.values())[:1]
+        if not targets:
+            return 200, _success("Couldn't find any bot named " + (parts[1] if len(parts) > 1 else "") + "!")
+        lines = [f"<{bot.name}> {self._command_line(name, bot, parts[2:])}" for bot in targets]
+        return 200, _success("\n".join(lines))
+
+    def _command_line(self, name: str, bot: SimulatedBot, arguments: list[str]) -> str:
+        if not bot.online and name not in {"start", "status"}:
+            return "This bot instance is not connected!"
+        if name == "status":
+            if not bot.online:
+                return "Bot is not running."
+            if bot.games_farming:
+                game = bot.games_farming[0]
+                return f"Bot is farming game {game['AppID']} ({game['GameName']})."
+            return "Bot is not farming anything."
+        if name == "level":
+            return f"Your Steam account level is {bot.steam_id % 100}."
+        if name == "balance":
+            return f"Wallet balance: {bot.steam_id % 10_000 / 100:.2f} USD."
+        if name == "owns":
+            query = arguments[0] if arguments else ""
+            return f"Not owned yet: {query}"
+        if name in {"start", "stop", "pause", "resume"}:
+            return "Done!"
+        return "Unknown command!"
+
+    def _nlog_file(self, payload):
+        lines = [
+            f"{self.process_start_time}|ArchiSteamFarm-{index}|INFO|ASF|Simulated log line {index}"
+            for index in range(self.log_lines)
+        ]
+        return 200, _success(lines)
+
+    def _structure(self, payload, structure_name):
+        if structure_name.endswith("GlobalConfig"):
+            return 200, _success(dict(self.global_config))
+        if structure_name.endswith("BotConfig"):
+            return 200, _success({"Enabled": False, "Paused": False})
+        return 400, _failure(f"Couldn't find structure {structure_name}")
+
+    def _type(self, payload, type_name):
+        if not type_name.startswith("ArchiSteamFarm."):
+            return 400, _failure(f"Couldn't find type {type_name}")
+        return 200, _success({"Body": {}, "Properties": {"BaseType": "System.Object", "CustomAttributes": []}})
+
+
+def _set(bot: SimulatedBot, attribute: str, value) -> bool:
+    setattr(bot, attribute, value)
+    return True
+
+
+def _clear(mapping: dict) -> bool:
+    mapping.clear()
+    return True
+
+
+def _success(result) -> dict:
+    return {"Message": "OK", "Success": True, "Result": result}
+
+
+def _failure(message: str) -> dict:
+    return {"Message": message, "Success": False}
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _format_timespan(seconds: int) -> str:
+    days, remainder = divmod(int(seconds), 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    prefix = f"{days}." if days else ""
+    return f"{prefix}{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def _status_line(status: int) -> bytes:
+    return f"HTTP/1.1 {status} {_REASON_PHRASES.get(status, 'Unknown')}\r\n".encode()
+
+
+async def _write_response(
+    writer: asyncio.StreamWriter, status: int, payload: dict, gzip_min_size: int | None = None
+) -> tuple[int, bool]:
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    encoding = ""
+    compressed = gzip_min_size is not None and len(body) >= gzip_min_size
+    if compressed:
+        body = gzip.compress(body, compresslevel=5)
+        encoding = "Content-Encoding: gzip\r\n"
+    head = (
+        _status_line(status)
+        + (f"Content-Type: application/json; charset=utf-8\r\n{encoding}Content-Length: {len(body)}\r\n\r\n").encode()
+    )
+    writer.write(head + body)
+    await writer.drain()
+    return len(body), compressed
+
+
+async def _write_chunked_response(
+    writer: asyncio.StreamWriter, status: int, payload: dict, chunk_size: int, chunk_delay: float
+):
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    writer.write(_status_line(status) + b"Content-Type: application/json; charset=utf-8\r\n")
+    writer.write(b"Transfer-Encoding: chunked\r\n\r\n")
+    for start in range(0, len(body), chunk_size):
+        chunk = body[start : start + chunk_size]
+        writer.write(f"{len(chunk):X}\r\n".encode() + chunk + b"\r\n")
+        await writer.drain()
+        await asyncio.sleep(chunk_delay)
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+def main(argv: list[str] | None = None):
+    """Run the simulator as a standalone ASF stand-in"""
+    parser = argparse.ArgumentParser(prog="python -m ASFConnector.simulator", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1242)
+    parser.add_argument("--path", default="/Api")
+    parser.add_argument("--unix-socket", default=None, help="Listen on a Unix domain socket instead of host and port")
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--bots", type=int, default=100)
+    parser.add_argument("--inventory-size", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--latency", type=parse_latency, default=None, help="e.g. lognormal:0.01,0.8")
+    parser.add_argument(
+        "--error-rate",
+        action="append",
+        default=[],
+        metavar="STATUS=RATE",
+        help="Inject HTTP errors, e.g. 404=0.01 (repeatable)",
+    )
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--slow-body-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    error_rates = {}
+    for item in args.error_rate:
+        status, _, rate = item.partition("=")
+        error_rates[int(status)] = float(rate)
+    profile = FaultProfile(
+        latency=args.latency,
+        error_rates=error_rates,
+        drop_rate=args.drop_rate,
+        slow_body_rate=args.slow_body_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    simulator = ASFSimulator(
+        bots=args.bots,
+        password=args.password,
+        profile=profile,
+        host=args.host,
+        port=args.port,
+        path=args.path,
+        inventory_size=args.inventory_size,
+        seed=args.seed,
+        unix_socket=args.unix_socket,
+    )
+    try:
+        asyncio.run(simulator.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+Steam Guard token helpers.
+
+A Steam Guard code stays valid for a 30-second window. ``TokenCache`` keeps the
+codes returned by ``TwoFactorAuthenticationController.get_token`` until their
+window ends and, when prefetching is enabled, fetches the codes of the whole
+fleet in one request as soon as a new window starts. ``SteamGuardGenerator``
+computes the codes locally from shared secrets and falls back to IPC for bots
+whose secrets are unknown.
+"""
+
+import asyncio
+import base64
+from collections.abc import Callable, Iterable
+import hashlib
+import hmac
+import struct
+import time
+
+from loguru import logger
+
+from .error import ASFConnectorError
+
+STEAM_GUARD_PERIOD = 30
+STEAM_GUARD_ALPHABET = "23456789BCDFGHJKMNPQRTVWXY"
+
+
+def token_window(timestamp: float) -> int:
+    """Number of the 30-second Steam Guard window containing ``timestamp``"""
+    return int(timestamp) // STEAM_GUARD_PERIOD
+
+
+def _token_entry(code: str) -> dict:
+    return {"Success": True, "Message": "OK", "Result": code}
+
+
+def _code_from_digest(digest: bytes) -> str:
+    offset = digest[-1] & 0x0F
+    value = struct.unpack(">I", digest[offset : offset + 4])[0] & 0x7FFFFFFF
+    code = []
+    for _ in range(5):
+        value, index = divmod(value, len(STEAM_GUARD_ALPHABET))
+        code.append(STEAM_GUARD_ALPHABET[index])
+    return "".join(code)
+
+
+def steam_guard_code(shared_secret: str | bytes, timestamp: float | None = None) -> str:
+    """
+    Compute a Steam Guard code the way the Steam mobile authenticator does.
+
+    Args:
+        shared_secret: Base64 encoded shared secret (or its raw bytes)
+        timestamp: Unix time, defaults to now
+
+    Returns:
+        str: Five character code
+    """
+    key = base64.b64decode(shared_secret) if isinstance(shared_secret, str) else shared_secret
+    counter = struct.pack(">Q", token_window(time.time() if timestamp is None else timestamp))
+    return _code_from_digest(hmac.new(key, counter, hashlib.sha1).digest())
+
+
+class TokenCache:
+    """
+    Per-window cache of 2FA tokens.
+
+    Codes are stored with the window they were fetched in and served from memory
+    until that window ends. A fetch that straddles a window boundary is not
+    cached, because it is unknown which window ASF computed the code for.
+
+    Usage:
+        cache = connector.twofa.enable_cache(prefetch=True)
+        tokens = await connector.twofa.get_token("bot1")  # served from memory within the window
+    """
+
+    def __init__(self, fetch: Callable, prefetch: bool = False, prefetch_delay: float = 0.5, clock=time.time):
+        """
+        Initialize the cache
+
+        Args:
+            fetch: Coroutine function fetching tokens for bot names, e.g. an uncached get_token
+            prefetch: Fetch all bots' tokens at the start of every window while started
+            prefetch_delay: Seconds after a window boundary before prefetching, covering clock skew with ASF
+            clock: Wall clock returning Unix time, the base of Steam Guard windows
+        """
+        self.fetch = fetch
+        self.prefetch = prefetch
+        self.prefetch_delay = prefetch_delay
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.prefetches = 0
+        # Bot name -> (window, code)
+        self._codes: dict[str, tuple[int, str]] = {}
+        # Window in which every bot of the fleet was fetched with "ASF"
+        self._fleet_window: int | None = None
+        # (window, requested names) -> fetch in flight, shared by concurrent misses for the same names
+        self._inflight: dict[tuple[int, object], asyncio.Future] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _cached(self, names: list[str], window: int) -> dict[str, str] | None:
+        codes = {}
+        for name in names:
+            entry = self._codes.get(name)
+            if entry is None or entry[0] != window:
+                return None
+            codes[name] = entry[1]
+        return codes
+
+    def _lookup(self, bot_names: str, window: int) -> dict[str, str] | None:
+        if bot_names == "ASF":
+            if self._fleet_window != window:
+                return None
+            return {name: code for name, (entry_window, code) in self._codes.items() if entry_window == window}
+        return self._cached([name.strip() for name in bot_names.split(",")], window)
+
+    async def _fetch_and_store(self, bot_names: str) -> dict:
+        started = token_window(self.clock())
+        response = await self.fetch(bot_names)
+        finished = token_window(self.clock())
+        if started != finished or not response.get("Success"):
+            return response
+        for name, entry in (response.get("Result") or {}).items():
+            if isinstance(entry, dict) and entry.get("Success") and entry.get("Result"):
+                self._codes[name] = (finished, entry["Result"])
+        if bot_names == "ASF":
+            self._fleet_window = finished
+            # Drop bots that are no longer part of the fleet
+            for name in [name for name, (window, _) in self._codes.items() if window != finished]:
+                del self._codes[name]
+        return response
+
+    def _shared_fetch(self, bot_names: str, window: int) -> tuple[asyncio.Future, bool]:
+        """
+        Get the fetch in flight for these names in this window, starting one if there is none.
+
+        Checking and installing happen without awaiting, so no lock is needed and
+        misses for unrelated bots never wait for each other.
+
+        Returns:
+            tuple: (future of the response, whether this call started it)
+        """
+        names = "ASF" if bot_names == "ASF" else frozenset(name.strip() for name in bot_names.split(","))
+        key = (window, names)
+        future = self._inflight.get(key)
+        if future is not None:
+            return future, False
+        future = self._inflight[key] = asyncio.ensure_future(self._fetch_and_store(bot_names))
+
+        def done(finished: asyncio.Future):
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+            if not finished.cancelled():
+                # Retrieved here so a failure is not reported as unhandled when every waiter was cancelled
+                finished.exception()
+
+        future.add_done_callback(done)
+        return future, True
+
+    async def get(self, bot_names: str) -> dict:
+        """
+        Get tokens in the shape of get_token(), from memory when the current window is cached.
+
+        Args:
+            bot_names: Bot name(s), can use ASF for all bots
+
+        Returns:
+            dict: API response with 2FA tokens
+        """
+        window = token_window(self.clock())
+        codes = self._lookup(bot_names, window)
+        fleet = self._inflight.get((window, "ASF"))
+        if codes is None and fleet is not None and bot_names != "ASF":
+            # A fleet prefetch of this window is in flight and likely covers these bots
+            await asyncio.wait([fleet])
+            codes = self._lookup(bot_names, window)
+        if codes is None:
+            future, started = self._shared_fetch(bot_names, window)
+            if started:
+                self.misses += 1
+            else:
+                self.hits += 1
+            # Shielded so a cancelled caller does not cancel the fetch other callers wait for
+            return await asyncio.shield(future)
+        self.hits += 1
+        return {"Success": True, "Message": "OK", "Result": {name: _token_entry(code) for name, code in codes.items()}}
+
+    def invalidate(self):
+        """Forget all cached tokens"""
+        self._codes.clear()
+        self._fleet_window = None
+
+    async def prefetch_once(self):
+        """Fetch the tokens of every bot with a single /Bot/ASF request"""
+        self.prefetches += 1
+        future, _ = self._shared_fetch("ASF", token_window(self.clock()))
+        await asyncio.shield(future)
+
+    def start(self):
+        """Start prefetching at every window boundary in the running event loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+            logger.debug("2FA token prefetch started")
+
+    async def stop(self):
+        """Stop prefetching"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.debug("2FA token prefetch stopped")
+
+    async def _run(self):
+        while True:
+            now = self.clock()
+            if self._fleet_window != token_window(now):
+                try:
+                    await self.prefetch_once()
+                except ASFConnectorError as ex:
+                    logger.warning(f"2FA token prefetch failed: {ex}")
+            now = self.clock()
+            next_window = (token_window(now) + 1) * STEAM_GUARD_PERIOD
+            await asyncio.sleep(next_window - now + self.prefetch_delay)
+
+
+class SteamGuardGenerator:
+    """
+    Local Steam Guard code generator with an IPC fallback.
+
+    HMAC keys are prepared once per bot, so each code costs a single SHA-1
+    round over the window counter; codes of a window are computed once and
+    reused until the window ends.
+
+    Usage:
+        generator = connector.twofa.enable_local_generator({"bot1": "base64secret=="})
+        tokens = await connector.twofa.get_token("bot1,bot2")  # bot2 is fetched from ASF
+    """
+
+    def __init__(
+        self,
+        secrets: dict[str, str | bytes] | None = None,
+        fallback: Callable | None = None,
+        clock=time.time,
+    ):
+        """
+        Initialize the generator
+
+        Args:
+            secrets: Bot name -> base64 encoded shared secret
+            fallback: Coroutine function fetching tokens for bot names not held locally, e.g. get_token
+            clock: Clock returning Steam time in Unix seconds; wrap time.time to apply a server offset
+        """
+        self.fallback = fallback
+        self.clock = clock
+        self._keys: dict[str, object] = {}
+        # Codes of the window generated last, by bot name
+        self._window: int | None = None
+        self._codes: dict[str, str] = {}
+        self.add_secrets(secrets or {})
+
+    def __contains__(self, bot_name: str) -> bool:
+        return bot_name in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def bots(self) -> list[str]:
+        """Names of bots with a known shared secret"""
+        return list(self._keys)
+
+    def add_secrets(self, secrets: dict[str, str | bytes]):
+        """
+        Register or replace shared secrets.
+
+        Raises:
+            ValueError: If a secret is not valid base64
+        """
+        for name, secret in secrets.items():
+            try:
+                key = base64.b64decode(secret, validate=True) if isinstance(secret, str) else secret
+            except ValueError as ex:
+                raise ValueError(f"Shared secret of bot {name} is not valid base64") from ex
+            self._keys[name] = hmac.new(key, digestmod=hashlib.sha1)
+            self._codes.pop(name, None)
+
+    def remove(self, bot_name: str):
+        """Forget the shared secret of a bot"""
+        self._keys.pop(bot_name, None)
+        self._codes.pop(bot_name, None)
+
+    def _code(self, name: str, window: int) -> str:
+        mac = self._keys[name].copy()
+        mac.update(struct.pack(">Q", window))
+        return _code_from_digest(mac.digest())
+
+    def generate(self, bot_name: str, timestamp: float | None = None) -> str:
+        """
+        Compute the code of one bot.
+
+        Args:
+            bot_name: Bot with a known shared secret
+            timestamp: Unix time, defaults to the generator clock
+
+        Returns:
+            str: Five character code
+
+        Raises:
+            KeyError: If the bot's shared secret is unknown
+        """
+        return self.generate_many([bot_name], timestamp)[bot_name]
+
+    def generate_many(self, bot_names: Iterable[str] | None = None, timestamp: float | None = None) -> dict[str, str]:
+        """
+        Compute codes for many bots at once.
+
+        Args:
+            bot_names: Bots with known shared secrets, all known bots if None
+            timestamp: Unix time, defaults to the generator clock
+
+        Returns:
+            dict: Bot name -> code
+
+        Raises:
+            KeyError: If a bot's shared secret is unknown
+        """
+        window = token_window(self.clock() if timestamp is None else timestamp)
+        names = self._keys if bot_names is None else bot_names
+        if timestamp is not None and window != self._window:
+            return {name: self._code(name, window) for name in names}
+        if window != self._window:
+            self._window = window
+            self._codes = {}
+        codes = self._codes
+        result = {}
+        for name in names:
+            code = codes.get(name)
+            if code is None:
+                code = codes[name] = self._code(name, window)
+            result[name] = code
+        return result
+
+    async def get_token(self, bot_names: str) -> dict:
+        """
+        Get tokens in the shape of TwoFactorAuthenticationController.get_token().
+
+        Bots with known secrets are computed locally; the others are fetched
+        through the fallback in a single request. "ASF" goes to the fallback
+        when there is one, since only ASF knows the whole fleet, and otherwise
+        covers every locally known bot.
+
+        Args:
+            bot_names: Bot name(s), can use ASF for all bots
+
+        Returns:
+            dict: API response with 2FA tokens
+        """
+        if bot_names == "ASF":
+            if self.fallback is not None:
+                response = await self.fallback("ASF")
+                if response.get("Success") and isinstance(response.get("Result"), dict):
+                    # The fallback's response may be shared with other waiters and the token cache, never modify it
+                    local = self.generate_many(name for name in response["Result"] if name in self._keys)
+                    response = {
+                        **response,
+                        "Result": {**response["Result"], **{name: _token_entry(code) for name, code in local.items()}},
+                    }
+                return response
+            names = self.bots
+        else:
+            names = [name.strip() for name in bot_names.split(",")]
+        local = [name for name in names if name in self._keys]
+        remote = [name for name in names if name not in self._keys]
+        results = {name: _token_entry(code) for name, code in self.generate_many(local).items()}
+        if remote:
+            if self.fallback is None:
+                for name in remote:
+                    results[name] = {"Success": False, "Message": f"No shared secret for bot {name}", "Result": None}
+            else:
+                response = await self.fallback(",".join(remote))
+                if not results:
+                    return response
+                if response.get("Success"):
+                    results.update(response.get("Result") or {})
+                else:
+                    message = response.get("Message") or "Fetching tokens failed"
+                    for name in remote:
+                        results[name] = {"Success": False, "Message": message, "Result": None}
+        return {"Success": True, "Message": "OK", "Result": {name: results[name] for name in names if name in results}}
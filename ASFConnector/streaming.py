@@ -0,0 +1,293 @@
+"""
+Incremental JSON decoding for large IPC responses.
+
+``JSONStreamParser`` consumes a JSON document chunk by chunk and emits only the
+values found at selected paths, so a response such as a fleet-wide inventory
+can be processed item by item without ever holding the whole document.
+Matched values are decoded with the C-accelerated ``json`` decoder; everything
+else is skipped without being materialized.
+"""
+
+import codecs
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+import json
+from json.decoder import scanstring
+import re
+
+WILDCARD = "*"
+
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+_SKIP_RE = re.compile(r'["{}\[\]]')
+_STRING_END_RE = re.compile(r'["\\]')
+# Characters that may continue a number, e.g. "0." or "1e" split before the fraction or exponent
+_NUMBER_TAIL_RE = re.compile(r"[-+.eE0-9]*")
+
+# Parser states
+_VALUE = 0  # expecting a value
+_OBJECT_FIRST = 1  # after "{": key or "}"
+_OBJECT_KEY = 2  # after "," in an object: key
+_COLON = 3  # after a key
+_AFTER_VALUE = 4  # "," or closing bracket
+_ARRAY_FIRST = 5  # after "[": value or "]"
+_SKIP = 6  # skipping an unwanted container
+
+
+class JSONStreamParser:
+    """
+    Push parser emitting ``(path, value)`` pairs for values whose path matches a pattern.
+
+    A path is a tuple of object keys and array indices from the document root.
+    Patterns are tuples of the same shape where ``"*"`` matches any key or index.
+
+    Example:
+        parser = JSONStreamParser([("Result", "*", "Assets", "*")])
+        for chunk in chunks:
+            for path, asset in parser.feed(chunk):
+                ...
+        parser.close()
+    """
+
+    def __init__(self, patterns: Iterable[tuple], trim_threshold: int = 65536):
+        """
+        Initialize the parser
+
+        Args:
+            patterns: Paths of values to emit, "*" matches any key or index
+            trim_threshold: Consumed characters kept before compacting the buffer
+        """
+        self.patterns = [tuple(pattern) for pattern in patterns]
+        if not self.patterns:
+            raise ValueError("At least one pattern is required")
+        self.trim_threshold = trim_threshold
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._retry_at = 0
+        self._stack: list[list] = []
+        self._state = _VALUE
+        self._skip_depth = 0
+        self._skip_in_string = False
+        self._skip_escape = False
+        self._eof = False
+        self._done = False
+
+    @property
+    def buffered(self) -> int:
+        """Number of characters currently held in the buffer"""
+        return len(self._buffer)
+
+    def feed(self, data: bytes | str) -> list[tuple[tuple, object]]:
+        """
+        Consume the next chunk of the document.
+
+        Args:
+            data: Raw bytes (UTF-8) or already decoded text
+
+        Returns:
+            list: (path, value) pairs completed by this chunk
+        """
+        text = self._utf8.decode(data) if isinstance(data, bytes) else data
+        if self._pos >= self.trim_threshold:
+            self._buffer = self._buffer[self._pos :]
+            self._retry_at = max(0, self._retry_at - self._pos)
+            self._pos = 0
+        self._buffer += text
+        return self._parse()
+
+    def close(self) -> list[tuple[tuple, object]]:
+        """
+        Signal the end of the document.
+
+        Returns:
+            list: (path, value) pairs completed by the remaining buffer
+
+        Raises:
+            ValueError: If the document is incomplete or malformed
+        """
+        self._buffer += self._utf8.decode(b"", final=True)
+        self._eof = True
+        items = self._parse()
+        if not self._done:
+            raise ValueError("Incomplete JSON document")
+        return items
+
+    def _matches(self, path: tuple) -> bool:
+        for pattern in self.patterns:
+            if len(pattern) == len(path) and all(p == WILDCARD or p == k for p, k in zip(pattern, path)):
+                return True
+        return False
+
+    def _is_prefix(self, path: tuple) -> bool:
+        for pattern in self.patterns:
+            if len(pattern) > len(path) and all(p == WILDCARD or p == k for p, k in zip(pattern, path)):
+                return True
+        return False
+
+    def _decode(self, buffer: str, pos: int):
+        if not self._eof and len(buffer) < self._retry_at:
+            return None, None
+        try:
+            value, end = _DECODER.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise ValueError(f"Incomplete or malformed JSON value at offset {pos}") from None
+            # Wait until the pending segment doubled before retrying, keeping large items linear
+            self._retry_at = len(buffer) + max(len(buffer) - pos, 64)
+            return None, None
+        if not self._eof and isinstance(value, (int, float)) and _NUMBER_TAIL_RE.fullmatch(buffer, end):
+            # A number followed by nothing but number characters may continue in the next chunk
+            self._retry_at = len(buffer) + 1
+            return None, None
+        self._retry_at = 0
+        return value, end
+
+    def _skip(self, buffer: str, pos: int, length: int) -> int:
+        if self._skip_escape:
+            self._skip_escape = False
+            pos += 1
+        while pos < length:
+            if self._skip_in_string:
+                match = _STRING_END_RE.search(buffer, pos)
+                if match is None:
+                    return length
+                if match.group() == "\\":
+                    if match.end() >= length:
+                        self._skip_escape = True
+                        return length
+                    pos = match.end() + 1
+                    continue
+                self._skip_in_string = False
+                pos = match.end()
+                continue
+            match = _SKIP_RE.search(buffer, pos)
+            if match is None:
+                return length
+            pos = match.end()
+            char = match.group()
+            if char == '"':
+                self._skip_in_string = True
+            elif char in "{[":
+                self._skip_depth += 1
+            else:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._state = _AFTER_VALUE
+                    return pos
+        return pos
+
+    def _parse(self) -> list[tuple[tuple, object]]:
+        items = []
+        buffer = self._buffer
+        length = len(buffer)
+        pos = self._pos
+        stack = self._stack
+        while True:
+            if self._state == _SKIP:
+                pos = self._skip(buffer, pos, length)
+                if self._state == _SKIP:
+                    break
+            while pos < length and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= length:
+                break
+            if self._done:
+                raise ValueError(f"Unexpected data after JSON document at offset {pos}")
+            char = buffer[pos]
+            state = self._state
+
+            if state == _OBJECT_FIRST or state == _OBJECT_KEY:
+                if char == "}" and state == _OBJECT_FIRST:
+                    stack.pop()
+                    pos += 1
+                    self._state = _AFTER_VALUE
+                    continue
+                if char != '"':
+                    raise ValueError(f"Expected object key at offset {pos}")
+                try:
+                    key, end = scanstring(buffer, pos + 1)
+                except json.JSONDecodeError:
+                    if self._eof:
+                        raise ValueError(f"Unterminated object key at offset {pos}") from None
+                    break
+                stack[-1][1] = key
+                pos = end
+                self._state = _COLON
+
+            elif state == _COLON:
+                if char != ":":
+                    raise ValueError(f"Expected ':' at offset {pos}")
+                pos += 1
+                self._state = _VALUE
+
+            elif state == _AFTER_VALUE:
+                if not stack:
+                    self._done = True
+                    continue
+                top = stack[-1]
+                if char == ",":
+                    pos += 1
+                    if top[0]:
+                        self._state = _OBJECT_KEY
+                    else:
+                        top[1] += 1
+                        self._state = _VALUE
+                elif (char == "}" and top[0]) or (char == "]" and not top[0]):
+                    stack.pop()
+                    pos += 1
+                else:
+                    raise ValueError(f"Unexpected {char!r} at offset {pos}")
+
+            else:
+                if state == _ARRAY_FIRST and char == "]":
+                    stack.pop()
+                    pos += 1
+                    self._state = _AFTER_VALUE
+                    continue
+                path = tuple(frame[1] for frame in stack)
+                if self._matches(path):
+                    value, end = self._decode(buffer, pos)
+                    if end is None:
+                        break
+                    items.append((path, value))
+                    pos = end
+                    self._state = _AFTER_VALUE
+                elif char in "{[" and self._is_prefix(path):
+                    is_object = char == "{"
+                    stack.append([is_object, None if is_object else 0])
+                    pos += 1
+                    self._state = _OBJECT_FIRST if is_object else _ARRAY_FIRST
+                elif char in "{[":
+                    self._skip_depth = 1
+                    self._skip_in_string = False
+                    pos += 1
+                    self._state = _SKIP
+                else:
+                    value, end = self._decode(buffer, pos)
+                    if end is None:
+                        break
+                    pos = end
+                    self._state = _AFTER_VALUE
+        if self._eof and not stack and self._state == _AFTER_VALUE:
+            self._done = True
+        self._pos = pos
+        return items
+
+
+async def iter_json_paths(chunks: AsyncIterable[bytes], patterns: Iterable[tuple]) -> AsyncIterator[tuple]:
+    """
+    Decode an asynchronous stream of JSON chunks and yield matching values as they complete.
+
+    Args:
+        chunks: Async iterable of raw body chunks
+        patterns: Paths of values to yield, "*" matches any key or index
+
+    Yields:
+        tuple: (path, value) for every matching value
+    """
+    parser = JSONStreamParser(patterns)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
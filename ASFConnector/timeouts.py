@@ -0,0 +1,175 @@
+"""
+Per-call deadlines and adaptive request timeouts.
+
+``deadline()`` sets an absolute deadline for every request made inside the
+block; nested deadlines can only shorten it. ``LatencyTracker`` records
+per-endpoint latencies so ``IPCProtocolHandler`` can derive a timeout from an
+endpoint's observed percentile instead of one shared default.
+"""
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import re
+import time
+
+_deadline: ContextVar[float | None] = ContextVar("asfc_deadline", default=None)
+
+_ENDPOINT_PATTERNS = (
+    (re.compile(r"^/Bot/[^/]+"), "/Bot/*"),
+    (re.compile(r"^/(Type|Structure)/.+"), r"/\1/*"),
+    (re.compile(r"/\d+(?=/|$)"), "/*"),
+)
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[float | None]:
+    """
+    Limit the total time of all requests made inside the block.
+
+    Args:
+        seconds: Time budget from now; None leaves any enclosing deadline unchanged
+
+    Example:
+        with deadline(2.0):
+            info = await connector.bot.get_info("ASF")
+            token = await connector.twofa.get_token("bot1")
+    """
+    if seconds is None:
+        yield remaining()
+        return
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None and current < expires_at:
+        expires_at = current
+    token = _deadline.set(expires_at)
+    try:
+        yield seconds
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left until the active deadline, or None if there is none"""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def endpoint_key(resource: str) -> str:
+    """
+    Normalize a resource path to its endpoint, e.g. "/Bot/bot1/Inventory/753/6" -> "/Bot/*/Inventory/*/*".
+
+    Args:
+        resource: API resource path
+
+    Returns:
+        str: Endpoint key with bot names, type names and numeric ids replaced by "*"
+    """
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        resource = pattern.sub(replacement, resource)
+    return resource
+
+
+class LatencyTracker:
+    """
+    Sliding window of request latencies per endpoint with percentile-based timeouts.
+
+    The adaptive timeout of an endpoint is its ``percentile`` latency times
+    ``multiplier``, clamped to ``[min_timeout, max_timeout]``. Endpoints with
+    fewer than ``min_samples`` observations get no adaptive timeout.
+    """
+
+    def __init__(
+        self,
+        window: int = 200,
+        percentile: float = 0.99,
+        multiplier: float = 3.0,
+        min_timeout: float = 1.0,
+        max_timeout: float = 120.0,
+        min_samples: int = 20,
+    ):
+        """
+        Initialize the tracker
+
+        Args:
+            window: Latencies kept per endpoint
+            percentile: Percentile in (0, 1] the timeout is derived from
+            multiplier: Factor applied to the percentile latency
+            min_timeout: Lower bound of adaptive timeouts in seconds
+            max_timeout: Upper bound of adaptive timeouts in seconds
+            min_samples: Observations needed before an endpoint gets an adaptive timeout
+        """
+        if not 0 < percentile <= 1:
+            raise ValueError(f"Percentile must be in (0, 1], got {percentile}")
+        if not 0 < min_timeout <= max_timeout:
+            raise ValueError("Timeouts must satisfy 0 < min_timeout <= max_timeout")
+        self.window = window
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = max(1, min_samples)
+        self._samples: dict[str, deque] = {}
+        # Endpoint -> (number of samples recorded when computed, timeout)
+        self._timeouts: dict[str, tuple[int, float]] = {}
+        self._recorded: dict[str, int] = {}
+
+    def record(self, endpoint: str, latency: float):
+        """Record the latency of a completed request"""
+        samples = self._samples.get(endpoint)
+        if samples is None:
+            samples = self._samples[endpoint] = deque(maxlen=self.window)
+        samples.append(latency)
+        self._recorded[endpoint] = self._recorded.get(endpoint, 0) + 1
+
+    def quantile(self, endpoint: str, percentile: float | None = None) -> float | None:
+        """
+        Get a latency percentile of an endpoint.
+
+        Args:
+            endpoint: Endpoint key
+            percentile: Percentile in (0, 1], defaults to the tracker's percentile
+
+        Returns:
+            float | None: Latency in seconds, None without samples
+        """
+        samples = self._samples.get(endpoint)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, int(len(ordered) * (percentile or self.percentile) + 0.5) - 1))
+        return ordered[index]
+
+    def timeout_for(self, endpoint: str) -> float | None:
+        """
+        Get the adaptive timeout of an endpoint.
+
+        The value is recomputed after every eighth new sample, not on every request.
+
+        Returns:
+            float | None: Timeout in seconds, None if there are not enough samples
+        """
+        recorded = self._recorded.get(endpoint, 0)
+        if len(self._samples.get(endpoint, ())) < self.min_samples:
+            return None
+        cached = self._timeouts.get(endpoint)
+        if cached is not None and recorded - cached[0] < 8:
+            return cached[1]
+        timeout = min(self.max_timeout, max(self.min_timeout, self.quantile(endpoint) * self.multiplier))
+        self._timeouts[endpoint] = (recorded, timeout)
+        return timeout
+
+    def snapshot(self) -> dict[str, dict]:
+        """Per-endpoint sample count, p50, p99 and current adaptive timeout"""
+        return {
+            endpoint: {
+                "samples": len(samples),
+                "p50": self.quantile(endpoint, 0.5),
+                "p99": self.quantile(endpoint, 0.99),
+                "timeout": self.timeout_for(endpoint),
+            }
+            for endpoint, samples in self._samples.items()
+        }
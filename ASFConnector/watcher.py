@@ -0,0 +1,350 @@
+"""
+Bot state watcher with incremental diffing.
+
+Polls ``BotController.get_info`` at an adaptive interval, keeps the last
+snapshot as one compact tuple per bot and delivers only per-bot field-level
+deltas to async subscribers.
+"""
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from .error import ASFConnectorError
+
+# Tracked fields, in the order they are stored in a compact bot snapshot
+SNAPSHOT_FIELDS = (
+    "online",
+    "enabled",
+    "paused",
+    "farming",
+    "games_to_farm",
+    "cards_remaining",
+    "time_remaining",
+)
+_FIELD_INDEX = {name: index for index, name in enumerate(SNAPSHOT_FIELDS)}
+
+BotSnapshot = tuple
+
+
+@dataclass(frozen=True, slots=True)
+class BotDelta:
+    """
+    Change of a single bot between two polls.
+
+    Attributes:
+        bot: Bot name
+        kind: "added", "removed" or "changed"
+        changes: Field name -> (old value, new value); old is None for added bots, new is None for removed bots
+    """
+
+    bot: str
+    kind: str
+    changes: dict[str, tuple] = field(default_factory=dict)
+
+
+def parse_timespan(value: str | None) -> int:
+    """
+    Convert an ASF TimeSpan string ("hh:mm:ss" or "d.hh:mm:ss") to seconds.
+
+    Args:
+        value: TimeSpan string
+
+    Returns:
+        int: Total seconds, 0 if the value is missing or malformed
+    """
+    if not value:
+        return 0
+    try:
+        days = 0
+        if "." in value.split(":", 1)[0]:
+            day_part, value = value.split(".", 1)
+            days = int(day_part)
+        hours, minutes, seconds = value.split(":")
+        return days * 86400 + int(hours) * 3600 + int(minutes) * 60 + int(float(seconds))
+    except ValueError:
+        return 0
+
+
+def snapshot_bot(bot: dict) -> BotSnapshot:
+    """
+    Reduce a bot entry of GET /Api/Bot/{botNames} to a compact tuple ordered like ``SNAPSHOT_FIELDS``.
+
+    Args:
+        bot: Bot information dict
+
+    Returns:
+        BotSnapshot: Compact snapshot tuple
+    """
+    cards_farmer = bot.get("CardsFarmer") or {}
+    games_to_farm = cards_farmer.get("GamesToFarm") or ()
+    return (
+        bool(bot.get("IsConnectedAndLoggedOn")),
+        bool((bot.get("BotConfig") or {}).get("Enabled", True)),
+        bool(cards_farmer.get("Paused")),
+        tuple(game.get("AppID") for game in cards_farmer.get("CurrentGamesFarming") or ()),
+        len(games_to_farm),
+        sum(game.get("CardsRemaining", 0) for game in games_to_farm),
+        parse_timespan(cards_farmer.get("TimeRemaining")),
+    )
+
+
+def snapshot_fleet(result: dict) -> dict[str, BotSnapshot]:
+    """
+    Build compact snapshots for every bot in a GET /Api/Bot/{botNames} ``Result``.
+
+    Args:
+        result: Mapping of bot name -> bot information
+
+    Returns:
+        dict: Bot name -> compact snapshot
+    """
+    return {name: snapshot_bot(bot) for name, bot in result.items() if bot is not None}
+
+
+def diff_snapshots(old: dict[str, BotSnapshot], new: dict[str, BotSnapshot]) -> list[BotDelta]:
+    """
+    Compute per-bot field-level deltas between two fleet snapshots.
+
+    Unchanged bots cost a single tuple comparison.
+
+    Args:
+        old: Previous snapshot
+        new: Current snapshot
+
+    Returns:
+        list[BotDelta]: Deltas for added, removed and changed bots
+    """
+    deltas = []
+    for name, current in new.items():
+        previous = old.get(name)
+        if previous is None:
+            changes = {key: (None, value) for key, value in zip(SNAPSHOT_FIELDS, current)}
+            deltas.append(BotDelta(name, "added", changes))
+        elif previous != current:
+            changes = {
+                key: (before, after)
+                for key, before, after in zip(SNAPSHOT_FIELDS, previous, current)
+                if before != after
+            }
+            deltas.append(BotDelta(name, "changed", changes))
+    for name, previous in old.items():
+        if name not in new:
+            changes = {key: (value, None) for key, value in zip(SNAPSHOT_FIELDS, previous)}
+            deltas.append(BotDelta(name, "removed", changes))
+    return deltas
+
+
+class BaseSubscription:
+    """
+    Async iterator over the items delivered to one subscriber of a publisher.
+
+    Items that do not fit a bounded queue are dropped and counted. Closing never
+    blocks or raises: items already queued are still delivered, then iteration ends.
+    """
+
+    def __init__(self, publisher, maxsize: int):
+        self._publisher = publisher
+        self.dropped = 0
+        self._closed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def close(self):
+        """Stop receiving items"""
+        self._publisher._subscriptions.discard(self)
+        self._closed = True
+        if self._queue.empty():
+            # Wake a reader waiting on the empty queue; a non-empty queue has no waiting reader
+            self._queue.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._closed and self._queue.empty():
+            raise StopAsyncIteration
+        item = await self._queue.get()
+        if item is None:
+            raise StopAsyncIteration
+        return item
+
+
+class WatchSubscription(BaseSubscription):
+    """Async iterator over the deltas delivered to one subscriber"""
+
+    def __init__(self, watcher, bots: Iterable[str] | None, fields: Iterable[str] | None, maxsize: int):
+        super().__init__(watcher, maxsize)
+        self.bots = frozenset(bots) if bots is not None else None
+        self.fields = frozenset(fields) if fields is not None else None
+
+    def _offer(self, delta: BotDelta):
+        if self.bots is not None and delta.bot not in self.bots:
+            return
+        if self.fields is not None:
+            if not self.fields.intersection(delta.changes):
+                return
+            if delta.kind == "changed":
+                delta = BotDelta(delta.bot, delta.kind, {k: v for k, v in delta.changes.items() if k in self.fields})
+        self._put(delta)
+
+    async def __anext__(self) -> BotDelta:
+        return await super().__anext__()
+
+
+class BotWatcher:
+    """
+    Polls bot information and publishes only what changed.
+
+    The poll interval halves (down to ``min_interval``) after a tick with changes
+    and grows by ``backoff`` (up to ``max_interval``) after a quiet tick or an error.
+
+    Usage:
+        async with connector.watch("ASF", min_interval=1, max_interval=30) as watcher:
+            async for delta in watcher.subscribe(fields={"online", "farming"}):
+                print(delta.bot, delta.changes)
+    """
+
+    def __init__(
+        self,
+        bot_controller,
+        bot_names: str = "ASF",
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        emit_initial: bool = True,
+    ):
+        """
+        Initialize the watcher
+
+        Args:
+            bot_controller: BotController used for polling
+            bot_names: Bot name(s) to watch, ASF for all bots
+            min_interval: Shortest poll interval in seconds
+            max_interval: Longest poll interval in seconds
+            backoff: Interval growth factor after a quiet tick
+            emit_initial: Publish "added" deltas for every bot on the first poll
+        """
+        if not (0 < min_interval <= max_interval):
+            raise ValueError("Intervals must satisfy 0 < min_interval <= max_interval")
+        self.bot_controller = bot_controller
+        self.bot_names = bot_names
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.emit_initial = emit_initial
+        self.interval = min_interval
+        self.snapshot: dict[str, BotSnapshot] = {}
+        self.polls = 0
+        self._primed = False
+        self._subscriptions: set[WatchSubscription] = set()
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(
+        self, bots: Iterable[str] | None = None, fields: Iterable[str] | None = None, maxsize: int = 0
+    ) -> WatchSubscription:
+        """
+        Subscribe to deltas.
+
+        Args:
+            bots: Only deliver deltas of these bots (all if None)
+            fields: Only deliver deltas touching these ``SNAPSHOT_FIELDS`` (all if None)
+            maxsize: Queue bound; deltas beyond it are dropped and counted (0 for unbounded)
+
+        Returns:
+            WatchSubscription: Async iterator of BotDelta
+        """
+        if fields is not None:
+            unknown = set(fields) - set(SNAPSHOT_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown fields {sorted(unknown)}, expected some of {SNAPSHOT_FIELDS}")
+        subscription = WatchSubscription(self, bots, fields, maxsize)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def get(self, bot: str) -> dict | None:
+        """Get the last known state of a bot as a field dict"""
+        snapshot = self.snapshot.get(bot)
+        if snapshot is None:
+            return None
+        return dict(zip(SNAPSHOT_FIELDS, snapshot))
+
+    async def poll_once(self) -> list[BotDelta]:
+        """
+        Poll once, update the snapshot and publish deltas.
+
+        Returns:
+            list[BotDelta]: Deltas of this poll
+        """
+        response = await self.bot_controller.get_info(self.bot_names)
+        if not response.get("Success", True) and "Result" not in response:
+            raise ASFConnectorError(response.get("Message", "Getting bot info failed"))
+        current = snapshot_fleet(response.get("Result") or {})
+        deltas = diff_snapshots(self.snapshot, current)
+        initial = not self._primed
+        self.snapshot = current
+        self._primed = True
+        self.polls += 1
+        if initial and not self.emit_initial:
+            return []
+        for delta in deltas:
+            for subscription in tuple(self._subscriptions):
+                subscription._offer(delta)
+        return deltas
+
+    def start(self):
+        """Start the poll loop in the running event loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+            logger.debug(f"BotWatcher started for {self.bot_names}")
+
+    async def stop(self):
+        """Stop the poll loop and end all subscriptions"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscription in tuple(self._subscriptions):
+            subscription.close()
+        logger.debug("BotWatcher stopped")
+
+    def _adapt(self, changed: bool):
+        if changed:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+
+    async def _run(self):
+        while True:
+            try:
+                deltas = await self.poll_once()
+                self._adapt(bool(deltas))
+            except ASFConnectorError as ex:
+                logger.warning(f"BotWatcher poll failed: {ex}")
+                self._adapt(False)
+            except Exception as ex:
+                # Keep polling so subscribers are not left waiting on a dead task
+                logger.opt(exception=ex).error(f"BotWatcher poll failed unexpectedly: {ex!r}")
+                self._adapt(False)
+            await asyncio.sleep(self.interval)
@@ -168,3 +168,12 @@ def pytest_collection_modifyitems(items: list[pytest.Item]):
     session_scope_marker = pytest.mark.asyncio(loop_scope="session")
     for async_test in pytest_asyncio_tests:
         async_test.add_marker(session_scope_marker, append=False)
+
+
+@fixture
+async def asf_simulator():
+    """Provide a running local ASF simulator with a small deterministic fleet."""
+    from ASFConnector.simulator import ASFSimulator
+
+    async with ASFSimulator(bots=5, password="test_password", seed=42) as simulator:
+        yield simulator
@@ -0,0 +1,157 @@
+"""
+Tests for the JSON-lines batch runner.
+"""
+
+import asyncio
+import io
+import json
+import threading
+from unittest.mock import MagicMock
+
+from loguru import logger
+import pytest
+
+from ASFConnector import ASF_NotFound, ASFConnector
+from ASFConnector.batch import main, parse_operation, run_batch
+from ASFConnector.simulator import ASFSimulator
+
+
+def line(**operation) -> str:
+    return json.dumps(operation) + "\n"
+
+
+class TestParseOperation:
+    """Test input validation."""
+
+    def test_valid_and_invalid_lines(self):
+        """Test bot lists are joined and missing fields, unknown ops and bad JSON rejected."""
+        assert parse_operation(line(op="start", bots=["a", "b"]))["bots"] == "a,b"
+        with pytest.raises(ValueError, match="missing \\['keys'\\]"):
+            parse_operation(line(op="redeem", bots="a"))
+        with pytest.raises(ValueError, match="Unknown operation"):
+            parse_operation(line(op="delete", bots="a"))
+        with pytest.raises(ValueError, match="bots"):
+            parse_operation(line(op="start"))
+        with pytest.raises(json.JSONDecodeError):
+            parse_operation("{not json")
+
+
+class TestRunBatch:
+    """Test concurrency, ordering and result streaming."""
+
+    @pytest.mark.asyncio
+    async def test_against_simulator(self, asf_simulator):
+        """Test every operation type runs and results carry ids and errors."""
+        bots = list(asf_simulator.bots)
+        lines = [
+            line(id="stop", op="stop", bots=bots[0]),
+            line(id="start", op="start", bots=bots[:2]),
+            line(id="redeem", op="redeem", bots=bots[1], keys=["AAAAA-BBBBB-CCCCC"]),
+            line(id="input", op="input", bots=bots[2], type="DeviceID", value="x"),
+            line(id="config", op="update_config", bots=bots[3], config={"BotConfig": {"Enabled": True}}),
+            line(id="missing", op="pause", bots="nobody"),
+            "\n",
+            "garbage\n",
+        ]
+        results = []
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            totals = await run_batch(connector, lines, results.append, concurrency=3)
+        by_id = {result["id"]: result for result in results if result["id"] is not None}
+        assert len(results) == 7
+        assert all(by_id[name]["ok"] for name in ("stop", "start", "redeem", "input", "config"))
+        assert by_id["missing"]["ok"] is False
+        assert [result["line"] for result in results if result["id"] is None] == [8]
+        assert totals["ok"] == 5
+        assert asf_simulator.stats["route:Bot.Redeem"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cap_order_and_backpressure(self):
+        """Test the cap, per-bot input order and that input is not read ahead of the cap."""
+        running = peak = read = 0
+        order = []
+
+        def operation(name: str):
+            async def run(bots, *args):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                # The first operation on "a" is the slowest, so only chaining keeps "a" in input order
+                await asyncio.sleep(0.05 if (name, bots) == ("stop", "a") else 0.001)
+                order.append((name, bots))
+                running -= 1
+                return {"Success": True}
+
+            return run
+
+        connector = MagicMock()
+        connector.bot.stop.side_effect = operation("stop")
+        connector.bot.start.side_effect = operation("start")
+
+        def lines():
+            nonlocal read
+            for index in range(40):
+                read += 1
+                yield line(id=index, op="start" if index % 2 else "stop", bots="a" if index < 2 else f"b{index}")
+
+        ahead = []
+        totals = await run_batch(connector, lines(), lambda result: ahead.append(read - len(ahead)), concurrency=4)
+        assert totals["ok"] == 40
+        assert peak <= 4
+        assert [name for name, bots in order if bots == "a"] == ["stop", "start"]
+        assert max(ahead) <= 4 + 1
+
+    @pytest.mark.asyncio
+    async def test_order_per_bot_name(self):
+        """Test operations sharing any bot, in any spelling of the list, run in input order."""
+        delays = {"bot1": 0.04, "bot1,bot2": 0.03, "bot2,bot1": 0.02, "ASF": 0.0}
+        order = []
+
+        async def run(bots, *args):
+            # Earlier operations are slower, so only chaining keeps them first
+            await asyncio.sleep(delays[bots])
+            order.append(bots)
+            return {"Success": True}
+
+        connector = MagicMock()
+        connector.bot.stop.side_effect = run
+        lines = [
+            line(op="stop", bots="bot1"),
+            line(op="stop", bots="bot1,bot2"),
+            line(op="stop", bots=["bot2", "bot1"]),
+            line(op="stop", bots="ASF"),
+        ]
+        totals = await run_batch(connector, lines, lambda result: None, concurrency=4)
+        assert totals["ok"] == 4
+        assert order == ["bot1", "bot1,bot2", "bot2,bot1", "ASF"]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_reported(self):
+        """Test raised ASF errors become failed results with the exception class."""
+        connector = MagicMock()
+        connector.bot.pause.side_effect = ASF_NotFound("Bot not found")
+        results = []
+        totals = await run_batch(connector, [line(id=1, op="pause", bots="x")], results.append)
+        assert totals == {"failed": 1}
+        assert results[0]["error"] == "ASF_NotFound: Bot not found"
+
+
+def test_cli_streams_json_lines(monkeypatch, capsys):
+    """Test the command line against a simulator running in another thread."""
+    simulator = ASFSimulator(bots=["main"], seed=3)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(simulator.start(), loop).result(5)
+    try:
+        monkeypatch.setattr("sys.stdin", io.StringIO(line(id=1, op="pause", bots="main") + line(op="stop", bots="x")))
+        params = simulator.connection_params()
+        status = main(["--host", params["host"], "--port", str(params["port"]), "--path", params["path"]])
+    finally:
+        logger.enable("ASFConnector")
+        asyncio.run_coroutine_threadsafe(simulator.stop(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+    results = [json.loads(text) for text in capsys.readouterr().out.splitlines()]
+    assert {result["line"]: result["ok"] for result in results} == {1: True, 2: False}
+    assert status == 1
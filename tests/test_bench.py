@@ -0,0 +1,97 @@
+"""
+Tests for the load generator.
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from loguru import logger
+import pytest
+
+from ASFConnector import ASF_NotFound, ASFConnector
+from ASFConnector.bench import (
+    DEFAULT_MIX,
+    MUTATING_OPERATIONS,
+    BenchResult,
+    main,
+    parse_mix,
+    percentile,
+    run_workload,
+)
+
+
+class TestHelpers:
+    """Test mix parsing and percentiles."""
+
+    def test_parse_mix(self):
+        """Test weights, bare operations and validation."""
+        assert parse_mix("bot.info=7, asf.info=2,bot.redeem") == {"bot.info": 7.0, "asf.info": 2.0, "bot.redeem": 1.0}
+        with pytest.raises(ValueError, match="Unknown operation"):
+            parse_mix("bot.nuke=1")
+        with pytest.raises(ValueError, match="positive weight"):
+            parse_mix("bot.info=0")
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(value) for value in range(1, 101)]
+        assert (percentile(values, 50), percentile(values, 99), percentile(values, 100)) == (50.0, 99.0, 100.0)
+        assert percentile([], 50) == 0.0
+
+
+class TestRunWorkload:
+    """Test workloads and reports."""
+
+    @pytest.mark.asyncio
+    async def test_errors_by_class(self):
+        """Test failures are tallied by exception class and Success=false responses."""
+        connector = MagicMock()
+        connector.bot.get_info = AsyncMock(side_effect=ASF_NotFound("Bot not found"))
+        connector.asf.get_info = AsyncMock(return_value={"Success": False, "Message": "nope"})
+        result = await run_workload(
+            connector, ["bot1"], mix={"bot.info": 1, "asf.info": 1}, concurrency=2, duration=0.05, seed=1
+        )
+        summary = result.summary()
+        assert summary["requests"] == sum(result.errors.values())
+        assert set(summary["errors"]) == {"ASF_NotFound", "Unsuccessful"}
+        assert result.errors_by_operation["bot.info"] == {"ASF_NotFound": len(result.latencies["bot.info"])}
+        assert "errors: " in str(result)
+
+    @pytest.mark.asyncio
+    async def test_against_simulator(self, asf_simulator):
+        """Test a short ramped run reports throughput and percentiles."""
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            result = await run_workload(
+                connector, list(asf_simulator.bots), concurrency=4, duration=0.3, ramp_up=0.1, seed=7
+            )
+        summary = result.summary()
+        assert summary["requests"] > 10
+        assert summary["throughput"] > 0
+        assert summary["p50"] <= summary["p90"] <= summary["p99"]
+        assert set(summary["operations"]) <= set(DEFAULT_MIX)
+        assert asf_simulator.stats["route:Bot"] + asf_simulator.stats["route:ASF"] > 0
+        assert summary["errors"] == {}
+
+    def test_empty_result(self):
+        """Test an empty result formats without dividing by zero."""
+        assert BenchResult().throughput == 0.0
+        assert "0 requests" in str(BenchResult())
+
+
+def test_cli_against_simulator(capsys):
+    """Test the command line runs a simulated workload and prints JSON."""
+    try:
+        main(["--simulate", "3", "--duration", "0.2", "--concurrency", "2", "--mix", "asf.info", "--json"])
+    finally:
+        logger.enable("ASFConnector")
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["requests"] > 0
+    assert list(summary["operations"]) == ["asf.info"]
+
+
+def test_cli_refuses_mutating_operations_against_real_hosts(capsys):
+    """Test the default mix is read-only and mutating operations need --allow-mutating outside the simulator."""
+    assert not MUTATING_OPERATIONS.intersection(DEFAULT_MIX)
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--host", "127.0.0.1", "--port", "1", "--mix", "bot.info=9,bot.redeem=1"])
+    assert exc_info.value.code == 2
+    assert "bot.redeem change real bots; pass --allow-mutating" in capsys.readouterr().err
@@ -0,0 +1,118 @@
+"""
+Tests for batched multi-bot command execution.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+from loguru import logger
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector.commands import pack_commands, parse_command_response, split_command
+from ASFConnector.Controllers.CommandController import CommandController
+
+
+class TestCommandHelpers:
+    """Test command packing and response parsing."""
+
+    def test_split_command(self):
+        """Test the command name is separated from its arguments."""
+        assert split_command("!owns 730 440") == ("owns", "730 440")
+        assert split_command("level") == ("level", "")
+        with pytest.raises(ValueError, match="empty"):
+            split_command(" ! ")
+
+    def test_pack_commands_chunks_and_dedupes_bots(self):
+        """Test bots are packed into multi-bot commands of bounded size."""
+        packed = list(pack_commands("owns 730", ["a", "b", "c", "a"], chunk_size=2))
+        assert packed == [(["a", "b"], "!owns a,b 730"), (["c"], "!owns c 730")]
+        assert list(pack_commands("!level", ["a"])) == [(["a"], "!level a")]
+        with pytest.raises(ValueError, match="Chunk size"):
+            list(pack_commands("level", ["a"], chunk_size=0))
+
+    def test_parse_command_response(self):
+        """Test mixed response lines are mapped to bots, keeping multi-line responses."""
+        text = "<a> Your Steam account level is 5.\n<b> Owned already:\n730 | CS\n<c> Done!"
+        assert parse_command_response(text) == {
+            "a": "Your Steam account level is 5.",
+            "b": "Owned already:\n730 | CS",
+            "c": "Done!",
+        }
+
+    def test_parse_command_response_without_bots(self):
+        """Test text outside bot blocks is kept under the empty key."""
+        assert parse_command_response("Couldn't find any bot named x!") == {"": "Couldn't find any bot named x!"}
+        assert parse_command_response("") == {}
+        assert parse_command_response(None) == {}
+
+
+class TestExecuteBatch:
+    """Test CommandController.execute_batch()."""
+
+    @pytest.mark.asyncio
+    async def test_requests_are_chunked_and_capped(self, mock_ipc_handler):
+        """Test one request per chunk and command, with a concurrency cap."""
+        controller = CommandController(mock_ipc_handler)
+        in_flight = 0
+        peak = 0
+        sent = []
+
+        async def post(resource, payload):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            sent.append(payload["Command"])
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            name, bots = payload["Command"].split()[:2]
+            lines = [f"<{bot}> {name} of {bot}" for bot in bots.split(",")]
+            return {"Success": True, "Message": "OK", "Result": "\n".join(lines)}
+
+        bots = [f"bot{index}" for index in range(10)]
+        warnings = []
+        sink = logger.add(lambda message: warnings.append(message), level="WARNING")
+        try:
+            with patch.object(mock_ipc_handler, "post", side_effect=post):
+                results = await controller.execute_batch(["level", "balance"], bots, chunk_size=3, concurrency=2)
+        finally:
+            logger.remove(sink)
+
+        # The batch API is the recommended one, it does not warn about the legacy endpoint
+        assert warnings == []
+
+        assert len(sent) == 8
+        assert peak == 2
+        assert "!level bot0,bot1,bot2" in sent
+        assert results["level"]["bot9"] == "!level of bot9"
+        assert list(results["balance"]) == bots
+
+    @pytest.mark.asyncio
+    async def test_missing_bots_get_request_message(self, mock_ipc_handler):
+        """Test bots absent from the response get ASF's message."""
+        controller = CommandController(mock_ipc_handler)
+        responses = [{"Success": False, "Message": "Timeout", "Result": None}]
+        with patch.object(mock_ipc_handler, "post", side_effect=responses):
+            results = await controller.execute_batch("level", ["a", "b"])
+        assert results == {"level": {"a": "Timeout", "b": "Timeout"}}
+
+    @pytest.mark.asyncio
+    async def test_error_propagates(self, mock_ipc_handler):
+        """Test a failing request raises out of the batch."""
+        controller = CommandController(mock_ipc_handler)
+        with patch.object(mock_ipc_handler, "post", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                await controller.execute_batch("level", ["a", "b"], chunk_size=1)
+
+    @pytest.mark.asyncio
+    async def test_against_simulator(self, asf_simulator):
+        """Test a batch over every simulated bot parses the simulator's output."""
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            bots = list(asf_simulator.bots)
+            results = await connector.command.execute_batch(["level", "owns 730"], [*bots, "missing"], chunk_size=2)
+
+        assert asf_simulator.stats["route:Command"] == 6
+        for name, bot in asf_simulator.bots.items():
+            assert results["level"][name] == f"Your Steam account level is {bot.steam_id % 100}."
+            assert results["owns 730"][name] == "Not owned yet: 730"
+        assert results["level"]["missing"] is None
@@ -0,0 +1,86 @@
+"""
+Tests for per-endpoint response compression negotiation.
+"""
+
+import httpx
+import pytest
+
+from ASFConnector import ASFConnector, CompressionPolicy
+from ASFConnector.compression import available_encodings
+from ASFConnector.simulator import ASFSimulator
+
+
+class TestCompressionPolicy:
+    """Test Accept-Encoding selection."""
+
+    def test_heavy_small_and_other_endpoints(self):
+        """Test heavy endpoints ask for compact codecs, small ones for identity and others keep the default."""
+        policy = CompressionPolicy(encodings=["br", "gzip"])
+        assert policy.accept_encoding("/Bot/bot1/Inventory") == "br, gzip"
+        assert policy.accept_encoding("/Bot/bot1/Inventory/753/6") == "br, gzip"
+        assert policy.accept_encoding("/NLog/File") == "br, gzip"
+        assert policy.accept_encoding("/Bot/bot1/Pause") == "identity"
+        assert policy.accept_encoding("/Bot/bot1/TwoFactorAuthentication/Token") == "identity"
+        assert policy.accept_encoding("/ASF/Restart") == "identity"
+        # Fleet-wide and multi-bot responses grow with the number of bots
+        assert policy.accept_encoding("/Bot/ASF/Pause") is None
+        assert policy.accept_encoding("/Bot/a,b/Start") is None
+        assert policy.accept_encoding("/Bot/bot1") is None
+        assert policy.accept_encoding("/ASF") is None
+
+    def test_disabled_and_custom_routes(self):
+        """Test the disabled policy and extra routes."""
+        assert CompressionPolicy.disabled().accept_encoding("/Bot/bot1/Inventory") == "identity"
+        assert CompressionPolicy.disabled().accept_encoding("/ASF") == "identity"
+        policy = CompressionPolicy(routes=[r"^/Bot/ASF$"], encodings=["gzip"], default="identity")
+        assert policy.accept_encoding("/Bot/ASF") == "gzip"
+        assert policy.accept_encoding("/NLog/File") == "identity"
+
+    def test_encodings(self):
+        """Test available encodings always end with gzip and unknown ones are rejected."""
+        assert available_encodings()[-1] == "gzip"
+        with pytest.raises(ValueError, match="Unsupported encodings"):
+            CompressionPolicy(encodings=["lzma"])
+
+
+class TestNegotiation:
+    """Test the handler sends the negotiated header."""
+
+    @pytest.mark.asyncio
+    async def test_headers_per_request(self):
+        """Test each request carries its endpoint's Accept-Encoding header."""
+        seen = {}
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            seen[request.url.path] = request.headers["accept-encoding"]
+            return httpx.Response(200, json={"Success": True, "Message": "OK", "Result": {}})
+
+        policy = CompressionPolicy(encodings=["gzip"])
+        connector = ASFConnector(host="asf", port="1242", transport=httpx.MockTransport(respond), compression=policy)
+        await connector.bot.get_info("bot1")
+        await connector.bot.pause("bot1")
+        await connector.bot.get_inventory("bot1")
+        assert seen["/Api/Bot/bot1/Pause"] == "identity"
+        assert seen["/Api/Bot/bot1/Inventory"] == "gzip"
+        # No opinion: httpx's default header
+        assert "gzip" in seen["/Api/Bot/bot1"]
+
+    @pytest.mark.asyncio
+    async def test_simulator_compresses_large_bodies(self):
+        """Test a large inventory is transferred gzipped and decoded transparently."""
+        async with ASFSimulator(bots=2, inventory_size=200, seed=1) as simulator:
+            params = simulator.connection_params()
+            async with ASFConnector(**params, health_check_mode="skip") as connector:
+                compressed = await connector.bot.get_inventory("bot00000")
+                await connector.bot.get_info("ASF")
+            assert simulator.stats["compressed"] == 1
+            compressed_bytes = simulator.stats["body_bytes"]
+
+            simulator.stats.clear()
+            async with ASFConnector(**params, health_check_mode="skip", compression=False) as connector:
+                plain = await connector.bot.get_inventory("bot00000")
+                await connector.bot.get_info("ASF")
+            assert simulator.stats["compressed"] == 0
+            assert simulator.stats["body_bytes"] > 2 * compressed_bytes
+
+        assert compressed == plain
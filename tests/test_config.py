@@ -5,7 +5,7 @@ Tests for ASFConnector configuration management.
 from pydantic import ValidationError
 import pytest
 
-from ASFConnector.config import ASFConfig
+from ASFConnector.config import ASFConfig, ASFEndpoint
 
 
 class TestASFConfig:
@@ -178,3 +178,75 @@ class TestASFConfig:
 
         config = ASFConfig(enable_rich_traceback=False)
         assert config.enable_rich_traceback is False
+
+    def test_health_check_mode_validation(self):
+        """Test health check mode validation."""
+        assert ASFConfig(asfc_health_check="Cached").asfc_health_check == "cached"
+        with pytest.raises(ValidationError):
+            ASFConfig(asfc_health_check="sometimes")
+        with pytest.raises(ValidationError):
+            ASFConfig(asfc_health_check_ttl=-1)
+
+    def test_fanout_concurrency_validation(self):
+        """Test fan-out concurrency validation."""
+        assert ASFConfig(asfc_fanout_concurrency=4).asfc_fanout_concurrency == 4
+        with pytest.raises(ValidationError):
+            ASFConfig(asfc_fanout_concurrency=0)
+
+    def test_max_in_flight_validation(self):
+        """Test in-flight cap validation."""
+        assert ASFConfig().asfc_max_in_flight == 16
+        assert ASFConfig(asfc_max_in_flight=0).asfc_max_in_flight == 0
+        with pytest.raises(ValidationError):
+            ASFConfig(asfc_max_in_flight=-1)
+
+    def test_key_ledger_validation(self):
+        """Test key ledger path validation."""
+        assert ASFConfig().asfc_key_ledger is None
+        assert ASFConfig(asfc_key_ledger="  ").asfc_key_ledger is None
+        assert ASFConfig(asfc_key_ledger=" keys.sqlite3 ").asfc_key_ledger == "keys.sqlite3"
+
+    def test_socket_path(self):
+        """Test socket path validation and connection params."""
+        assert ASFConfig(asf_socket_path="").asf_socket_path is None
+        config = ASFConfig(asf_socket_path=" /run/asf.sock ")
+        assert config.get_connection_params()["socket_path"] == "/run/asf.sock"
+
+    def test_compression(self):
+        """Test compression setting."""
+        assert ASFConfig().asfc_compression is True
+        assert ASFConfig(asfc_compression="false").asfc_compression is False
+
+    def test_endpoints(self, monkeypatch):
+        """Test the implicit default endpoint, endpoint lists and their validation."""
+        (default,) = ASFConfig(asf_host="asf", asfc_max_connections=10).get_endpoints()
+        assert (default.name, default.host, default.limits().max_connections) == ("default", "asf", 10)
+        assert ASFConfig().get_endpoint().limits() is None
+        monkeypatch.setenv(
+            "ASF_ENDPOINTS", '[{"name": "eu", "host": "10.0.0.5", "port": 1243, "max_in_flight": 4}, {"name": "us"}]'
+        )
+        config = ASFConfig()
+        assert [endpoint.name for endpoint in config.get_endpoints()] == ["eu", "us"]
+        assert config.get_endpoint("eu").connection_params() == {"host": "10.0.0.5", "port": "1243", "path": "/Api"}
+        with pytest.raises(ValueError, match="Unknown endpoint"):
+            config.get_endpoint("asia")
+        with pytest.raises(ValidationError, match="unique"):
+            ASFConfig(asf_endpoints=[{"name": "eu"}, {"name": "eu"}])
+        with pytest.raises(ValidationError):
+            ASFConfig(asf_endpoints=[{"port": "70000"}])
+
+    def test_validation_errors_hide_passwords(self, monkeypatch):
+        """Test endpoint passwords never appear in validation errors or endpoint reprs."""
+        monkeypatch.setenv(
+            "ASF_ENDPOINTS", '[{"name": "eu", "password": "hunter2"}, {"name": "eu", "password": "hunter3"}]'
+        )
+        with pytest.raises(ValidationError, match="unique") as exc_info:
+            ASFConfig()
+        monkeypatch.setenv("ASF_ENDPOINTS", '[{"name": "eu", "port": "70000", "password": "hunter4"}]')
+        with pytest.raises(ValidationError, match="Port") as port_info:
+            ASFConfig()
+        with pytest.raises(ValidationError) as model_info:
+            ASFEndpoint(port="0", password="hunter5")
+        text = str(exc_info.value) + str(port_info.value) + str(model_info.value)
+        text += repr(ASFEndpoint(password="hunter6"))
+        assert not any(f"hunter{index}" in text for index in range(2, 7))
@@ -0,0 +1,159 @@
+"""
+Tests for diff-based configuration updates.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector.config_sync import GlobalConfigManager, config_hash, diff_config, merge_config, rollout_bot_config
+from ASFConnector.error import ASF_BadRequest, ASFConnectorError
+
+
+class TestMergeAndDiff:
+    """Test config merging and diffing helpers."""
+
+    def test_merge_config(self):
+        """Test that templates overlay recursively without mutating inputs."""
+        current = {"Enabled": True, "Paused": False, "Perms": {"1": 3}}
+        merged = merge_config(current, {"Paused": True, "Perms": {"2": 1}})
+        assert merged == {"Enabled": True, "Paused": True, "Perms": {"1": 3, "2": 1}}
+        assert current == {"Enabled": True, "Paused": False, "Perms": {"1": 3}}
+
+    def test_diff_config(self):
+        """Test that only differing keys are reported."""
+        assert diff_config({"A": 1, "B": 2}, {"A": 1, "B": 3, "C": None}) == {"B": (2, 3), "C": (None, None)}
+        assert diff_config({"A": 1}, {"A": 1}) == {}
+
+
+class TestRolloutBotConfig:
+    """Test bot config rollouts."""
+
+    @pytest.mark.asyncio
+    async def test_only_changed_bots_are_written(self, asf_simulator):
+        """Test that a rollout posts only to bots whose config differs."""
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            names = list(asf_simulator.bots)
+            asf_simulator.bots[names[0]].config["Paused"] = True
+            report = await connector.bot.rollout_config({"Paused": True})
+            assert sorted(report.updated) == sorted(names[1:])
+            assert report.unchanged == [names[0]]
+            assert report.ok
+            assert asf_simulator.stats["bot_restarts"] == len(names) - 1
+            assert all(bot.config["Paused"] for bot in asf_simulator.bots.values())
+            # Other keys survive the merge
+            assert all(bot.config["Enabled"] for bot in asf_simulator.bots.values())
+
+            again = await connector.bot.rollout_config({"Paused": True})
+            assert again.updated == []
+            assert asf_simulator.stats["bot_restarts"] == len(names) - 1
+
+    @pytest.mark.asyncio
+    async def test_dry_run(self, asf_simulator):
+        """Test that a dry run reports changes without writing."""
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            names = list(asf_simulator.bots)[:2]
+            bot_names = ",".join([*names, "ghost"])
+            report = await connector.bot.rollout_config({"Paused": True}, bot_names=bot_names, dry_run=True)
+            assert report.changes == {name: {"Paused": (False, True)} for name in names}
+            assert report.missing == ["ghost"]
+            assert report.updated == []
+            assert asf_simulator.stats["bot_restarts"] == 0
+            assert "would update 2" in report.summary()
+
+    @pytest.mark.asyncio
+    async def test_failed_writes_are_reported(self):
+        """Test that a failed write is recorded without aborting the rollout."""
+        bot_controller = AsyncMock()
+        bot_controller.get_info.return_value = {
+            "Success": True,
+            "Result": {"a": {"BotConfig": {"Paused": False}}, "b": {"BotConfig": {"Paused": False}}},
+        }
+
+        async def update_config(name, config):
+            if name == "a":
+                raise ASF_BadRequest("nope")
+            return {"Success": True}
+
+        bot_controller.update_config.side_effect = update_config
+        report = await rollout_bot_config(bot_controller, {"Paused": True}, ["a", "b"], concurrency=1)
+        bot_controller.get_info.assert_awaited_once_with("a,b")
+        assert report.updated == ["b"]
+        assert isinstance(report.failed["a"], ASF_BadRequest)
+        assert not report.ok
+
+    @pytest.mark.asyncio
+    async def test_invalid_concurrency(self):
+        """Test that concurrency must be positive."""
+        with pytest.raises(ValueError, match="Concurrency"):
+            await rollout_bot_config(AsyncMock(), {}, concurrency=0)
+
+
+class TestGlobalConfigManager:
+    """Test conditional GlobalConfig writes."""
+
+    def test_config_hash_ignores_key_order(self):
+        """Test that the content hash is canonical."""
+        assert config_hash({"A": 1, "B": [1, 2]}) == config_hash({"B": [1, 2], "A": 1})
+        assert config_hash({"A": 1}) != config_hash({"A": 2})
+
+    @pytest.mark.asyncio
+    async def test_noop_writes_are_skipped(self, asf_simulator):
+        """Test that an update matching the known config is not posted."""
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            manager = connector.global_config
+            assert await manager.update({"AutoRestart": True}) is False
+            assert asf_simulator.stats["asf_restarts"] == 0
+            assert manager.skipped == 1
+
+            assert manager.plan({"UpdatePeriod": 12}) == {"UpdatePeriod": (24, 12)}
+            assert await manager.update({"UpdatePeriod": 12}) is True
+            assert asf_simulator.stats["asf_restarts"] == 1
+            # Partial updates are merged locally
+            assert asf_simulator.global_config["AutoRestart"] is True
+            assert asf_simulator.global_config["UpdatePeriod"] == 12
+
+            assert await manager.update({"UpdatePeriod": 12}) is False
+            assert await manager.update({"UpdatePeriod": 12}, force=True) is True
+            assert asf_simulator.stats["asf_restarts"] == 2
+            assert asf_simulator.stats["route:ASF"] == 1
+
+    @pytest.mark.asyncio
+    async def test_restart_refreshes_known_config(self, asf_simulator):
+        """Test that a new ProcessStartTime replaces the known config."""
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            manager = connector.global_config
+            await manager.refresh()
+            known_hash = manager.hash
+
+            # Same process: the observed info is ignored
+            assert manager.observe(await connector.asf.get_info()) is False
+
+            # Config edited out of band and ASF restarted; get_info alone feeds the manager
+            await connector.asf.update_config({"GlobalConfig": {"AutoRestart": False}})
+            info = await connector.asf.get_info()
+            assert manager.config == {"AutoRestart": False}
+            assert manager.observe(info) is False
+            assert manager.hash != known_hash
+            assert await manager.update({"AutoRestart": False}) is False
+
+    @pytest.mark.asyncio
+    async def test_verify_fetches_current_config(self):
+        """Test that verify re-reads the config before deciding."""
+        asf_controller = AsyncMock()
+        asf_controller.get_info.return_value = {
+            "Success": True,
+            "Result": {"GlobalConfig": {"A": 1}, "ProcessStartTime": "t1"},
+        }
+        asf_controller.update_config.return_value = {"Success": True}
+        manager = GlobalConfigManager(asf_controller)
+        assert await manager.update({"A": 1}) is False
+        assert await manager.update({"A": 1}, verify=True) is False
+        assert asf_controller.get_info.await_count == 2
+        asf_controller.update_config.assert_not_awaited()
+
+    def test_plan_requires_known_config(self):
+        """Test that planning without a known config fails."""
+        with pytest.raises(ASFConnectorError, match="unknown"):
+            GlobalConfigManager(AsyncMock()).plan({"A": 1})
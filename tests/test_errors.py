@@ -5,6 +5,7 @@ Tests for ASFConnector error handling and exceptions.
 from unittest.mock import Mock
 
 import httpx
+from loguru import logger
 import pytest
 
 from ASFConnector.error import (
@@ -23,9 +24,11 @@ from ASFConnector.error import (
     ASFNetworkError,
 )
 from ASFConnector.IPCProtocol import (
+    IPCProtocolHandler,
     build_error_payload,
     extract_reason_from_exception,
     raise_asf_exception,
+    to_asf_exception,
 )
 
 
@@ -296,3 +299,65 @@ class TestDefaultMessages:
             exc = exc_class()
             assert str(exc) != ""
             assert str(exc) == exc_class.default_message
+
+
+class TestCheapErrorPath:
+    """Test the single-decode error conversion and sampled tracebacks."""
+
+    def test_body_decoded_once(self):
+        """Test the response body is decoded once for both message and payload."""
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_response.json.return_value = {"Message": "Not found", "Success": False}
+        exc = httpx.HTTPStatusError("404 Not Found", request=Mock(), response=mock_response)
+
+        converted = to_asf_exception(exc)
+
+        assert isinstance(converted, ASF_NotFound)
+        assert str(converted) == "Not found"
+        assert converted.payload == {"Message": "Not found", "Success": False}
+        mock_response.json.assert_called_once()
+
+    def test_empty_text_body(self):
+        """Test an empty non-JSON body falls back to the status code."""
+        mock_response = Mock()
+        mock_response.status_code = 502
+        mock_response.json.side_effect = ValueError("Not JSON")
+        mock_response.text = "  "
+        exc = httpx.HTTPStatusError("502 Bad Gateway", request=Mock(), response=mock_response)
+
+        converted = to_asf_exception(exc)
+
+        assert str(converted) == "HTTP 502"
+        assert converted.payload is None
+
+    def test_request_error_subclasses(self):
+        """Test transport error subclasses map through their base class."""
+        assert type(to_asf_exception(httpx.ConnectError("refused"))) is ASFNetworkError
+        assert type(to_asf_exception(httpx.ConnectTimeout("slow"))).__name__ == "ASFTimeoutError"
+        assert type(to_asf_exception(httpx.HTTPError("odd"))) is ASFIPCError
+
+    @pytest.mark.asyncio
+    async def test_tracebacks_only_sampled(self):
+        """Test failed requests log one line at ERROR, with a full traceback only for sampled ones at any level."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(500, json={"Message": "boom"}))
+        handler = IPCProtocolHandler("asf", "1242", "/Api", transport=transport, traceback_every=3)
+        records = []
+        # A DEBUG sink like the package's log file must not receive the unsampled tracebacks either
+        sink = logger.add(lambda message: records.append(message.record), level="DEBUG")
+        try:
+            for _ in range(4):
+                with pytest.raises(ASFHTTPError, match="boom"):
+                    await handler.get("/ASF")
+        finally:
+            logger.remove(sink)
+
+        lines = [record for record in records if record["level"].name == "ERROR" and record["exception"] is None]
+        tracebacks = [record for record in records if record["exception"] is not None]
+        assert len(lines) == 4
+        assert lines[0]["message"].endswith("ASFHTTPError: boom")
+        assert [record["message"] for record in tracebacks] == [
+            "Traceback of failed request 1",
+            "Traceback of failed request 4",
+        ]
+        assert handler.error_counts == {"ASFHTTPError": 4}
@@ -0,0 +1,136 @@
+"""
+Tests for the bot lifecycle event bus.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ASFConnector import ASFConnector, BotEvent, BotEventType, EventBus
+from ASFConnector.events import event_from_log_line, events_from_delta
+from ASFConnector.watcher import BotDelta, BotWatcher
+
+
+def fleet(**bots):
+    """Build a GET /Api/Bot response from bot name -> (online, farming app ids)."""
+    return {
+        "Success": True,
+        "Result": {
+            name: {
+                "IsConnectedAndLoggedOn": online,
+                "CardsFarmer": {"CurrentGamesFarming": [{"AppID": app} for app in farming]},
+            }
+            for name, (online, farming) in bots.items()
+        },
+    }
+
+
+class TestEventTranslation:
+    """Test deltas and log lines become typed events."""
+
+    def test_events_from_delta(self):
+        """Test flag, farming and card transitions."""
+        delta = BotDelta(
+            "bot1",
+            "changed",
+            {
+                "online": (False, True),
+                "paused": (True, False),
+                "farming": ((), (440,)),
+                "cards_remaining": (5, 4),
+                "time_remaining": (100, 90),
+            },
+        )
+        events = events_from_delta(delta)
+        assert [event.type for event in events] == [
+            BotEventType.ONLINE,
+            BotEventType.RESUMED,
+            BotEventType.FARMING_STARTED,
+            BotEventType.CARDS_DROPPED,
+        ]
+        assert events[0].detail == {"online": (False, True)}
+        finished = events_from_delta(BotDelta("bot1", "changed", {"farming": ((440,), ())}))
+        assert [event.type for event in finished] == [BotEventType.FARMING_FINISHED]
+        assert events_from_delta(BotDelta("bot1", "changed", {"farming": ((440,), (570,))})) == []
+        assert events_from_delta(BotDelta("bot2", "removed", {}))[0].type == BotEventType.REMOVED
+
+    def test_event_from_log_line(self):
+        """Test ASF log lines are parsed and unknown lines ignored."""
+        line = "2024-05-01 10:00:00|dotnet-1234|INFO|bot1|OnDisconnected() Disconnected from Steam!\n"
+        event = event_from_log_line(line)
+        assert (event.bot, event.type, event.source) == ("bot1", BotEventType.OFFLINE, "log")
+        assert event_from_log_line("2024-05-01 10:00:00|dotnet-1234|INFO|ASF|Start() Hello") is None
+        assert event_from_log_line("garbage") is None
+
+
+class TestEventBus:
+    """Test publishing and filtering."""
+
+    @pytest.mark.asyncio
+    async def test_filters_by_bot_and_type(self):
+        """Test subscribers only receive matching events."""
+        bus = EventBus()
+        offline = bus.subscribe(types={"offline"})
+        bot2 = bus.subscribe(bots={"bot2"})
+        await bus.feed_log(
+            [
+                "d|p|INFO|bot1|OnDisconnected() Disconnected from Steam!",
+                "d|p|INFO|bot2|OnLoggedOn() Successfully logged on!",
+                "d|p|INFO|bot2|OnDisconnected() Disconnected from Steam!",
+            ]
+        )
+        await bus.stop()
+        assert [(event.bot, event.type) async for event in offline] == [
+            ("bot1", BotEventType.OFFLINE),
+            ("bot2", BotEventType.OFFLINE),
+        ]
+        assert [event.type async for event in bot2] == [BotEventType.ONLINE, BotEventType.OFFLINE]
+        assert bus.published == 3
+
+    @pytest.mark.asyncio
+    async def test_stop_with_full_bounded_subscription(self):
+        """Test stopping closes a full bounded subscription and still delivers its queued event."""
+        bus = EventBus()
+        full = bus.subscribe(maxsize=1)
+        other = bus.subscribe()
+        bus.publish(BotEvent("bot1", BotEventType.ONLINE))
+        bus.publish(BotEvent("bot1", BotEventType.OFFLINE))
+        await bus.stop()
+        assert [event.type async for event in full] == [BotEventType.ONLINE]
+        assert full.dropped == 1
+        assert len([event async for event in other]) == 2
+
+    @pytest.mark.asyncio
+    async def test_one_poll_loop_for_many_subscribers(self):
+        """Test subscribers share the source and the bus stops a source it started."""
+        controller = AsyncMock()
+        controller.get_info.side_effect = [
+            fleet(bot1=(True, [440]), bot2=(True, [])),
+            fleet(bot1=(False, []), bot2=(True, [])),
+        ] + [fleet(bot1=(False, []), bot2=(True, []))] * 100
+        watcher = BotWatcher(controller, min_interval=0.01, max_interval=0.01, emit_initial=False)
+        async with EventBus(watcher) as bus:
+            offline = bus.subscribe(types={BotEventType.OFFLINE})
+            finished = bus.subscribe(bots={"bot1"}, types={BotEventType.FARMING_FINISHED})
+            event = await asyncio.wait_for(offline.__anext__(), timeout=2)
+            assert event == BotEvent("bot1", BotEventType.OFFLINE, "poll", {"online": (True, False)}, event.timestamp)
+            assert (await asyncio.wait_for(finished.__anext__(), timeout=2)).bot == "bot1"
+            assert watcher.running
+        assert not watcher.running
+        assert len(watcher._subscriptions) == 0
+
+    @pytest.mark.asyncio
+    async def test_connector_events_against_simulator(self, asf_simulator):
+        """Test the connector's shared bus picks up simulated state changes."""
+        name = next(iter(asf_simulator.bots))
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            connector.events = EventBus(connector.watch(min_interval=0.01, max_interval=0.05, emit_initial=False))
+            assert connector.events is connector.events
+            subscription = connector.events.subscribe(bots={name}, types={"paused", "resumed"})
+            await asyncio.sleep(0.03)
+            paused = not asf_simulator.bots[name].paused
+            asf_simulator.bots[name].paused = paused
+            event = await asyncio.wait_for(subscription.__anext__(), timeout=2)
+            assert event.type == (BotEventType.PAUSED if paused else BotEventType.RESUMED)
+        assert not connector.events.running
@@ -0,0 +1,135 @@
+"""
+Tests for the bounded-concurrency fan-out helper.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector.error import ASF_BadRequest
+from ASFConnector.fanout import FanOut
+
+
+class Recorder:
+    """Operation recording concurrency and per-bot call order."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.per_bot_running: dict[str, int] = {}
+        self.order: list[tuple[str, int]] = []
+
+    async def __call__(self, bot, step):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.per_bot_running[bot] = self.per_bot_running.get(bot, 0) + 1
+        assert self.per_bot_running[bot] == 1, f"concurrent operations on {bot}"
+        await asyncio.sleep(self.delay)
+        self.order.append((bot, step))
+        self.per_bot_running[bot] -= 1
+        self.running -= 1
+        return f"{bot}:{step}"
+
+
+class TestFanOut:
+    """Test FanOut."""
+
+    @pytest.mark.asyncio
+    async def test_global_cap(self):
+        """Test that no more than the global cap run at once."""
+        fanout = FanOut(MagicMock(), concurrency=3)
+        recorder = Recorder()
+        results = await fanout.gather([f"bot{i}" for i in range(10)], recorder, 0)
+        assert [result.value for result in results] == [f"bot{i}:0" for i in range(10)]
+        assert recorder.peak == 3
+
+    @pytest.mark.asyncio
+    async def test_per_call_cap(self):
+        """Test that a per-call cap applies on top of the global cap."""
+        fanout = FanOut(MagicMock(), concurrency=8)
+        recorder = Recorder()
+        await fanout.gather([f"bot{i}" for i in range(6)], recorder, 0, concurrency=2)
+        assert recorder.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_per_bot_fifo_across_calls(self):
+        """Test that operations on one bot are serialized in submission order."""
+        fanout = FanOut(MagicMock(), concurrency=8)
+        recorder = Recorder(delay=0.005)
+
+        async def drain(step):
+            return [result async for result in fanout.map(["a", "b", "a"], recorder, step)]
+
+        await asyncio.gather(drain(1), drain(2))
+        steps_of_a = [step for bot, step in recorder.order if bot == "a"]
+        assert steps_of_a == [1, 1, 2, 2]
+        assert recorder.peak > 1
+        assert fanout._bot_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_results_stream_in_completion_order(self):
+        """Test that fast bots are yielded before slow ones."""
+        fanout = FanOut(MagicMock(), concurrency=4)
+
+        async def op(bot):
+            await asyncio.sleep(0.05 if bot == "slow" else 0)
+            return bot
+
+        results = [result async for result in fanout.map("slow,fast", op)]
+        assert [result.bot for result in results] == ["fast", "slow"]
+        assert [result.index for result in results] == [1, 0]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_captured(self):
+        """Test that a failing bot does not abort the others."""
+        fanout = FanOut(MagicMock())
+
+        async def op(bot):
+            if bot == "bad":
+                raise ASF_BadRequest("nope")
+            return bot
+
+        results = {result.bot: result async for result in fanout.map(["good", "bad"], op)}
+        assert results["good"].unwrap() == "good"
+        assert not results["bad"].ok
+        with pytest.raises(ASF_BadRequest):
+            results["bad"].unwrap()
+
+    @pytest.mark.asyncio
+    async def test_early_exit_cancels_pending(self):
+        """Test that leaving the iteration cancels unfinished operations."""
+        fanout = FanOut(MagicMock(), concurrency=1)
+        started = []
+
+        async def op(bot):
+            started.append(bot)
+            await asyncio.sleep(0 if bot == "a" else 10)
+            return bot
+
+        iterator = fanout.map(["a", "b", "c"], op)
+        first = await iterator.__anext__()
+        await iterator.aclose()
+        assert first.bot == "a"
+        assert "c" not in started
+        assert fanout._bot_locks == {}
+
+    def test_invalid_operation(self):
+        """Test that unknown or private method names are rejected."""
+        fanout = FanOut(object())
+        with pytest.raises(ValueError, match="no operation"):
+            fanout._resolve("missing")
+        with pytest.raises(ValueError, match="Concurrency"):
+            FanOut(object(), concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_connector_map_with_bot_controller_method(self, asf_simulator):
+        """Test connector.map with a BotController method name against the simulator."""
+        async with ASFConnector(**asf_simulator.connection_params(), fanout_concurrency=2) as connector:
+            bots = list(asf_simulator.bots)
+            results = [result async for result in connector.map(bots, "pause")]
+            assert sorted(result.bot for result in results) == sorted(bots)
+            assert all(result.ok and result.value["Success"] for result in results)
+            assert all(bot.paused for bot in asf_simulator.bots.values())
@@ -0,0 +1,149 @@
+"""
+Tests for health check modes and the background health monitor.
+"""
+
+import asyncio
+
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector.config import ASFConfig
+from ASFConnector.error import ASFConnectorError, ASFNetworkError
+from ASFConnector.health import HealthCheckCache, HealthMonitor, health_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_health_cache():
+    """Start every test with an empty shared health check cache."""
+    health_cache.invalidate()
+    yield
+    health_cache.invalidate()
+
+
+def make_connector(monkeypatch, calls, fail=False, **kwargs):
+    """Build a connector whose health check records calls instead of hitting the network."""
+    connector = ASFConnector(host="127.0.0.1", port="1242", **kwargs)
+
+    async def mock_health_check():
+        calls.append(1)
+        if fail:
+            raise ASFNetworkError("Connection failed")
+        return {"Success": True, "Message": "OK"}
+
+    monkeypatch.setattr(connector, "health_check", mock_health_check)
+    return connector
+
+
+class TestHealthCheckCache:
+    """Test HealthCheckCache."""
+
+    def test_get_respects_ttl(self, monkeypatch):
+        """Test that entries expire after the TTL."""
+        cache = HealthCheckCache()
+        now = [100.0]
+        monkeypatch.setattr("ASFConnector.health.time.monotonic", lambda: now[0])
+        cache.set(("host", "1"), {"Success": True})
+        assert cache.get(("host", "1"), ttl=10) == {"Success": True}
+        now[0] = 111.0
+        assert cache.get(("host", "1"), ttl=10) is None
+
+    def test_invalidate(self):
+        """Test invalidating a single key."""
+        cache = HealthCheckCache()
+        cache.set(("host", "1"), {"Success": True})
+        cache.invalidate(("host", "1"))
+        assert cache.get(("host", "1"), ttl=10) is None
+
+
+class TestHealthCheckModes:
+    """Test health check modes on context entry."""
+
+    def test_invalid_mode(self):
+        """Test that unknown modes are rejected."""
+        with pytest.raises(ASFConnectorError):
+            ASFConnector(host="127.0.0.1", port="1242", health_check_mode="sometimes")
+
+    def test_mode_from_config(self):
+        """Test that the mode is read from ASFConfig."""
+        config = ASFConfig(asfc_health_check="skip", asfc_health_check_ttl=5)
+        connector = ASFConnector.from_config(config)
+        assert connector.health_check_mode == "skip"
+        assert connector.health_check_ttl == 5
+
+    @pytest.mark.asyncio
+    async def test_skip(self, monkeypatch):
+        """Test that skip mode performs no health check."""
+        calls = []
+        async with make_connector(monkeypatch, calls, health_check_mode="skip"):
+            pass
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_cached_reuses_recent_result(self, monkeypatch):
+        """Test that cached mode only checks once within the TTL."""
+        calls = []
+        for _ in range(3):
+            async with make_connector(monkeypatch, calls, health_check_mode="cached", health_check_ttl=60):
+                pass
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_does_not_cache_failures(self, monkeypatch):
+        """Test that failed checks are raised and not cached."""
+        calls = []
+        for _ in range(2):
+            with pytest.raises(ASFNetworkError):
+                async with make_connector(monkeypatch, calls, fail=True, health_check_mode="cached"):
+                    pass
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_background_does_not_raise(self, monkeypatch):
+        """Test that background mode returns immediately and swallows failures."""
+        calls = []
+        async with make_connector(monkeypatch, calls, fail=True, health_check_mode="background") as connector:
+            await connector._health_task
+        assert calls == [1]
+
+    @pytest.mark.asyncio
+    async def test_blocking_failure_closes_pool(self, monkeypatch):
+        """Test that a failed blocking health check closes the connection pool."""
+        calls = []
+        connector = make_connector(monkeypatch, calls, fail=True)
+        with pytest.raises(ASFNetworkError):
+            async with connector:
+                pass
+        assert connector.connection_handler._client is None
+
+
+class TestHealthMonitor:
+    """Test HealthMonitor."""
+
+    def test_invalid_interval(self):
+        """Test that non-positive intervals are rejected."""
+        with pytest.raises(ValueError, match="positive"):
+            HealthMonitor(lambda: None, interval=0)
+
+    @pytest.mark.asyncio
+    async def test_monitor_runs_periodically(self, monkeypatch):
+        """Test that the monitor checks repeatedly and stops on exit."""
+        calls = []
+        connector = make_connector(monkeypatch, calls, health_check_mode="skip", health_monitor_interval=0.01)
+        async with connector:
+            await asyncio.sleep(0.05)
+            assert connector.health_monitor.running
+        assert len(calls) >= 2
+        assert not connector.health_monitor.running
+
+    @pytest.mark.asyncio
+    async def test_monitor_records_failures(self):
+        """Test that failures are counted without stopping the monitor."""
+
+        async def failing_check():
+            raise ASFNetworkError("down")
+
+        monitor = HealthMonitor(failing_check, interval=1)
+        await monitor.run_once()
+        await monitor.run_once()
+        assert monitor.consecutive_failures == 2
+        assert isinstance(monitor.last_error, ASFNetworkError)
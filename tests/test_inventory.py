@@ -0,0 +1,117 @@
+"""
+Tests for columnar inventory aggregation.
+"""
+
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector import inventory as inventory_module
+from ASFConnector.inventory import InventoryFrame, StringTable
+from ASFConnector.simulator import ASFSimulator
+
+
+def asset(app_id, class_id, amount=1, context_id=6):
+    """Build an asset dict in the string-typed shape Steam returns."""
+    return {"appid": app_id, "contextid": str(context_id), "classid": str(class_id), "amount": str(amount)}
+
+
+INVENTORY_RESPONSE = {
+    "Success": True,
+    "Result": {
+        "bot1": {
+            "Assets": [asset(753, 1), asset(753, 1), asset(753, 2, amount=5), asset(440, 9, context_id=2)],
+            "Descriptions": [
+                {"appid": 753, "classid": "1", "type": "Game A Trading Card"},
+                {"appid": 753, "classid": "2", "type": "Gems"},
+                {"appid": 440, "classid": "9", "type": "Hat"},
+            ],
+        },
+        "bot2": {
+            "Assets": [asset(753, 1, amount=3)],
+            "Descriptions": [{"appid": 753, "classid": "1", "type": "Game A Trading Card"}],
+        },
+        "bot3": None,
+    },
+}
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    """Run each test with the NumPy backend (if installed) and the array fallback."""
+    if request.param == "numpy":
+        if inventory_module.np is None:
+            pytest.skip("NumPy is not installed")
+    else:
+        monkeypatch.setattr(inventory_module, "np", None)
+    return request.param
+
+
+class TestStringTable:
+    """Test StringTable."""
+
+    def test_intern_is_stable(self):
+        """Test that interning returns dense stable ids."""
+        table = StringTable()
+        assert table.intern("a") == 0
+        assert table.intern("b") == 1
+        assert table.intern("a") == 0
+        assert table.get("c") is None
+        assert len(table) == 2
+
+
+class TestInventoryFrame:
+    """Test InventoryFrame aggregations."""
+
+    def test_backend(self, backend):
+        """Test that the expected backend is active."""
+        assert InventoryFrame().backend == backend
+
+    def test_from_inventory(self, backend):
+        """Test loading a get_inventory response."""
+        frame = InventoryFrame.from_inventory(INVENTORY_RESPONSE)
+        assert len(frame) == 5
+        assert frame.total() == 11
+
+    def test_sum_and_count_by_bot(self, backend):
+        """Test single-column group-by."""
+        frame = InventoryFrame.from_inventory(INVENTORY_RESPONSE)
+        assert frame.sum_by("bot") == {"bot1": 8, "bot2": 3}
+        assert frame.count_by("bot") == {"bot1": 4, "bot2": 1}
+
+    def test_group_by_multiple_columns(self, backend):
+        """Test multi-column group-by with decoded string keys."""
+        frame = InventoryFrame.from_inventory(INVENTORY_RESPONSE)
+        assert frame.sum_by("appid", "type") == {
+            (753, "Game A Trading Card"): 5,
+            (753, "Gems"): 5,
+            (440, "Hat"): 1,
+        }
+
+    def test_filters(self, backend):
+        """Test value, collection and predicate filters."""
+        frame = InventoryFrame.from_inventory(INVENTORY_RESPONSE)
+        assert frame.total(appid=753, type=lambda value: "Trading Card" in value) == 5
+        assert frame.total(bot="bot2") == 3
+        assert frame.total(bot=["bot1", "bot2"], contextid=2) == 1
+        assert frame.total(bot="missing") == 0
+        assert frame.sum_by("bot", appid=440) == {"bot1": 1}
+        assert frame.sum_by("bot", appid=1) == {}
+
+    def test_unknown_column(self, backend):
+        """Test that unknown columns are rejected."""
+        frame = InventoryFrame.from_inventory(INVENTORY_RESPONSE)
+        with pytest.raises(ValueError, match="Unknown column"):
+            frame.sum_by("color")
+        with pytest.raises(ValueError, match="Unknown column"):
+            frame.total(color="red")
+
+    @pytest.mark.asyncio
+    async def test_from_stream(self, backend):
+        """Test loading from iter_inventory against the simulator."""
+        async with ASFSimulator(bots=3, inventory_size=12, seed=5) as simulator:
+            async with ASFConnector(**simulator.connection_params()) as connector:
+                frame = await InventoryFrame.from_stream(connector.bot.iter_inventory("ASF"))
+                reference = InventoryFrame.from_inventory(await connector.bot.get_inventory("ASF"))
+        assert len(frame) == 36
+        assert frame.sum_by("appid", "type") == reference.sum_by("appid", "type")
+        assert frame.total(type="Trading Card") == 12
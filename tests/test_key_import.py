@@ -0,0 +1,174 @@
+"""
+Tests for streaming key imports.
+"""
+
+import asyncio
+import io
+from unittest.mock import AsyncMock
+
+from loguru import logger
+import pytest
+
+from ASFConnector import ASFConnector, KeyLedger
+from ASFConnector.key_import import BloomFilter, import_keys, normalize_key, read_keys
+
+
+def make_key(index: int) -> str:
+    text = f"{index:015d}"
+    return f"{text[:5]}-{text[5:10]}-{text[10:]}"
+
+
+def accepting_controller(delay: float = 0.0) -> AsyncMock:
+    controller = AsyncMock()
+
+    async def add(bot, payload):
+        await asyncio.sleep(delay)
+        return {"Success": True, "Message": "OK", "Result": payload["GamesToRedeemInBackground"]}
+
+    controller.add_games_to_redeem_in_background.side_effect = add
+    return controller
+
+
+class TestReadKeys:
+    """Test key file parsing."""
+
+    def test_normalize_key(self):
+        """Test keys are upper-cased and validated."""
+        assert normalize_key(" aaaaa-bbbbb-ccccc \n") == "AAAAA-BBBBB-CCCCC"
+        assert normalize_key("not a key") is None
+
+    def test_asf_format(self):
+        """Test "name<TAB>key" and bare key lines."""
+        lines = io.StringIO("Portal\tAAAAA-BBBBB-CCCCC\nDDDDD-EEEEE-FFFFF\n\ngarbage\n")
+        assert list(read_keys(lines)) == [
+            ("AAAAA-BBBBB-CCCCC", "Portal"),
+            ("DDDDD-EEEEE-FFFFF", ""),
+            (None, ""),
+        ]
+
+    def test_csv_and_tsv_files(self, tmp_path):
+        """Test delimited files with the key in any column and format detection by suffix."""
+        csv_path = tmp_path / "keys.csv"
+        csv_path.write_text('game,key\n"Half-Life, Source",aaaaa-bbbbb-ccccc\n', encoding="utf-8")
+        tsv_path = tmp_path / "keys.tsv"
+        tsv_path.write_text("DDDDD-EEEEE-FFFFF\tPortal 2\n", encoding="utf-8")
+        assert list(read_keys(csv_path)) == [(None, "game"), ("AAAAA-BBBBB-CCCCC", "Half-Life, Source")]
+        assert list(read_keys(str(tsv_path))) == [("DDDDD-EEEEE-FFFFF", "Portal 2")]
+        with pytest.raises(ValueError, match="Unknown key file format"):
+            list(read_keys(csv_path, "xml"))
+
+
+class TestBloomFilter:
+    """Test the duplicate filter."""
+
+    def test_membership(self):
+        """Test added items are found and the size is fixed."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        size = len(bloom._bits)
+        assert bloom.add("a") is True
+        assert bloom.add("a") is False
+        assert "a" in bloom
+        for index in range(1000):
+            bloom.add(str(index))
+        assert len(bloom._bits) == size
+        false_positives = sum(f"other{index}" in bloom for index in range(1000))
+        assert false_positives < 50
+
+
+class TestImportKeys:
+    """Test streaming keys into GamesToRedeemInBackground."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_round_robin_and_dedupe(self):
+        """Test chunk sizes, bot rotation, duplicate and invalid counts."""
+        lines = [f"Game {index}\t{make_key(index % 250)}\n" for index in range(300)] + ["junk\n"]
+        controller = accepting_controller()
+        progress = []
+        stats = await import_keys(
+            controller, lines, ["a", "b"], chunk_size=100, progress=lambda s: progress.append(s.submitted)
+        )
+
+        calls = controller.add_games_to_redeem_in_background.await_args_list
+        assert [call.args[0] for call in calls] == ["a", "b", "a"]
+        assert [len(call.args[1]["GamesToRedeemInBackground"]) for call in calls] == [100, 100, 50]
+        assert calls[0].args[1]["GamesToRedeemInBackground"][make_key(0)] == "Game 0"
+        assert (stats.rows, stats.invalid, stats.duplicates, stats.submitted) == (301, 1, 50, 250)
+        assert stats.per_bot == {"a": 150, "b": 100}
+        assert progress[-1] == 250
+
+    @pytest.mark.asyncio
+    async def test_probable_duplicates_past_exact_limit(self):
+        """Test exact dedupe within exact_keys and separately counted Bloom filter drops past it."""
+        lines = [make_key(index) for index in range(20)] * 2
+        records = []
+        sink = logger.add(lambda message: records.append(message.record), level="DEBUG")
+        try:
+            stats = await import_keys(accepting_controller(), lines, "a", exact_keys=10, capacity=100, error_rate=0.01)
+        finally:
+            logger.remove(sink)
+        assert (stats.duplicates, stats.probable_duplicates, stats.submitted) == (10, 10, 20)
+        assert stats.probable_duplicate_keys == lines[10:20]
+        # Logs never carry a full key
+        assert not any(key in record["message"] for record in records for key in lines)
+        stats = await import_keys(accepting_controller(), lines, "a")
+        assert (stats.duplicates, stats.probable_duplicates, stats.submitted) == (20, 0, 20)
+
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_queued_chunks(self):
+        """Test the reader does not run ahead of slow uploads."""
+        read = 0
+
+        def lines():
+            nonlocal read
+            for index in range(1000):
+                read += 1
+                yield make_key(index)
+
+        controller = accepting_controller(delay=0.01)
+        ahead = []
+        stats = await import_keys(
+            controller, lines(), "a", chunk_size=10, concurrency=2, progress=lambda s: ahead.append(read - s.submitted)
+        )
+        assert stats.submitted == 1000
+        # At most the chunks in flight, the queued chunks and the one being filled are read ahead
+        assert max(ahead) <= 10 * (2 + 2 + 1)
+
+    @pytest.mark.asyncio
+    async def test_rejected_chunks_and_ledger(self):
+        """Test rejected chunks are counted and ledger-settled keys skipped."""
+        controller = AsyncMock()
+        controller.add_games_to_redeem_in_background.return_value = {"Success": False, "Message": "nope"}
+        with KeyLedger() as ledger:
+            ledger.record("a", make_key(0), "OK", "NoDetail")
+            stats = await import_keys(controller, [make_key(i) for i in range(3)], "a", ledger=ledger)
+        assert (stats.settled, stats.rejected, stats.submitted) == (1, 2, 0)
+
+    @pytest.mark.asyncio
+    async def test_request_error_stops_import(self):
+        """Test a failing request stops reading and propagates."""
+        read = 0
+
+        def lines():
+            nonlocal read
+            for index in range(10_000):
+                read += 1
+                yield make_key(index)
+
+        controller = AsyncMock()
+        controller.add_games_to_redeem_in_background.side_effect = RuntimeError("down")
+        with pytest.raises(RuntimeError, match="down"):
+            await import_keys(controller, lines(), "a", chunk_size=10, concurrency=2)
+        assert read < 10_000
+
+    @pytest.mark.asyncio
+    async def test_against_simulator(self, asf_simulator, tmp_path):
+        """Test an import from a file through the connector."""
+        path = tmp_path / "keys.txt"
+        path.write_text("".join(f"Game {i}\t{make_key(i)}\n" for i in range(25)), encoding="utf-8")
+        bots = list(asf_simulator.bots)[:2]
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            stats = await connector.import_keys(path, bots, chunk_size=10)
+        assert stats.submitted == 25
+        assert asf_simulator.stats["route:Bot.GamesToRedeemInBackground"] == 3
+        assert len(asf_simulator.bots[bots[0]].background_keys) == 15
+        assert asf_simulator.bots[bots[1]].background_keys[make_key(10)] == "Game 10"
@@ -0,0 +1,147 @@
+"""
+Tests for the SQLite key ledger.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ASFConnector import ASFConnector, KeyLedger
+from ASFConnector.ledger import RETRYABLE_DETAILS, redeem_new
+
+KEYS = ["AAAAA-BBBBB-CCCCC", "DDDDD-EEEEE-FFFFF", "GGGGG-HHHHH-JJJJJ"]
+
+
+def redeem_response(outcomes: dict) -> dict:
+    return {"Success": True, "Message": "OK", "Result": {"bot1": outcomes}}
+
+
+class TestKeyLedger:
+    """Test recording and filtering keys."""
+
+    def test_pending_filters_settled_keys(self):
+        """Test that redeemed and permanently failed keys are dropped, retryable ones kept."""
+        with KeyLedger() as ledger:
+            ledger.record("bot1", KEYS[0], "OK", "NoDetail")
+            ledger.record("bot1", KEYS[1], "Fail", "RateLimited")
+            ledger.record("bot1", "XXXXX-XXXXX-XXXXX", 2, 14)
+            assert ledger.pending([*KEYS, "XXXXX-XXXXX-XXXXX", KEYS[2]]) == [KEYS[1], KEYS[2]]
+            assert len(ledger) == 3
+
+    def test_failure_without_detail_is_retryable(self):
+        """Test that a failed result without a detail is sent again."""
+        with KeyLedger() as ledger:
+            ledger.record("bot1", KEYS[0], "Fail", "NoDetail")
+            assert ledger.pending([KEYS[0]]) == [KEYS[0]]
+
+    def test_outcome_counts_attempts(self):
+        """Test that re-recording a key updates its outcome and attempt count."""
+        with KeyLedger() as ledger:
+            assert ledger.outcome(KEYS[0]) is None
+            ledger.record("bot1", KEYS[0], "Fail", "Timeout")
+            ledger.record("bot2", KEYS[0], "OK", "NoDetail")
+            assert ledger.outcome(KEYS[0]) == {"bot": "bot2", "result": "OK", "detail": "NoDetail", "attempts": 2}
+
+    def test_settled_outcome_is_never_downgraded(self):
+        """Test a later retryable outcome keeps an OK, and an OK replaces a permanent failure."""
+        with KeyLedger() as ledger:
+            ledger.record_many([("bot1", KEYS[0], "OK", "NoDetail"), ("bot2", KEYS[0], "Fail", "RateLimited")])
+            assert ledger.outcome(KEYS[0]) == {"bot": "bot1", "result": "OK", "detail": "NoDetail", "attempts": 2}
+            assert ledger.pending([KEYS[0]]) == []
+            ledger.record("bot1", KEYS[1], "Fail", "AlreadyPurchased")
+            ledger.record("bot2", KEYS[1], "Fail", "Timeout")
+            assert ledger.outcome(KEYS[1])["detail"] == "AlreadyPurchased"
+            ledger.record("bot2", KEYS[1], "OK", "NoDetail")
+            assert ledger.outcome(KEYS[1])["bot"] == "bot2"
+
+    def test_custom_retryable_details(self):
+        """Test that the retryable detail set can be replaced."""
+        with KeyLedger(retryable=RETRYABLE_DETAILS | {9}) as ledger:
+            ledger.record("bot1", KEYS[0], "Fail", "AlreadyPurchased")
+            assert ledger.pending([KEYS[0]]) == [KEYS[0]]
+
+    def test_large_lookup_is_chunked(self):
+        """Test lookups larger than SQLite's parameter limit."""
+        keys = [f"KEY{index:05d}" for index in range(2500)]
+        with KeyLedger() as ledger:
+            ledger.record_many(("bot1", key, "OK", "NoDetail") for key in keys[::2])
+            assert ledger.pending(keys) == keys[1::2]
+
+    def test_persists_to_file(self, tmp_path):
+        """Test that outcomes survive reopening the database."""
+        path = str(tmp_path / "keys.sqlite3")
+        with KeyLedger(path) as ledger:
+            ledger.record("bot1", KEYS[0], "OK", "NoDetail")
+        with KeyLedger(path) as ledger:
+            assert ledger.pending(KEYS) == KEYS[1:]
+
+    def test_record_response(self):
+        """Test recording a redeem response, skipping keys without an outcome."""
+        response = redeem_response(
+            {
+                KEYS[0]: {"Result": 1, "PurchaseResultDetail": 0},
+                KEYS[1]: {"Result": 2, "PurchaseResultDetail": 15},
+                KEYS[2]: None,
+            }
+        )
+        with KeyLedger() as ledger:
+            assert ledger.record_response(response) == 2
+            assert ledger.outcome(KEYS[1])["detail"] == "DuplicateActivationCode"
+            assert ledger.pending(KEYS) == [KEYS[2]]
+
+
+class TestRedeemNew:
+    """Test redeeming through the ledger."""
+
+    @pytest.mark.asyncio
+    async def test_only_pending_keys_are_sent(self):
+        """Test that settled keys are skipped and new outcomes recorded."""
+        bot_controller = AsyncMock()
+        bot_controller.redeem.return_value = redeem_response({KEYS[1]: {"Result": 1, "PurchaseResultDetail": 0}})
+        with KeyLedger() as ledger:
+            ledger.record("bot1", KEYS[0], "OK", "NoDetail")
+            response, skipped = await redeem_new(bot_controller, "bot1", KEYS[:2], ledger)
+            bot_controller.redeem.assert_awaited_once_with("bot1", [KEYS[1]])
+            assert skipped == [KEYS[0]]
+            assert response["Success"] is True
+
+            response, skipped = await redeem_new(bot_controller, "bot1", KEYS[:2], ledger)
+            assert response is None
+            assert skipped == KEYS[:2]
+            assert bot_controller.redeem.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_keys_are_normalized(self):
+        """Test keys are matched against the ledger in the normalized form import_keys() records."""
+        bot_controller = AsyncMock()
+        with KeyLedger() as ledger:
+            ledger.record("bot1", KEYS[0], "OK", "NoDetail")
+            response, skipped = await redeem_new(bot_controller, "bot1", [f" {KEYS[0].lower()} "], ledger)
+        assert (response, skipped) == (None, [KEYS[0]])
+
+    @pytest.mark.asyncio
+    async def test_connector_closes_ledger_it_opened(self, asf_simulator, tmp_path):
+        """Test a ledger opened from a path is closed on exit and reopened when used again."""
+        path = str(tmp_path / "keys.sqlite3")
+        connector = ASFConnector(**asf_simulator.connection_params(), key_ledger=path)
+        async with connector:
+            await connector.redeem_report("bot00000", KEYS[:1])
+        assert connector.ledger is None
+        assert (await connector.redeem_report("bot00000", KEYS[:1])).skipped == KEYS[:1]
+        connector.ledger.close()
+
+    @pytest.mark.asyncio
+    async def test_connector_redeem_report_uses_ledger(self, asf_simulator):
+        """Test that a connector with a ledger does not resend settled keys."""
+        with KeyLedger() as ledger:
+            async with ASFConnector(**asf_simulator.connection_params(), key_ledger=ledger) as connector:
+                first = await connector.redeem_report("bot00000", [*KEYS, "not-a-key"])
+                second = await connector.redeem_report("bot00000", [*KEYS, "NEWKY-NEWKY-NEWKY"])
+                text = await connector.bot_redeem("bot00000", KEYS)
+
+        assert first.per_detail == {"NoDetail": 3, "BadActivationCode": 1}
+        assert [entry.key for entry in second.entries] == ["NEWKY-NEWKY-NEWKY"]
+        assert second.skipped == KEYS
+        assert second.summary()["skipped"] == 3
+        assert text == "Skipped 3 key(s) already settled in the key ledger.\n"
+        assert asf_simulator.stats["route:Bot.Redeem"] == 2
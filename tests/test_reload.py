@@ -0,0 +1,168 @@
+"""
+Tests for multi-host configuration and hot reload.
+"""
+
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from ASFConnector import ASFConfig, ASFConnector, ASFConnectorError, ASFEndpoint, ConfigWatcher
+from ASFConnector.config import asf_config, update_shared_config
+from ASFConnector.IPCProtocol import IPCProtocolHandler
+from ASFConnector.scheduler import RequestScheduler
+from ASFConnector.simulator import ASFSimulator, FaultProfile, constant_latency
+
+
+def write_env(path, **values):
+    path.write_text("".join(f"{key.upper()}={value}\n" for key, value in values.items()), encoding="utf-8")
+    # Make sure the modification time moves even on coarse-grained filesystems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestReconfigure:
+    """Test IPCProtocolHandler.reconfigure."""
+
+    @pytest.mark.asyncio
+    async def test_address_and_password_keep_the_pool(self):
+        """Test host, path and password changes reuse the pooled client."""
+        seen = []
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            seen.append((str(request.url), request.headers.get("Authentication")))
+            return httpx.Response(200, json={"Success": True})
+
+        handler = IPCProtocolHandler("a", "1242", "/Api", "one", transport=httpx.MockTransport(respond))
+        async with handler:
+            client = handler._client
+            await handler.get("/ASF")
+            assert await handler.reconfigure("b", "1243", "/Api2", "two") is False
+            await handler.get("/ASF")
+            assert handler._client is client
+        assert seen == [("http://a:1242/Api/ASF", "one"), ("http://b:1243/Api2/ASF", "two")]
+
+    @pytest.mark.asyncio
+    async def test_limits_change_retires_pool_after_in_flight_requests(self):
+        """Test a new pool serves new requests while the old one finishes its request first."""
+        profile = FaultProfile(latency=constant_latency(0.2))
+        async with ASFSimulator(bots=1, seed=1, profile=profile) as simulator:
+            params = simulator.connection_params()
+            handler = IPCProtocolHandler(params["host"], str(params["port"]), params["path"])
+            async with handler:
+                old = handler._client
+                in_flight = asyncio.create_task(handler.get("/ASF"))
+                await asyncio.sleep(0.05)
+                limits = httpx.Limits(max_connections=5)
+                assert await handler.reconfigure(params["host"], str(params["port"]), params["path"], limits=limits)
+                assert handler._client is not old
+                assert old in handler._retired_clients
+                assert not old.is_closed
+                assert (await handler.get("/ASF"))["Success"] is True
+                assert (await in_flight)["Success"] is True
+                assert old.is_closed
+                assert handler._retired_clients == set()
+
+    @pytest.mark.asyncio
+    async def test_health_check_holds_client_and_slot(self):
+        """Test a health check in flight counts as a client user and a scheduler slot across a pool swap."""
+        profile = FaultProfile(route_latency={"HealthCheck": constant_latency(0.2)}, fault_health_check=True)
+        async with ASFSimulator(bots=1, seed=1, profile=profile) as simulator:
+            params = simulator.connection_params()
+            async with ASFConnector(**params, health_check_mode="skip") as connector:
+                handler = connector.connection_handler
+                old = handler._client
+                check = asyncio.create_task(connector.health_check())
+                await asyncio.sleep(0.05)
+                assert connector.scheduler.in_flight == 1
+                limits = httpx.Limits(max_connections=5)
+                assert await handler.reconfigure(params["host"], str(params["port"]), params["path"], limits=limits)
+                assert not old.is_closed
+                assert (await check)["Success"] is True
+                assert old.is_closed
+                assert connector.scheduler.in_flight == 0
+
+    def test_scheduler_resize(self):
+        """Test resizing the in-flight cap."""
+        scheduler = RequestScheduler(2)
+        scheduler.resize(0)
+        assert scheduler.max_in_flight is None
+        scheduler.resize(4)
+        assert scheduler.max_in_flight == 4
+
+
+class TestEndpoints:
+    """Test connectors created from configured endpoints."""
+
+    def test_connector_from_named_endpoint(self):
+        """Test the endpoint's address and limits are used."""
+        config = ASFConfig(
+            asf_endpoints=[
+                {"name": "eu", "host": "10.0.0.5", "max_in_flight": 3, "max_connections": 7},
+                {"name": "us", "host": "10.1.0.5", "password": "pw"},
+            ]
+        )
+        connector = ASFConnector.from_config(config, endpoint="eu")
+        assert (connector.host, connector.endpoint, connector.scheduler.max_in_flight) == ("10.0.0.5", "eu", 3)
+        assert connector.connection_handler.limits.max_connections == 7
+        assert ASFConnector.from_config(config).endpoint == "eu"
+        us = ASFConnector(endpoint=ASFEndpoint(name="us", host="10.1.0.5", password="pw"))
+        assert us.connection_handler.headers["Authentication"] == "pw"
+        with pytest.raises(ASFConnectorError, match="Unknown endpoint"):
+            ASFConnector.from_config(config, endpoint="asia")
+
+    @pytest.mark.asyncio
+    async def test_apply_config_requires_endpoint(self):
+        """Test connectors built from host and port cannot follow a config."""
+        with pytest.raises(ASFConnectorError, match="config endpoint"):
+            await ASFConnector(host="asf", port="1242").apply_config(ASFConfig())
+
+
+class TestConfigWatcher:
+    """Test reloading an env file into running connectors."""
+
+    @pytest.mark.asyncio
+    async def test_reload_moves_connector_between_simulators(self, tmp_path):
+        """Test a changed .env retargets a live connector and invalid files are ignored."""
+        env = tmp_path / ".env"
+        async with ASFSimulator(bots=["first"], seed=1) as first, ASFSimulator(bots=["second"], seed=2) as second:
+            write_env(env, asf_host=first.host, asf_port=first.port, asf_path="/Api", asfc_max_in_flight=4)
+            watcher = ConfigWatcher(env, interval=0.01)
+            reloaded = []
+            connector = ASFConnector.from_config(watcher.config, health_check_mode="skip")
+            async with connector, watcher.attach(connector).on_reload(reloaded.append):
+                assert set((await connector.bot.get_info("ASF"))["Result"]) == {"first"}
+                client = connector.connection_handler._client
+
+                write_env(env, asf_host=second.host, asf_port=second.port, asf_path="/Api", asfc_max_in_flight=9)
+                for _ in range(200):
+                    await asyncio.sleep(0.01)
+                    if watcher.reloads:
+                        break
+                assert set((await connector.bot.get_info("ASF"))["Result"]) == {"second"}
+                assert connector.connection_handler._client is client
+                assert connector.scheduler.max_in_flight == 9
+                assert reloaded == [watcher.config]
+
+                write_env(env, asf_port="not-a-port")
+                assert await watcher.check() is False
+                assert watcher.failures == 1
+                assert connector.port == str(second.port)
+
+    @pytest.mark.asyncio
+    async def test_reload_refreshes_shared_config(self, tmp_path):
+        """Test a shared watcher updates asf_config, so from_config() without arguments follows the file."""
+        env = tmp_path / ".env"
+        write_env(env, asf_host="first.example", asf_port=1242)
+        original = asf_config.model_copy()
+        try:
+            assert ConfigWatcher(env).shared is False
+            watcher = ConfigWatcher(env, shared=True)
+            write_env(env, asf_host="second.example", asf_port=1243)
+            assert await watcher.check() is True
+            assert asf_config.asf_host == "second.example"
+            connector = ASFConnector.from_config(health_check_mode="skip")
+            assert (connector.host, connector.port) == ("second.example", "1243")
+        finally:
+            update_shared_config(original)
@@ -0,0 +1,115 @@
+"""
+Tests for recording and replaying IPC traffic.
+"""
+
+import gzip
+import json
+import time
+
+import httpx
+import pytest
+
+from ASFConnector import ASFConnector, RecordingTransport, ReplayTransport
+from ASFConnector.replay import load_capture
+
+
+def capture_record(target: str, duration: float, result, method="GET", body=None) -> dict:
+    return {
+        "d": duration,
+        "method": method,
+        "target": target,
+        "body": body,
+        "status": 200,
+        "headers": [["content-type", "application/json"]],
+        "text": json.dumps({"Message": "OK", "Result": result, "Success": True}),
+    }
+
+
+class TestRecordAndReplay:
+    """Test captures taken against the simulator replay identically."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, asf_simulator, tmp_path):
+        """Test bot info, redeem and a compressed inventory replay without the simulator."""
+        path = tmp_path / "capture.jsonl.gz"
+        params = asf_simulator.connection_params()
+        bot = next(iter(asf_simulator.bots))
+        async with RecordingTransport(path) as recorder:
+            async with ASFConnector(**params, transport=recorder) as connector:
+                info = await connector.get_bot_info(bot)
+                redeemed = await connector.bot_redeem(bot, "AAAAA-BBBBB-CCCCC")
+                inventory = await connector.bot.get_inventory(bot)
+        assert recorder.recorded == 4  # including the health check
+
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            text = file.read()
+        assert "Authentication" not in text
+        records = load_capture(path)
+        assert [record["target"] for record in records][:2] == ["/HealthCheck", f"/Api/Bot/{bot}"]
+        assert records[2]["method"] == "POST"
+        assert json.loads(records[2]["body"]) == {"KeysToRedeem": ["AAAAA-BBBBB-CCCCC"]}
+
+        replay = ReplayTransport(path, speed=float("inf"))
+        async with ASFConnector(host=params["host"], port=params["port"], path=params["path"], transport=replay) as c:
+            assert await c.get_bot_info(bot) == info
+            assert await c.bot_redeem(bot, "AAAAA-BBBBB-CCCCC") == redeemed
+            assert await c.bot.get_inventory(bot) == inventory
+        assert replay.remaining() == 0
+        assert replay.misses == []
+
+    @pytest.mark.asyncio
+    async def test_non_utf8_body_round_trip(self, tmp_path):
+        """Test a body that is not valid UTF-8 is recorded without failing the request and replayed byte for byte."""
+        path = tmp_path / "capture.jsonl.gz"
+        body = b"\xff\xfeNLog \xe9"
+        upstream = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+        async with RecordingTransport(path, transport=upstream) as recorder:
+            async with httpx.AsyncClient(transport=recorder, base_url="http://asf") as client:
+                assert (await client.get("/Api/NLog/File")).content == body
+        records = load_capture(path)
+        assert "b64" in records[0]
+        assert "t" not in records[0]
+
+        async with httpx.AsyncClient(transport=ReplayTransport(records), base_url="http://asf") as client:
+            assert (await client.get("/Api/NLog/File")).content == body
+
+
+class TestReplayTransport:
+    """Test matching, misses and speed scaling."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_requests_and_misses(self):
+        """Test repeated requests are answered in order, then cycled or missed."""
+        records = [capture_record("/Api/ASF", 0, 1), capture_record("/Api/ASF", 0, 2)]
+        async with httpx.AsyncClient(transport=ReplayTransport(records), base_url="http://asf") as client:
+            results = [(await client.get("/Api/ASF")).json()["Result"] for _ in range(2)]
+            missed = await client.get("/Api/ASF")
+        assert results == [1, 2]
+        assert missed.status_code == 404
+
+        transport = ReplayTransport(records, cycle=True)
+        async with httpx.AsyncClient(transport=transport, base_url="http://asf") as client:
+            results = [(await client.get("/Api/ASF")).json()["Result"] for _ in range(3)]
+            await client.get("/Api/Bot/none")
+        assert results == [1, 2, 1]
+        assert transport.misses == ["GET /Api/Bot/none"]
+
+    @pytest.mark.asyncio
+    async def test_speed_scales_latency(self):
+        """Test recorded durations are divided by the speed."""
+        transport = ReplayTransport([capture_record("/Api/ASF", 0.5, None)], speed=10)
+        async with httpx.AsyncClient(transport=transport, base_url="http://asf") as client:
+            start = time.perf_counter()
+            await client.get("/Api/ASF")
+            elapsed = time.perf_counter() - start
+        assert 0.04 <= elapsed < 0.3
+        with pytest.raises(ValueError, match="Speed must be positive"):
+            ReplayTransport([], speed=0)
+
+    def test_rejects_unknown_capture_version(self, tmp_path):
+        """Test captures of another format version are refused."""
+        path = tmp_path / "capture.jsonl.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write('{"version": 99}\n')
+        with pytest.raises(ValueError, match="Unsupported capture version"):
+            load_capture(path)
@@ -0,0 +1,168 @@
+"""
+Tests for structured redeem and bot info reports.
+"""
+
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from ASFConnector import PurchaseResultDetail, Result
+from ASFConnector.reports import BotInfoReport, RedeemReport, decode_codes, render
+
+BOT_INFO_RESPONSE = {
+    "Success": True,
+    "Result": {
+        "a": {
+            "IsConnectedAndLoggedOn": True,
+            "BotConfig": {"Enabled": True},
+            "CardsFarmer": {
+                "Paused": False,
+                "CurrentGamesFarming": [{"AppID": 10, "GameName": "G10", "CardsRemaining": 3}],
+                "GamesToFarm": [{"AppID": 10, "GameName": "G10"}, {"AppID": 20, "GameName": "G20"}],
+                "TimeRemaining": "01:00:00",
+            },
+        },
+        "b": {
+            "IsConnectedAndLoggedOn": True,
+            "BotConfig": {"Enabled": True},
+            "CardsFarmer": {"Paused": True, "CurrentGamesFarming": [], "GamesToFarm": [], "TimeRemaining": "00:00:00"},
+        },
+        "c": {
+            "IsConnectedAndLoggedOn": True,
+            "BotConfig": {"Enabled": True},
+            "CardsFarmer": {"Paused": False, "CurrentGamesFarming": [], "GamesToFarm": [], "TimeRemaining": "00:00:00"},
+        },
+        "d": {"IsConnectedAndLoggedOn": False, "BotConfig": {"Enabled": True}, "CardsFarmer": {}},
+        "e": {"IsConnectedAndLoggedOn": False, "BotConfig": {}, "CardsFarmer": {}},
+    },
+}
+
+# Output of the string-concatenating get_bot_info() implementation for BOT_INFO_RESPONSE
+BOT_INFO_TEXT = (
+    "Bot a: Currently farming games:\n\t[10/G10] 3 cards remaining. 2 game(s) to farm ([10/G10] [20/G20]). "
+    "Time remaining: 01:00:00\nBot b: Farming paused.\nBot c: Idle.\nBot d: Offline.\nBot e: Not configured.\n"
+)
+
+REDEEM_RESPONSE = {
+    "Success": True,
+    "Result": {
+        "a": {
+            "K1": {"Result": 1, "PurchaseResultDetail": 0},
+            "K2": {"Result": "Fail", "PurchaseResultDetail": "AlreadyPurchased"},
+            "K3": None,
+        },
+        "b": {
+            "K4": {
+                "Result": 2,
+                "PurchaseResultDetail": 9,
+                "purchase_receipt_info": {
+                    "purchase_status": 2,
+                    "result_detail": 9,
+                    "line_items": [
+                        {"packageid": 5, "line_item_description": "Pkg5"},
+                        {"packageid": 6, "line_item_description": "Pkg6"},
+                    ],
+                },
+            }
+        },
+    },
+}
+
+# Output of the string-concatenating bot_redeem() implementation for REDEEM_RESPONSE
+REDEEM_TEXT = (
+    "Bot a: \n\t[K1] OK/NoDetail\nBot a: \n\t[K2] Fail/AlreadyPurchased\n"
+    "Bot b: \n\t[K4] [5, Pkg5] [6, Pkg6] : Fail/AlreadyPurchased\n"
+)
+
+
+class TestRedeemReport:
+    """Test RedeemReport."""
+
+    def test_decode_codes(self):
+        """Test bulk decoding with pass-through strings and unknown codes."""
+        assert decode_codes([1, "Fail", 999], Result) == ["OK", "Fail", "999"]
+        assert decode_codes([0, 9], PurchaseResultDetail) == ["NoDetail", "AlreadyPurchased"]
+
+    def test_entries_and_tallies(self):
+        """Test that entries and tallies are built from the response."""
+        report = RedeemReport.from_response(REDEEM_RESPONSE)
+        assert [(entry.bot, entry.key, entry.detail) for entry in report.entries] == [
+            ("a", "K1", "NoDetail"),
+            ("a", "K2", "AlreadyPurchased"),
+            ("b", "K4", "AlreadyPurchased"),
+        ]
+        assert report.entries[2].items == [(5, "Pkg5"), (6, "Pkg6")]
+        assert report.per_detail == {"NoDetail": 1, "AlreadyPurchased": 2}
+        assert report.summary()["per_bot"] == {
+            "a": {"NoDetail": 1, "AlreadyPurchased": 1},
+            "b": {"AlreadyPurchased": 1},
+        }
+
+    def test_text_matches_classic_output(self):
+        """Test that the text renderer reproduces the classic output exactly."""
+        assert RedeemReport.from_response(REDEEM_RESPONSE).to_text() == REDEEM_TEXT
+        assert RedeemReport.from_response({"Success": True}, "zz").to_text() == "Bot zz not found."
+        assert RedeemReport.from_response({"Success": False, "Message": "boom"}).to_text() == "Redeem failed: boom"
+
+    def test_jsonl_and_table(self):
+        """Test the JSON lines and table renderers."""
+        report = RedeemReport.from_response(REDEEM_RESPONSE)
+        lines = render(report, "jsonl").splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[0]) == {"bot": "a", "key": "K1", "result": "OK", "detail": "NoDetail", "items": None}
+
+        table = render(report, "table").splitlines()
+        assert table[0].split() == ["BOT", "KEY", "RESULT", "DETAIL"]
+        assert table[2].split() == ["a", "K1", "OK", "NoDetail"]
+        assert len(table) == 5
+
+    def test_render_streams_to_output(self):
+        """Test that rendering to a stream writes entry by entry."""
+        keys = {f"KEY{i}": {"Result": 1, "PurchaseResultDetail": 0} for i in range(5000)}
+        response = {"Success": True, "Result": {"bot": keys}}
+        report = RedeemReport.from_response(response)
+        out = io.StringIO()
+        with patch.object(out, "write", wraps=out.write) as write:
+            assert render(report, "jsonl", out) is None
+        assert write.call_count == 5000
+        assert out.getvalue().count("\n") == 5000
+
+    def test_unknown_format(self):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError, match="Unknown report format"):
+            render(RedeemReport(), "xml")
+
+
+class TestBotInfoReport:
+    """Test BotInfoReport."""
+
+    def test_states(self):
+        """Test per-bot states and the state tally."""
+        report = BotInfoReport.from_response(BOT_INFO_RESPONSE)
+        assert [status.state for status in report.bots] == ["farming", "paused", "idle", "offline", "not_configured"]
+        assert report.bots[0].current_games == [(10, "G10", 3)]
+        assert report.summary() == {
+            "bots": 5,
+            "per_state": {"farming": 1, "paused": 1, "idle": 1, "offline": 1, "not_configured": 1},
+        }
+
+    def test_text_matches_classic_output(self):
+        """Test that the text renderer reproduces the classic output exactly."""
+        assert BotInfoReport.from_response(BOT_INFO_RESPONSE).to_text() == BOT_INFO_TEXT
+        assert BotInfoReport.from_response({"Success": True}, "zz").to_text() == "Bot zz not found."
+        failed = BotInfoReport.from_response({"Success": False, "Message": "boom"})
+        assert failed.to_text() == "Getting bot info failed: boom"
+        assert render(failed, "jsonl") == '{"message": "Getting bot info failed: boom"}\n'
+
+    @pytest.mark.asyncio
+    async def test_connector_methods(self, mock_asf_connector):
+        """Test that the classic connector helpers render the reports."""
+        with patch.object(mock_asf_connector.bot, "get_info", return_value=BOT_INFO_RESPONSE):
+            assert await mock_asf_connector.get_bot_info("ASF") == BOT_INFO_TEXT
+            report = await mock_asf_connector.bot_info_report("ASF")
+            assert report.per_state["offline"] == 1
+        with patch.object(mock_asf_connector.bot, "redeem", return_value=REDEEM_RESPONSE):
+            assert await mock_asf_connector.bot_redeem("ASF", ["K1"]) == REDEEM_TEXT
+            assert len((await mock_asf_connector.redeem_report("ASF", ["K1"])).entries) == 3
@@ -0,0 +1,127 @@
+"""
+Tests for priority scheduling of IPC requests.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector.scheduler import Priority, RequestScheduler, classify, priority
+from ASFConnector.simulator import ASFSimulator, FaultProfile, constant_latency
+
+
+class TestClassify:
+    """Test request classification."""
+
+    def test_route_classes(self):
+        """Test that routes map to the expected priority classes."""
+        assert classify("/Bot/bot1/TwoFactorAuthentication/Token") is Priority.INTERACTIVE
+        assert classify("/Bot/bot1/Input") is Priority.INTERACTIVE
+        assert classify("/Bot/ASF/Inventory") is Priority.BULK
+        assert classify("/Bot/ASF/Inventory/753/6") is Priority.BULK
+        assert classify("/Bot/bot1/Redeem") is Priority.BULK
+        assert classify("/Bot/ASF") is Priority.NORMAL
+        assert classify("/ASF") is Priority.NORMAL
+
+    def test_override(self):
+        """Test that the priority() context overrides route classification."""
+        with priority("bulk"):
+            assert classify("/Bot/bot1/TwoFactorAuthentication/Token") is Priority.BULK
+            with priority(Priority.INTERACTIVE):
+                assert classify("/Bot/ASF/Inventory") is Priority.INTERACTIVE
+        assert classify("/Bot/ASF/Inventory") is Priority.BULK
+
+
+class TestRequestScheduler:
+    """Test RequestScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_in_flight_cap(self):
+        """Test that no more than max_in_flight slots are held."""
+        scheduler = RequestScheduler(max_in_flight=2)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with scheduler.slot(Priority.NORMAL):
+                peak = max(peak, scheduler.in_flight)
+                await asyncio.sleep(0.005)
+
+        await asyncio.gather(*(request() for _ in range(8)))
+        assert peak == 2
+        assert scheduler.in_flight == 0
+        assert scheduler.stats["requests:normal"] == 8
+
+    @pytest.mark.asyncio
+    async def test_weighted_fair_order(self):
+        """Test that freed slots favour higher weighted classes without starving bulk."""
+        scheduler = RequestScheduler(max_in_flight=1, weights={Priority.INTERACTIVE: 4, Priority.BULK: 1})
+        order = []
+        await scheduler.acquire(Priority.NORMAL)
+
+        async def request(level, index):
+            async with scheduler.slot(level):
+                order.append((level, index))
+
+        tasks = [asyncio.create_task(request(Priority.BULK, index)) for index in range(3)]
+        tasks += [asyncio.create_task(request(Priority.INTERACTIVE, index)) for index in range(8)]
+        await asyncio.sleep(0)
+        assert scheduler.queued[Priority.INTERACTIVE] == 8
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+        levels = [level for level, _ in order]
+        # Bulk gets roughly one slot per four interactive ones instead of waiting for all of them
+        assert levels.index(Priority.BULK) <= 4
+        assert levels[:4].count(Priority.INTERACTIVE) >= 3
+        # FIFO within a class
+        assert [index for level, index in order if level is Priority.INTERACTIVE] == list(range(8))
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak(self):
+        """Test that a cancelled waiter neither holds nor blocks a slot."""
+        scheduler = RequestScheduler(max_in_flight=1)
+        await scheduler.acquire()
+        waiter = asyncio.create_task(scheduler.acquire(Priority.BULK))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        scheduler.release()
+        assert scheduler.in_flight == 0
+        async with scheduler.slot():
+            assert scheduler.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_unlimited(self):
+        """Test that a cap of 0 disables queuing."""
+        scheduler = RequestScheduler(max_in_flight=0)
+        for _ in range(100):
+            await scheduler.acquire()
+        assert scheduler.in_flight == 100
+        assert scheduler.stats["queued:normal"] == 0
+
+    def test_invalid_weights(self):
+        """Test that weights must be positive."""
+        with pytest.raises(ValueError, match="positive"):
+            RequestScheduler(weights={Priority.BULK: 0})
+
+    @pytest.mark.asyncio
+    async def test_interactive_latency_under_bulk_load(self):
+        """Test that 2FA tokens overtake a queue of inventory requests against the simulator."""
+        profile = FaultProfile(route_latency={"Bot.Inventory": constant_latency(0.05)})
+        async with ASFSimulator(bots=2, profile=profile, seed=1) as simulator:
+            params = simulator.connection_params()
+            async with ASFConnector(**params, max_in_flight=2, health_check_mode="skip") as connector:
+                bulk = [asyncio.create_task(connector.bot.get_inventory("ASF")) for _ in range(10)]
+                await asyncio.sleep(0.01)
+                started = time.perf_counter()
+                token = await connector.twofa.get_token(next(iter(simulator.bots)))
+                latency = time.perf_counter() - started
+                await asyncio.gather(*bulk)
+        assert token["Success"]
+        # Behind ten 50 ms inventories on two slots it would wait ~250 ms in FIFO order
+        assert latency < 0.15
+        assert connector.scheduler.stats["queued:interactive"] == 1
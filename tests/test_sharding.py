@@ -0,0 +1,120 @@
+"""
+Tests for the multi-process sharded poller.
+"""
+
+import asyncio
+
+import pytest
+
+from ASFConnector.sharding import ShardedPoller, decode_deltas, encode_deltas, shard_bots
+from ASFConnector.simulator import ASFSimulator
+from ASFConnector.watcher import BotDelta
+
+
+async def collect(subscription, count: int, timeout: float = 20) -> list[BotDelta]:
+    deltas = []
+
+    async def read():
+        async for delta in subscription:
+            deltas.append(delta)
+            if len(deltas) == count:
+                return
+
+    await asyncio.wait_for(read(), timeout)
+    return deltas
+
+
+class TestSharding:
+    """Test bot assignment and delta encoding."""
+
+    def test_shard_bots_is_stable_and_complete(self):
+        """Test every bot lands in exactly one shard, the same one on every run."""
+        names = [f"bot{index}" for index in range(1000)]
+        shards = shard_bots(names + names[:10], 4)
+        assert sorted(name for shard in shards for name in shard) == sorted(names)
+        assert shards == shard_bots(names, 4)
+        assert all(150 < len(shard) < 350 for shard in shards)
+        with pytest.raises(ValueError, match="at least 1"):
+            shard_bots(names, 0)
+
+    def test_delta_round_trip(self):
+        """Test deltas survive compact encoding."""
+        deltas = [
+            BotDelta("a", "added", {"online": (None, True), "paused": (None, False)}),
+            BotDelta("b", "changed", {"farming": (("1",), ())}),
+            BotDelta("c", "removed", {}),
+        ]
+        encoded = encode_deltas(deltas)
+        assert encoded[2] == ("c", 1, ())
+        assert decode_deltas(encoded) == deltas
+
+
+class TestShardedPoller:
+    """Test worker processes against the simulator."""
+
+    @pytest.mark.asyncio
+    async def test_merges_deltas_and_restarts_workers(self):
+        """Test initial snapshot, change deltas and recovery from a killed worker."""
+        async with ASFSimulator(bots=12, seed=7) as simulator:
+            names = list(simulator.bots)
+            poller = ShardedPoller(simulator.connection_params(), names, shards=2, interval=0.1, restart_delay=0)
+            async with poller:
+                subscription = poller.subscribe()
+                added = await collect(subscription, len(names))
+                assert {delta.bot for delta in added} == set(names)
+                assert {delta.kind for delta in added} == {"added"}
+                assert poller.get(names[0])["online"] == simulator.bots[names[0]].online
+
+                simulator.bots[names[0]].paused = not simulator.bots[names[0]].paused
+                (changed,) = await collect(subscription, 1)
+                assert changed.bot == names[0]
+                assert changed.kind == "changed"
+                assert poller.get(names[0])["paused"] == simulator.bots[names[0]].paused
+
+                polls_before = poller.polls[0]
+                poller._processes[0].kill()
+                for _ in range(400):
+                    await asyncio.sleep(0.05)
+                    if poller.restarts and poller.polls[0] >= polls_before + 2:
+                        break
+                assert poller.restarts == 1
+                # The restarted worker's first snapshot matches what the parent knew
+                assert subscription._queue.empty()
+
+            assert poller._processes == []
+            assert poller.errors == 0
+
+    @pytest.mark.asyncio
+    async def test_dead_worker_does_not_spin(self):
+        """Test the merge loop keeps waiting on its timeout, not spinning, while a dead worker awaits restart."""
+        async with ASFSimulator(bots=2, seed=7) as simulator:
+            names = list(simulator.bots)
+            poller = ShardedPoller(simulator.connection_params(), names, shards=1, interval=0.1, restart_delay=0.6)
+            async with poller:
+                await collect(poller.subscribe(), len(names))
+                receive = poller._receive
+                calls = 0
+
+                def counting_receive():
+                    nonlocal calls
+                    calls += 1
+                    return receive()
+
+                poller._receive = counting_receive
+                poller._processes[0].kill()
+                await asyncio.sleep(0.5)
+                assert poller.restarts == 0
+                assert calls <= 6
+                for _ in range(100):
+                    await asyncio.sleep(0.05)
+                    if poller.restarts:
+                        break
+                assert poller.restarts == 1
+                assert poller._closed == set()
+
+    def test_rejects_invalid_settings(self):
+        """Test interval and chunk size validation."""
+        with pytest.raises(ValueError, match="Interval"):
+            ShardedPoller({}, ["a"], interval=0)
+        with pytest.raises(ValueError, match="Chunk size"):
+            ShardedPoller({}, ["a"], chunk_size=0)
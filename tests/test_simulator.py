@@ -0,0 +1,154 @@
+"""
+Tests for the local ASF IPC simulator.
+"""
+
+from pydantic import ValidationError
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector.error import ASF_BadRequest, ASF_NotFound, ASF_Unauthorized, ASFNetworkError
+from ASFConnector.simulator import ASFSimulator, FaultProfile, constant_latency, parse_latency
+
+
+class TestFaultProfile:
+    """Test FaultProfile validation."""
+
+    def test_rejects_invalid_rate(self):
+        """Test that rates outside [0, 1] are rejected."""
+        with pytest.raises(ValidationError):
+            FaultProfile(drop_rate=1.5)
+
+    def test_rejects_non_error_status(self):
+        """Test that non-error statuses are rejected."""
+        with pytest.raises(ValidationError):
+            FaultProfile(error_rates={200: 0.1})
+
+    def test_rejects_error_rates_above_one(self):
+        """Test that error rates summing above one are rejected."""
+        with pytest.raises(ValidationError):
+            FaultProfile(error_rates={400: 0.6, 404: 0.6})
+
+    def test_parse_latency(self):
+        """Test latency specification parsing."""
+        distribution = parse_latency("constant:0.25")
+        assert distribution(None) == 0.25
+        with pytest.raises(ValueError, match="Unknown latency distribution"):
+            parse_latency("gamma:1")
+
+
+class TestSimulatorRoutes:
+    """Test that the simulator serves the controller routes."""
+
+    @pytest.mark.asyncio
+    async def test_health_check_and_asf_info(self, asf_simulator):
+        """Test health check and ASF info through the connector."""
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            info = await connector.asf.get_info()
+            assert info["Success"] is True
+            assert info["Result"]["Version"]
+
+    @pytest.mark.asyncio
+    async def test_all_bots(self, asf_simulator):
+        """Test that ASF selects the whole fleet."""
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            response = await connector.bot.get_info("ASF")
+            assert set(response["Result"]) == set(asf_simulator.bots)
+            bot = next(iter(response["Result"].values()))
+            assert "TimeRemaining" in bot["CardsFarmer"]
+
+    @pytest.mark.asyncio
+    async def test_bot_lifecycle_routes(self, asf_simulator):
+        """Test start, stop, pause and resume update simulated state."""
+        name = next(iter(asf_simulator.bots))
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            await connector.bot.stop(name)
+            assert asf_simulator.bots[name].online is False
+            await connector.bot.start(name)
+            await connector.bot.pause(name)
+            assert asf_simulator.bots[name].online is True
+            assert asf_simulator.bots[name].paused is True
+            await connector.bot.resume(name)
+            assert asf_simulator.bots[name].paused is False
+
+    @pytest.mark.asyncio
+    async def test_redeem_results(self, asf_simulator):
+        """Test that redeem results decode through Result and PurchaseResultDetail."""
+        name = next(iter(asf_simulator.bots))
+        asf_simulator.bots[name].online = True
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            response = await connector.bot.redeem(name, ["AAAAA-BBBBB-CCCCC", "invalid"])
+            results = response["Result"][name]
+            assert results["AAAAA-BBBBB-CCCCC"] == {"Result": 1, "PurchaseResultDetail": 0}
+            assert results["invalid"]["PurchaseResultDetail"] == 14
+            message = await connector.bot_redeem(name, "AAAAA-BBBBB-CCCCC")
+            assert "Fail/AlreadyPurchased" in message
+
+    @pytest.mark.asyncio
+    async def test_remaining_controllers(self, asf_simulator):
+        """Test command, NLog, type, structure and 2FA routes."""
+        name = next(iter(asf_simulator.bots))
+        asf_simulator.bots[name].online = True
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            command = await connector.command.execute(f"!level {name}")
+            assert command["Result"].startswith(f"<{name}>")
+            assert (await connector.nlog.get_log_file())["Success"] is True
+            assert (await connector.type.get_type("ArchiSteamFarm.Steam.Storage.BotConfig"))["Success"] is True
+            assert (await connector.structure.get_structure("ArchiSteamFarm.Storage.GlobalConfig"))["Success"] is True
+            tokens = await connector.twofa.get_token(name)
+            assert len(tokens["Result"][name]["Result"]) == 5
+
+    @pytest.mark.asyncio
+    async def test_unknown_bot_and_wrong_password(self, asf_simulator):
+        """Test error statuses map to ASF exceptions."""
+        params = asf_simulator.connection_params()
+        async with ASFConnector(**params) as connector:
+            with pytest.raises(ASF_BadRequest) as exc_info:
+                await connector.bot.get_info("missing")
+            assert exc_info.value.status_code == 400
+        params["password"] = "wrong"
+        async with ASFConnector(**params) as connector:
+            with pytest.raises(ASF_Unauthorized):
+                await connector.asf.get_info()
+
+
+class TestFaultInjection:
+    """Test fault injection behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_error_rate(self):
+        """Test that injected statuses raise the mapped exception."""
+        profile = FaultProfile(error_rates={404: 1.0})
+        async with ASFSimulator(bots=2, profile=profile, seed=1) as simulator:
+            async with ASFConnector(**simulator.connection_params()) as connector:
+                with pytest.raises(ASF_NotFound):
+                    await connector.asf.get_info()
+            assert simulator.stats["status:404"] == 1
+
+    @pytest.mark.asyncio
+    async def test_dropped_connection(self):
+        """Test that dropped connections raise ASFNetworkError."""
+        profile = FaultProfile(drop_rate=1.0)
+        async with ASFSimulator(bots=2, profile=profile, seed=1) as simulator:
+            async with ASFConnector(**simulator.connection_params()) as connector:
+                with pytest.raises(ASFNetworkError):
+                    await connector.asf.get_info()
+
+    @pytest.mark.asyncio
+    async def test_slow_body_and_latency(self):
+        """Test that slow chunked bodies are still decoded."""
+        profile = FaultProfile(latency=constant_latency(0.001), slow_body_rate=1.0, slow_body_chunk_size=16)
+        async with ASFSimulator(bots=3, profile=profile, seed=1) as simulator:
+            async with ASFConnector(**simulator.connection_params()) as connector:
+                response = await connector.bot.get_info("ASF")
+                assert len(response["Result"]) == 3
+            assert simulator.stats["slow_bodies"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_redeem(self):
+        """Test that RateLimited redeem results are produced."""
+        profile = FaultProfile(rate_limit_rate=1.0)
+        async with ASFSimulator(bots=["main"], profile=profile, seed=1) as simulator:
+            simulator.bots["main"].online = True
+            async with ASFConnector(**simulator.connection_params()) as connector:
+                response = await connector.bot.redeem("main", "AAAAA-BBBBB-CCCCC")
+                assert response["Result"]["main"]["AAAAA-BBBBB-CCCCC"]["PurchaseResultDetail"] == 53
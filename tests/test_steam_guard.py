@@ -0,0 +1,262 @@
+"""
+Tests for Steam Guard token helpers.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import struct
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector.steam_guard import (
+    STEAM_GUARD_PERIOD,
+    SteamGuardGenerator,
+    TokenCache,
+    steam_guard_code,
+    token_window,
+)
+
+
+class FakeClock:
+    """Controllable Unix clock."""
+
+    def __init__(self, now=1_000_000_020.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def token_response(codes):
+    """Build a get_token response for {bot: code}."""
+    return {
+        "Success": True,
+        "Message": "OK",
+        "Result": {name: {"Success": True, "Message": "OK", "Result": code} for name, code in codes.items()},
+    }
+
+
+class TestTokenCache:
+    """Test TokenCache."""
+
+    def test_token_window(self):
+        """Test window numbering."""
+        assert token_window(59.9) == 1
+        assert token_window(60) == 2
+
+    @pytest.mark.asyncio
+    async def test_serves_repeat_requests_within_window(self):
+        """Test that tokens are reused until the window ends."""
+        clock = FakeClock()
+        fetch = AsyncMock(side_effect=lambda names: token_response(dict.fromkeys(names.split(","), "AAAAA")))
+        cache = TokenCache(fetch, clock=clock)
+
+        first = await cache.get("bot1,bot2")
+        assert await cache.get("bot1") == token_response({"bot1": "AAAAA"})
+        assert await cache.get("bot2,bot1") == token_response({"bot2": "AAAAA", "bot1": "AAAAA"})
+        assert first == token_response({"bot1": "AAAAA", "bot2": "AAAAA"})
+        assert fetch.await_count == 1
+        assert (cache.hits, cache.misses) == (2, 1)
+
+        clock.now += 30
+        await cache.get("bot1")
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fetch_straddling_boundary_is_not_cached(self):
+        """Test that a code of an ambiguous window is returned but not cached."""
+        clock = FakeClock(now=1_000_000_019.9)
+
+        async def fetch(names):
+            clock.now += 0.2
+            return token_response({"bot1": "AAAAA"})
+
+        cache = TokenCache(fetch, clock=clock)
+        await cache.get("bot1")
+        await cache.get("bot1")
+        assert cache.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        """Test that unsuccessful entries are fetched again."""
+        fetch = AsyncMock(
+            return_value={"Success": True, "Result": {"bot1": {"Success": False, "Message": "No 2FA", "Result": None}}}
+        )
+        cache = TokenCache(fetch, clock=FakeClock())
+        await cache.get("bot1")
+        await cache.get("bot1")
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self):
+        """Test that simultaneous misses wait for a single request."""
+
+        async def fetch(names):
+            await asyncio.sleep(0.01)
+            return token_response({"bot1": "AAAAA"})
+
+        fetch_mock = AsyncMock(side_effect=fetch)
+        cache = TokenCache(fetch_mock, clock=FakeClock())
+        results = await asyncio.gather(*(cache.get("bot1") for _ in range(5)))
+        assert fetch_mock.await_count == 1
+        assert all(result["Result"]["bot1"]["Result"] == "AAAAA" for result in results)
+
+    @pytest.mark.asyncio
+    async def test_misses_for_different_bots_run_concurrently(self):
+        """Test that misses for unrelated bots do not wait for each other's round trip."""
+        running = peak = 0
+
+        async def fetch(names):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return token_response({names: "AAAAA"})
+
+        cache = TokenCache(fetch, clock=FakeClock())
+        started = time.perf_counter()
+        results = await asyncio.gather(*(cache.get(f"bot{index}") for index in range(5)))
+        assert time.perf_counter() - started < 0.2
+        assert peak == 5
+        assert [result["Result"][f"bot{index}"]["Result"] for index, result in enumerate(results)] == ["AAAAA"] * 5
+        assert cache.misses == 5
+
+    @pytest.mark.asyncio
+    async def test_fleet_prefetch(self):
+        """Test that one ASF request covers every bot for the window."""
+        clock = FakeClock()
+        fetch = AsyncMock(return_value=token_response({"bot1": "AAAAA", "bot2": "BBBBB"}))
+        cache = TokenCache(fetch, clock=clock)
+        await cache.prefetch_once()
+        fetch.assert_awaited_once_with("ASF")
+        assert (await cache.get("ASF"))["Result"].keys() == {"bot1", "bot2"}
+        assert (await cache.get("bot2"))["Result"]["bot2"]["Result"] == "BBBBB"
+        assert fetch.await_count == 1
+        assert cache.prefetches == 1
+
+    @pytest.mark.asyncio
+    async def test_controller_cache_against_simulator(self, asf_simulator):
+        """Test enable_cache on the 2FA controller with background prefetch."""
+        # Keep the test away from a window boundary
+        left = STEAM_GUARD_PERIOD - time.time() % STEAM_GUARD_PERIOD
+        if left < 2:
+            await asyncio.sleep(left + 0.1)
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            cache = connector.twofa.enable_cache(prefetch=True)
+            await asyncio.sleep(0.05)
+            assert cache.running
+            assert cache.prefetches == 1
+            bot = next(iter(asf_simulator.bots))
+            for _ in range(10):
+                tokens = await connector.twofa.get_token(bot)
+            assert asf_simulator.stats["route:Bot.TwoFactorAuthentication"] == 1
+            assert len(tokens["Result"][bot]["Result"]) == 5
+            assert set(cache._codes) == set(asf_simulator.bots)
+        assert not cache.running
+
+        await connector.twofa.disable_cache()
+        assert connector.twofa.token_cache is None
+
+
+SECRET = base64.b64encode(bytes(range(20))).decode()
+
+
+class TestSteamGuardGenerator:
+    """Test local Steam Guard code generation."""
+
+    def test_code_matches_reference_algorithm(self):
+        """Test the code against a straightforward implementation of the algorithm."""
+        timestamp = 1_700_000_000
+        digest = hmac.new(bytes(range(20)), struct.pack(">Q", timestamp // 30), hashlib.sha1).digest()
+        offset = digest[19] & 0x0F
+        value = int.from_bytes(digest[offset : offset + 4], "big") & 0x7FFFFFFF
+        expected = ""
+        for _ in range(5):
+            expected += "23456789BCDFGHJKMNPQRTVWXY"[value % 26]
+            value //= 26
+        assert steam_guard_code(SECRET, timestamp) == expected
+        assert SteamGuardGenerator({"bot1": SECRET}).generate("bot1", timestamp) == expected
+
+    def test_batch_generation(self):
+        """Test that batch generation matches single codes and reuses the window's codes."""
+        clock = FakeClock()
+        secrets = {f"bot{index}": base64.b64encode(bytes([index]) * 20).decode() for index in range(100)}
+        generator = SteamGuardGenerator(secrets, clock=clock)
+        codes = generator.generate_many()
+        assert len(codes) == 100
+        assert codes == {name: steam_guard_code(secret, clock.now) for name, secret in secrets.items()}
+        assert generator.generate_many(["bot3"]) == {"bot3": codes["bot3"]}
+        clock.now += 30
+        assert generator.generate("bot3") == steam_guard_code(secrets["bot3"], clock.now)
+        with pytest.raises(KeyError):
+            generator.generate("unknown")
+
+    def test_invalid_secret(self):
+        """Test that malformed secrets are rejected."""
+        with pytest.raises(ValueError, match="base64"):
+            SteamGuardGenerator({"bot1": "not base64!"})
+
+    @pytest.mark.asyncio
+    async def test_get_token_falls_back_for_unknown_bots(self):
+        """Test that unknown bots are fetched in one fallback request."""
+        clock = FakeClock()
+        fallback = AsyncMock(return_value=token_response({"bot2": "REMOT", "bot3": "REMOT"}))
+        generator = SteamGuardGenerator({"bot1": SECRET}, fallback=fallback, clock=clock)
+        response = await generator.get_token("bot1,bot2,bot3")
+        fallback.assert_awaited_once_with("bot2,bot3")
+        assert list(response["Result"]) == ["bot1", "bot2", "bot3"]
+        assert response["Result"]["bot1"] == {"Success": True, "Message": "OK", "Result": generator.generate("bot1")}
+        assert response["Result"]["bot2"]["Result"] == "REMOT"
+
+        fallback.reset_mock()
+        await generator.get_token("bot1")
+        fallback.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_token_fallback_failure_and_shared_responses(self):
+        """Test a failed fallback fails its bots per bot, and a fallback response is never modified."""
+        failed = {"Success": False, "Message": "IPC unavailable", "Result": None}
+        generator = SteamGuardGenerator({"bot1": SECRET}, fallback=AsyncMock(return_value=failed), clock=FakeClock())
+        response = await generator.get_token("bot1,bot2")
+        assert response["Result"]["bot1"]["Success"]
+        assert response["Result"]["bot2"] == {"Success": False, "Message": "IPC unavailable", "Result": None}
+
+        fleet = token_response({"bot1": "REMOT", "bot2": "REMOT"})
+        generator.fallback = AsyncMock(return_value=fleet)
+        response = await generator.get_token("ASF")
+        assert response["Result"]["bot1"]["Result"] == generator.generate("bot1")
+        assert fleet["Result"]["bot1"]["Result"] == "REMOT"
+
+    @pytest.mark.asyncio
+    async def test_get_token_without_fallback(self):
+        """Test that unknown bots fail per bot without a fallback."""
+        generator = SteamGuardGenerator({"bot1": SECRET})
+        response = await generator.get_token("bot1,bot2")
+        assert response["Result"]["bot1"]["Success"]
+        assert not response["Result"]["bot2"]["Success"]
+        assert list((await generator.get_token("ASF"))["Result"]) == ["bot1"]
+
+    @pytest.mark.asyncio
+    async def test_local_generator_matches_simulator(self, asf_simulator):
+        """Test that locally generated tokens equal the ones served over IPC."""
+        left = STEAM_GUARD_PERIOD - time.time() % STEAM_GUARD_PERIOD
+        if left < 2:
+            await asyncio.sleep(left + 0.1)
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            remote = await connector.twofa.get_token("ASF")
+            names = list(asf_simulator.bots)
+            connector.twofa.enable_local_generator({name: asf_simulator.bots[name].shared_secret for name in names[:3]})
+            requests_before = asf_simulator.stats["route:Bot.TwoFactorAuthentication"]
+            local = await connector.twofa.get_token(",".join(names[:3]))
+            assert asf_simulator.stats["route:Bot.TwoFactorAuthentication"] == requests_before
+            assert local["Result"] == {name: remote["Result"][name] for name in names[:3]}
+            mixed = await connector.twofa.get_token(",".join(names))
+            assert mixed["Result"] == remote["Result"]
+            assert asf_simulator.stats["route:Bot.TwoFactorAuthentication"] == requests_before + 1
+            connector.twofa.disable_local_generator()
@@ -0,0 +1,134 @@
+"""
+Tests for incremental JSON decoding and inventory streaming.
+"""
+
+import json
+
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector.simulator import ASFSimulator
+from ASFConnector.streaming import JSONStreamParser, iter_json_paths
+
+INVENTORY_PATTERNS = [("Result", "*", "Assets", "*"), ("Success",)]
+
+
+def make_document(bots=3, items=20):
+    """Build an inventory-shaped document with tricky strings in skipped sections."""
+    return {
+        "Message": "OK",
+        "Success": True,
+        "Result": {
+            f"bot{index}": {
+                "Assets": [{"appid": 753, "assetid": str(item), "note": 'quote " and ] }'} for item in range(items)],
+                "Descriptions": [{"type": "Trading Card", "name": "[{\\"}],
+            }
+            for index in range(bots)
+        },
+    }
+
+
+def parse_in_chunks(data: bytes, chunk_size: int, patterns=INVENTORY_PATTERNS, **kwargs):
+    """Feed data to a parser in fixed-size chunks and collect the output."""
+    parser = JSONStreamParser(patterns, **kwargs)
+    items = []
+    for start in range(0, len(data), chunk_size):
+        items.extend(parser.feed(data[start : start + chunk_size]))
+    items.extend(parser.close())
+    return parser, items
+
+
+class TestJSONStreamParser:
+    """Test JSONStreamParser."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+    def test_matches_full_decode(self, chunk_size):
+        """Test that streamed items equal a full decode for any chunking."""
+        document = make_document()
+        _, items = parse_in_chunks(json.dumps(document).encode(), chunk_size)
+        assets = [(path[1], value) for path, value in items if len(path) == 4]
+        expected = [(bot, asset) for bot, data in document["Result"].items() for asset in data["Assets"]]
+        assert assets == expected
+        assert (("Success",), True) in items
+
+    def test_numbers_split_across_chunks(self):
+        """Test that numbers at a chunk boundary are not truncated."""
+        parser = JSONStreamParser([("a",)])
+        assert parser.feed(b'{"a": 12') == []
+        assert parser.feed(b"34}") == [(("a",), 1234)]
+        assert parser.close() == []
+
+    def test_split_at_every_offset(self):
+        """Test that splitting a document at any offset, including inside fractions and exponents, parses it."""
+        text = b'{"x": 0.5, "y": -12.25e+3, "z": [1E-2, 10, true, null], "Success": true}'
+        expected = [(("x",), 0.5), (("y",), -12250.0), (("z",), [0.01, 10, True, None]), (("Success",), True)]
+        for offset in range(len(text) + 1):
+            parser = JSONStreamParser([("x",), ("y",), ("z",), ("Success",)])
+            items = parser.feed(text[:offset]) + parser.feed(text[offset:]) + parser.close()
+            assert items == expected, offset
+
+    def test_multibyte_characters_split_across_chunks(self):
+        """Test UTF-8 sequences split between chunks."""
+        _, items = parse_in_chunks(json.dumps({"a": ["库存"]}, ensure_ascii=False).encode(), 1, [("a", "*")])
+        assert items == [(("a", 0), "库存")]
+
+    def test_incomplete_document(self):
+        """Test that a truncated document raises on close."""
+        parser = JSONStreamParser([("a",)])
+        parser.feed(b'{"a": [1, 2')
+        with pytest.raises(ValueError, match="Incomplete"):
+            parser.close()
+
+    def test_malformed_document(self):
+        """Test that malformed documents raise."""
+        with pytest.raises(ValueError, match="Expected"):
+            JSONStreamParser([("a",)]).feed(b'{"a" 1}')
+
+    def test_buffer_stays_bounded(self):
+        """Test that memory is bounded by the item size, not the document size."""
+        data = json.dumps(make_document(bots=20, items=500)).encode()
+        parser = JSONStreamParser(INVENTORY_PATTERNS, trim_threshold=4096)
+        peak = 0
+        for start in range(0, len(data), 1024):
+            parser.feed(data[start : start + 1024])
+            peak = max(peak, parser.buffered)
+        parser.close()
+        assert len(data) > 500_000
+        assert peak < 8192
+
+    @pytest.mark.asyncio
+    async def test_iter_json_paths(self):
+        """Test the async iterator helper."""
+
+        async def chunks():
+            yield b'{"Result": {"a": {"Assets": [1,'
+            yield b" 2]}}}"
+
+        items = [item async for item in iter_json_paths(chunks(), [("Result", "*", "Assets", "*")])]
+        assert [value for _, value in items] == [1, 2]
+
+
+class TestIterInventory:
+    """Test BotController.iter_inventory against the simulator."""
+
+    @pytest.mark.asyncio
+    async def test_streams_items_per_bot(self):
+        """Test that streamed items match get_inventory."""
+        async with ASFSimulator(bots=4, inventory_size=30, seed=3) as simulator:
+            async with ASFConnector(**simulator.connection_params()) as connector:
+                full = await connector.bot.get_inventory("ASF")
+                streamed = [item async for item in connector.bot.iter_inventory("ASF")]
+        assets = [(bot, item) for bot, section, item in streamed if section == "Assets"]
+        expected = [(bot, asset) for bot, data in full["Result"].items() for asset in data["Assets"]]
+        assert assets == expected
+        assert any(section == "Descriptions" for _, section, _ in streamed)
+
+    @pytest.mark.asyncio
+    async def test_specific_app(self, asf_simulator):
+        """Test streaming a specific app inventory."""
+        for bot in asf_simulator.bots.values():
+            bot.inventory_size = 9
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            items = [item async for item in connector.bot.iter_inventory("ASF", app_id=753, context_id=6)]
+        assert items
+        assert all(item["appid"] == 753 for _, section, item in items if section == "Assets")
@@ -0,0 +1,209 @@
+"""
+Tests for per-call deadlines and adaptive timeouts.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector.error import ASFNetworkError, ASFTimeoutError
+from ASFConnector.IPCProtocol import IPCProtocolHandler, raise_asf_exception
+from ASFConnector.simulator import ASFSimulator, FaultProfile, constant_latency
+from ASFConnector.timeouts import LatencyTracker, deadline, endpoint_key, remaining
+
+
+class Trickle(httpx.AsyncByteStream):
+    """Response body arriving one byte every delay seconds."""
+
+    def __init__(self, chunks: int, delay: float):
+        self.chunks = chunks
+        self.delay = delay
+
+    async def __aiter__(self):
+        for _ in range(self.chunks):
+            await asyncio.sleep(self.delay)
+            yield b"x"
+
+
+class TestDeadline:
+    """Test the deadline context."""
+
+    def test_nested_deadlines_only_shrink(self):
+        """Test that an inner deadline cannot extend an outer one."""
+        assert remaining() is None
+        with deadline(1.0):
+            assert 0.9 < remaining() <= 1.0
+            with deadline(10.0):
+                assert remaining() <= 1.0
+            with deadline(0.1):
+                assert remaining() <= 0.1
+            with deadline(None):
+                assert 0.9 < remaining() <= 1.0
+        assert remaining() is None
+
+    def test_endpoint_key(self):
+        """Test that resources are normalized to endpoints."""
+        assert endpoint_key("/Bot/bot1,bot2/Inventory/753/6") == "/Bot/*/Inventory/*/*"
+        assert endpoint_key("/Bot/ASF") == "/Bot/*"
+        assert endpoint_key("/Structure/ArchiSteamFarm.Storage.GlobalConfig") == "/Structure/*"
+        assert endpoint_key("/ASF/Update") == "/ASF/Update"
+
+
+class TestLatencyTracker:
+    """Test LatencyTracker."""
+
+    def test_timeout_needs_samples(self):
+        """Test that no adaptive timeout is given before min_samples."""
+        tracker = LatencyTracker(min_samples=5)
+        for _ in range(4):
+            tracker.record("/ASF", 0.01)
+        assert tracker.timeout_for("/ASF") is None
+        tracker.record("/ASF", 0.01)
+        assert tracker.timeout_for("/ASF") == tracker.min_timeout
+
+    def test_timeout_follows_percentile(self):
+        """Test that the timeout is the clamped percentile times the multiplier."""
+        tracker = LatencyTracker(percentile=0.9, multiplier=2.0, min_timeout=0.1, max_timeout=5.0, min_samples=10)
+        for index in range(1, 11):
+            tracker.record("/Bot/*", index / 10)
+        assert tracker.quantile("/Bot/*") == pytest.approx(0.9)
+        assert tracker.timeout_for("/Bot/*") == pytest.approx(1.8)
+        for _ in range(200):
+            tracker.record("/Bot/*", 10.0)
+        assert tracker.timeout_for("/Bot/*") == 5.0
+        assert tracker.snapshot()["/Bot/*"]["samples"] == 200
+
+    def test_invalid_arguments(self):
+        """Test argument validation."""
+        with pytest.raises(ValueError, match="Percentile"):
+            LatencyTracker(percentile=0)
+        with pytest.raises(ValueError, match="min_timeout"):
+            LatencyTracker(min_timeout=2, max_timeout=1)
+
+
+class TestRequestTimeouts:
+    """Test deadlines and adaptive timeouts against the simulator."""
+
+    def test_httpx_timeouts_map_to_timeout_error(self):
+        """Test that httpx timeouts become ASFTimeoutError, still an ASFNetworkError."""
+        with pytest.raises(ASFTimeoutError) as exc_info:
+            raise_asf_exception(httpx.ReadTimeout("timed out"))
+        assert isinstance(exc_info.value, ASFNetworkError)
+
+    @pytest.mark.asyncio
+    async def test_deadline_cuts_slow_call_and_keeps_pool_usable(self):
+        """Test that a deadline cancels a hung call and the pool keeps working."""
+        profile = FaultProfile(route_latency={"ASF.UpdateVersion": constant_latency(0.5)})
+        async with ASFSimulator(bots=1, profile=profile, seed=1) as simulator:
+            async with ASFConnector(**simulator.connection_params(), health_check_mode="skip") as connector:
+                with pytest.raises(ASFTimeoutError, match="timed out"):
+                    await connector.asf.update(timeout=0.05)
+                with deadline(0.05), pytest.raises(ASFTimeoutError):
+                    await connector.asf.update()
+                assert connector.connection_handler.scheduler.in_flight == 0
+                assert (await connector.asf.get_info())["Success"]
+                # A generous timeout lets the slow call finish
+                assert (await connector.asf.update(timeout=5))["Success"]
+
+    @pytest.mark.asyncio
+    async def test_controller_methods_take_timeout(self):
+        """Test that public controller methods, including batches and streams, honor a per-call timeout."""
+        slow = constant_latency(0.5)
+        profile = FaultProfile(
+            route_latency={"Bot": slow, "Bot.Inventory": slow, "Bot.TwoFactorAuthentication": slow, "Command": slow}
+        )
+        async with ASFSimulator(bots=2, profile=profile, seed=1) as simulator:
+            bots = list(simulator.bots)
+            async with ASFConnector(**simulator.connection_params(), health_check_mode="skip") as connector:
+                with pytest.raises(ASFTimeoutError):
+                    await connector.bot.get_info("ASF", timeout=0.05)
+                with pytest.raises(ASFTimeoutError):
+                    await connector.twofa.get_token(bots[0], timeout=0.05)
+                with pytest.raises(ASFTimeoutError):
+                    await connector.command.execute_batch("level", bots, chunk_size=1, timeout=0.05)
+                with pytest.raises(ASFTimeoutError):
+                    await anext(connector.bot.iter_inventory("ASF", timeout=0.05))
+                assert (await connector.bot.get_info("ASF", timeout=5))["Success"]
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_fails_fast(self):
+        """Test that a request is not sent once the deadline has passed."""
+        async with ASFSimulator(bots=1, seed=1) as simulator:
+            async with ASFConnector(**simulator.connection_params(), health_check_mode="skip") as connector:
+                with deadline(0.01):
+                    await asyncio.sleep(0.02)
+                    with pytest.raises(ASFTimeoutError, match="expired"):
+                        await connector.asf.get_info()
+                assert simulator.stats["route:ASF"] == 0
+
+    @pytest.mark.asyncio
+    async def test_adaptive_timeout_cuts_outlier(self):
+        """Test that adaptive timeouts cut a call far slower than the endpoint's history."""
+        async with ASFSimulator(bots=1, seed=1) as simulator:
+            params = simulator.connection_params()
+            async with ASFConnector(**params, health_check_mode="skip", adaptive_timeouts=True) as connector:
+                tracker = connector.connection_handler.latency
+                tracker.min_timeout = 0.05
+                for _ in range(tracker.min_samples):
+                    await connector.asf.get_info()
+                assert tracker.timeout_for("/ASF") == pytest.approx(0.05)
+                simulator.profile = FaultProfile(route_latency={"ASF": constant_latency(0.5)})
+                with pytest.raises(ASFTimeoutError):
+                    await connector.asf.get_info()
+
+    @pytest.mark.asyncio
+    async def test_adaptive_timeout_excludes_queue_wait_and_keeps_explicit_deadline(self):
+        """Test that queueing behind the scheduler cap and explicit deadlines are not cut by adaptive timeouts."""
+        profile = FaultProfile(route_latency={"ASF": constant_latency(0.02)})
+        async with ASFSimulator(bots=1, profile=profile, seed=1) as simulator:
+            params = simulator.connection_params()
+            async with ASFConnector(
+                **params, health_check_mode="skip", adaptive_timeouts=True, max_in_flight=2
+            ) as connector:
+                tracker = connector.connection_handler.latency
+                tracker.min_timeout = tracker.max_timeout = 0.1
+                for _ in range(tracker.min_samples):
+                    await connector.asf.get_info()
+                # 40 requests through 2 slots queue for ~0.4 s, four times the adaptive timeout
+                results = await asyncio.gather(*(connector.asf.get_info() for _ in range(40)))
+                assert all(result["Success"] for result in results)
+
+                simulator.profile = FaultProfile(route_latency={"ASF": constant_latency(0.3)})
+                with deadline(2.0):
+                    assert (await connector.asf.get_info())["Success"]
+
+    @pytest.mark.asyncio
+    async def test_stream_deadline_covers_whole_body(self):
+        """Test that a deadline bounds a streamed body across chunks, fails fast once expired and latency is kept."""
+        calls = []
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, stream=Trickle(chunks=5, delay=0.05))
+
+        handler = IPCProtocolHandler("asf", "1242", "/Api", transport=httpx.MockTransport(respond))
+        async with handler:
+            received = []
+
+            async def read():
+                async for chunk in handler.stream("/NLog/File", chunk_size=1):
+                    received.append(chunk)
+
+            # Every chunk arrives well within the budget, the body as a whole does not
+            with deadline(0.12), pytest.raises(ASFTimeoutError):
+                await read()
+            assert 0 < len(received) < 5
+            assert handler.scheduler.in_flight == 0
+
+            with deadline(0.01):
+                await asyncio.sleep(0.02)
+                with pytest.raises(ASFTimeoutError, match="expired"):
+                    await read()
+            assert len(calls) == 1
+
+            received.clear()
+            await read()
+            assert received == [b"x"] * 5
+            assert handler.latency.quantile("/NLog/File", 0.5) >= 0.2
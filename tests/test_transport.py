@@ -0,0 +1,98 @@
+"""
+Tests for Unix domain socket and custom transport support.
+"""
+
+import os
+import tempfile
+
+import httpx
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector.config import ASFConfig
+from ASFConnector.IPCProtocol import IPCProtocolHandler
+from ASFConnector.simulator import ASFSimulator
+
+
+@pytest.fixture
+async def unix_simulator():
+    """Simulator listening on a Unix domain socket (short path, sockets are limited to ~100 bytes)."""
+    directory = tempfile.mkdtemp(prefix="asfc")
+    path = os.path.join(directory, "ipc.sock")
+    async with ASFSimulator(bots=3, seed=42, unix_socket=path) as simulator:
+        yield simulator
+    os.rmdir(directory)
+
+
+class RecordingMockTransport(httpx.MockTransport):
+    def __init__(self):
+        self.paths = []
+        self.closed = False
+        super().__init__(self.respond)
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        return httpx.Response(200, json={"Success": True, "Message": "OK", "Result": {"path": request.url.path}})
+
+    async def aclose(self):
+        self.closed = True
+
+
+class TestUnixDomainSocket:
+    """Test requests over a Unix domain socket."""
+
+    @pytest.mark.asyncio
+    async def test_connector_over_socket(self, unix_simulator):
+        """Test health check and API calls go through the socket."""
+        params = unix_simulator.connection_params()
+        assert params["socket_path"] == unix_simulator.unix_socket
+        async with ASFConnector(**params) as connector:
+            assert connector.connection_handler.base_url == "http://localhost/Api"
+            info = await connector.bot.get_info("ASF")
+        assert set(info["Result"]) == set(unix_simulator.bots)
+        assert unix_simulator.stats["route:HealthCheck"] == 1
+
+    @pytest.mark.asyncio
+    async def test_temporary_client_over_socket(self, unix_simulator):
+        """Test calls outside the context manager use the socket too."""
+        connector = ASFConnector(**unix_simulator.connection_params())
+        info = await connector.asf.get_info()
+        assert info["Success"] is True
+
+    @pytest.mark.asyncio
+    async def test_socket_path_from_config(self, unix_simulator):
+        """Test the socket path is taken from ASFConfig."""
+        config = ASFConfig(asf_path="/Api", asf_socket_path=unix_simulator.unix_socket)
+        async with ASFConnector.from_config(config, health_check_mode="skip") as connector:
+            assert (await connector.asf.get_info())["Success"] is True
+            assert connector._health_key[-1] == unix_simulator.unix_socket
+
+    @pytest.mark.asyncio
+    async def test_socket_removed_on_stop(self):
+        """Test the simulator removes its socket file when stopped."""
+        directory = tempfile.mkdtemp(prefix="asfc")
+        path = os.path.join(directory, "ipc.sock")
+        async with ASFSimulator(bots=1, unix_socket=path):
+            assert os.listdir(directory) == ["ipc.sock"]
+        assert os.listdir(directory) == []
+        os.rmdir(directory)
+
+
+class TestCustomTransport:
+    """Test injecting an httpx transport."""
+
+    @pytest.mark.asyncio
+    async def test_requests_use_injected_transport(self):
+        """Test pooled and temporary clients share the transport without closing it."""
+        transport = RecordingMockTransport()
+        connector = ASFConnector(host="asf", port="1242", transport=transport)
+        await connector.bot.get_info("bot1")
+        async with connector:
+            await connector.asf.get_info()
+        assert transport.paths == ["/Api/Bot/bot1", "/HealthCheck", "/Api/ASF"]
+        assert transport.closed is False
+
+    def test_socket_and_transport_are_exclusive(self):
+        """Test passing both a socket and a transport is rejected."""
+        with pytest.raises(ValueError, match="not both"):
+            IPCProtocolHandler("localhost", "1242", "/Api", uds="/tmp/asf.sock", transport=httpx.MockTransport(None))
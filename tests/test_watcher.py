@@ -0,0 +1,142 @@
+"""
+Tests for the bot state watcher.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ASFConnector import ASFConnector
+from ASFConnector.watcher import BotWatcher, diff_snapshots, parse_timespan, snapshot_bot, snapshot_fleet
+
+
+def bot_info(online=True, paused=False, farming=(), time_remaining="00:00:00"):
+    """Build a bot entry in the shape of GET /Api/Bot/{botNames}."""
+    return {
+        "IsConnectedAndLoggedOn": online,
+        "BotConfig": {"Enabled": True},
+        "CardsFarmer": {
+            "Paused": paused,
+            "CurrentGamesFarming": [{"AppID": app_id} for app_id in farming],
+            "GamesToFarm": [{"AppID": app_id, "CardsRemaining": 2} for app_id in farming],
+            "TimeRemaining": time_remaining,
+        },
+    }
+
+
+class TestSnapshots:
+    """Test compact snapshots and diffing."""
+
+    def test_parse_timespan(self):
+        """Test ASF TimeSpan parsing."""
+        assert parse_timespan("01:02:03") == 3723
+        assert parse_timespan("2.00:00:01") == 172801
+        assert parse_timespan(None) == 0
+        assert parse_timespan("garbage") == 0
+        assert parse_timespan("x.01:00:00") == 0
+
+    def test_snapshot_bot(self):
+        """Test that a bot entry reduces to a tuple."""
+        snapshot = snapshot_bot(bot_info(farming=(10,), time_remaining="00:30:00"))
+        assert snapshot == (True, True, False, (10,), 1, 2, 1800)
+
+    def test_diff_reports_only_changed_fields(self):
+        """Test field-level deltas."""
+        old = snapshot_fleet({"a": bot_info(), "b": bot_info()})
+        new = snapshot_fleet({"a": bot_info(online=False), "b": bot_info()})
+        deltas = diff_snapshots(old, new)
+        assert len(deltas) == 1
+        assert deltas[0].bot == "a"
+        assert deltas[0].kind == "changed"
+        assert deltas[0].changes == {"online": (True, False)}
+
+    def test_diff_added_and_removed(self):
+        """Test added and removed bots."""
+        deltas = diff_snapshots(snapshot_fleet({"a": bot_info()}), snapshot_fleet({"b": bot_info()}))
+        assert {(delta.bot, delta.kind) for delta in deltas} == {("b", "added"), ("a", "removed")}
+
+
+class TestBotWatcher:
+    """Test BotWatcher polling and subscriptions."""
+
+    @pytest.mark.asyncio
+    async def test_poll_once_publishes_filtered_deltas(self):
+        """Test that subscribers only get matching deltas."""
+        controller = AsyncMock()
+        controller.get_info.side_effect = [
+            {"Success": True, "Result": {"a": bot_info(), "b": bot_info()}},
+            {"Success": True, "Result": {"a": bot_info(paused=True), "b": bot_info(online=False)}},
+        ]
+        watcher = BotWatcher(controller, emit_initial=False)
+        subscription = watcher.subscribe(fields={"online"})
+        assert await watcher.poll_once() == []
+        deltas = await watcher.poll_once()
+        assert len(deltas) == 2
+        subscription.close()
+        received = [delta async for delta in subscription]
+        assert [(delta.bot, delta.changes) for delta in received] == [("b", {"online": (True, False)})]
+        assert watcher.get("a")["paused"] is True
+
+    @pytest.mark.asyncio
+    async def test_stop_closes_full_bounded_subscriptions(self):
+        """Test that stopping closes every subscription, even one whose bounded queue is full."""
+        controller = AsyncMock()
+        controller.get_info.return_value = {"Success": True, "Result": {"a": bot_info(), "b": bot_info()}}
+        watcher = BotWatcher(controller)
+        full = watcher.subscribe(maxsize=1)
+        other = watcher.subscribe()
+        await watcher.poll_once()
+        assert full.dropped == 1
+        await watcher.stop()
+        assert [delta.bot async for delta in full] == ["a"]
+        assert [delta.bot async for delta in other] == ["a", "b"]
+        assert not watcher._subscriptions
+
+    @pytest.mark.asyncio
+    async def test_poll_loop_survives_unexpected_errors(self):
+        """Test that any poll error backs off by the growth factor and polling goes on."""
+        controller = AsyncMock()
+        controller.get_info.side_effect = [
+            KeyError("Result"),
+            {"Success": True, "Result": {"a": bot_info()}},
+        ] + [{"Success": True, "Result": {"a": bot_info()}}] * 100
+        watcher = BotWatcher(controller, min_interval=0.01, max_interval=1, backoff=2)
+        subscription = watcher.subscribe()
+        watcher.start()
+        try:
+            delta = await asyncio.wait_for(subscription.__anext__(), timeout=2)
+        finally:
+            await watcher.stop()
+        assert delta.bot == "a"
+
+    def test_unknown_subscription_field(self):
+        """Test that unknown fields are rejected."""
+        watcher = BotWatcher(AsyncMock())
+        with pytest.raises(ValueError, match="Unknown fields"):
+            watcher.subscribe(fields={"mood"})
+
+    def test_adaptive_interval(self):
+        """Test interval shrinking on change and growing when quiet."""
+        watcher = BotWatcher(AsyncMock(), min_interval=1, max_interval=8, backoff=2)
+        watcher._adapt(False)
+        watcher._adapt(False)
+        assert watcher.interval == 4
+        watcher._adapt(True)
+        assert watcher.interval == 2
+        for _ in range(10):
+            watcher._adapt(False)
+        assert watcher.interval == 8
+
+    @pytest.mark.asyncio
+    async def test_watch_against_simulator(self, asf_simulator):
+        """Test that the watcher picks up simulated state changes."""
+        name = next(iter(asf_simulator.bots))
+        async with ASFConnector(**asf_simulator.connection_params()) as connector:
+            async with connector.watch(min_interval=0.01, max_interval=0.05, emit_initial=False) as watcher:
+                subscription = watcher.subscribe(bots={name})
+                await asyncio.sleep(0.03)
+                asf_simulator.bots[name].paused = not asf_simulator.bots[name].paused
+                delta = await asyncio.wait_for(subscription.__anext__(), timeout=2)
+                assert delta.bot == name
+                assert "paused" in delta.changes